@@ -51,6 +51,7 @@ __all__ = [
 # Eagerly import core algorithms so they self-register with the registry.
 from . import (  # noqa: E402,F401
 	a_star_scheduler,
+	beam_search,
 	bfs_scheduler,
 	constraint_programming,
 	dfs_scheduler,
@@ -60,6 +61,9 @@ from . import (  # noqa: E402,F401
 	hill_climbing,
 	hybrid_ga_sa,
 	iddfs_scheduler,
+	lns_scheduler,
+	nsga2,
+	parallel_tempering,
 	particle_swarm,
 	simulated_annealing_scheduler,
 	tabu_search,
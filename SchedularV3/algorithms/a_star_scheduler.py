@@ -1,19 +1,47 @@
-"""A* search scheduler leveraging heuristic guidance."""
+"""A* search scheduler with an admissible score bound.
+
+Groups are assigned in search order, so the search space is a tree and every
+state is a handful of integers: depth, ECTS, occupied/conflict slot masks
+and the chosen option indices packed into one mixed-radix integer.
+
+The priority of a partial state is a lower bound on the cost
+(``-score_schedule``) of every completion, computed by ``CompletionBound``:
+
+- the ECTS of the partial state must still admit the cheapest options of
+  the remaining mandatory groups (and reach ``min_ects``), per the suffix
+  sums of ``EctsBounds``;
+- each remaining group's cheapest compatible option is found against the
+  current masks; a mandatory group with no compatible option is a dead end,
+  and the slots shared by all of its compatible options are forced;
+- free-day, compression and conflict terms only get worse as slots are
+  added, so they are evaluated optimistically on the forced occupancy;
+- gaps that no remaining option can fill stay gaps, which caps the gap and
+  consecutive-block terms.
+
+Complete states are scored exactly when they first reach the top of the
+heap and re-queued with that cost, so schedules are popped in optimal score
+order. If the open list outgrows ``max_open_nodes`` the search
+switches to IDA* (iterative f-bound deepening) from the current best bound,
+whose depth-first stack needs memory proportional to depth x branching only.
+With at least ``max_results`` warm-start incumbents, states whose bound
+exceeds the k-th incumbent cost are dropped: the incumbents already beat them.
+"""
 
 from __future__ import annotations
 
 import heapq
 import itertools
+import math
 import time
-from typing import TYPE_CHECKING, List, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
 if TYPE_CHECKING:
-    from core.models import Course, Schedule
+    from core.models import Schedule
     from utils.schedule_metrics import SchedulerPrefs
 
 # Runtime imports
 try:
-    from core.models import Course, Schedule
+    from core.models import Schedule
 except ImportError as e:
     raise ImportError(f"Required module core.models not found: {e}")
 
@@ -24,18 +52,200 @@ except ImportError as e:
 
 from . import register_scheduler
 from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
-from .heuristics import estimate_conflict_penalty, estimate_remaining_group_penalty
+from .ects_bounds import EctsBounds
+from .incremental import ALL_DAYS, IncrementalScorer, OptionTable
+
+
+# (priority, -depth, tie-breaker, depth, packed option indices, ects, occupied, conflicts)
+OpenState = Tuple[float, int, int, int, int, int, int, int]
+
+# Minimum threshold increase between IDA* iterations, in score points
+IDA_THRESHOLD_STEP = 1.0
+
+
+class CompletionBound:
+    """Optimistic (admissible) cost bound for completions of a partial state."""
+
+    def __init__(
+        self,
+        table: OptionTable,
+        prefs: Optional[SchedulerPrefs],
+        mandatory_codes: Set[str],
+        max_ects: int,
+        allow_conflicts: bool,
+        ects_bounds: Optional[EctsBounds] = None,
+    ) -> None:
+        self.table = table
+        self.prefs = prefs
+        self.max_ects = max_ects
+        self.allow_conflicts = allow_conflicts
+        # Suffix ECTS sums over ``table.group_keys`` (knapsack look-ahead)
+        self.ects_bounds = ects_bounds
+        self.mandatory = [group in mandatory_codes for group in table.group_keys]
+
+        self.slot_masks = {slot: 1 << bit for slot, bit in table.slot_bits.items()}
+        self._gap_cache: Dict[Tuple[str, int, int], Tuple[bool, int]] = {}
+        self.day_masks: Dict[str, int] = {}
+        for (day, _), bit in table.slot_bits.items():
+            self.day_masks[day] = self.day_masks.get(day, 0) | (1 << bit)
+        self.day_periods: Dict[str, List[Tuple[int, int]]] = {}
+        for (day, period), bit in sorted(table.slot_bits.items(), key=lambda item: item[0]):
+            self.day_periods.setdefault(day, []).append((period, 1 << bit))
+
+        # Scores are bounded term by term, which needs non-negative weights
+        self.informative = prefs is None or all(
+            weight >= 0
+            for weight in (
+                prefs.weight_free_days,
+                prefs.weight_compression,
+                prefs.weight_gaps,
+                prefs.weight_consecutive,
+                prefs.weight_conflicts,
+            )
+        )
+
+    def lower_bound(self, depth: int, ects: int, occupied: int, conflicts: int) -> float:
+        """
+        Lower bound on the cost of any valid completion, ``inf`` if none exists.
+
+        Args:
+            depth: Number of groups already assigned
+            ects: ECTS of the partial selection
+            occupied: Slot mask of the partial selection
+            conflicts: Mask of slots occupied more than once
+        """
+        if self.ects_bounds is not None and not self.ects_bounds.allows(depth, ects):
+            return math.inf
+        forced = occupied
+        touchable = 0
+        extra_slots = 0
+        for position in range(depth, len(self.table.group_keys)):
+            group = self.table.group_keys[position]
+            common = -1
+            widest = 0
+            compatible = False
+            for option in self.table.options[group]:
+                if option is None:
+                    common = 0
+                    compatible = True
+                    continue
+                if ects + option.ects > self.max_ects:
+                    continue
+                if not self.allow_conflicts and option.mask & occupied:
+                    continue
+                compatible = True
+                common &= option.mask
+                touchable |= option.mask
+                widest = max(widest, option.mask.bit_count())
+
+            if not compatible:
+                return math.inf
+            if self.mandatory[position] and common > 0:
+                forced |= common
+            extra_slots += widest
+
+        if self._violates_strict_free_days(forced):
+            return math.inf
+        if not self.informative:
+            return -math.inf
+
+        max_slots = occupied.bit_count() + extra_slots
+        fixed_gaps = self._unfillable_gaps(forced, touchable)
+        return -self._score_upper_bound(forced, conflicts, fixed_gaps, max_slots)
+
+    def _violates_strict_free_days(self, mask: int) -> bool:
+        prefs = self.prefs
+        if not prefs or not prefs.strict_free_days or not prefs.desired_free_days:
+            return False
+        return any(
+            day not in ALL_DAYS or mask & self.day_masks.get(day, 0)
+            for day in prefs.desired_free_days
+        )
+
+    def _unfillable_gaps(self, mask: int, touchable: int) -> int:
+        """
+        Count gaps in ``mask`` that stay gaps in every completion.
+
+        A gap survives if any of its periods cannot be filled, either because
+        no option uses that slot or because no remaining option touching it
+        is still compatible.
+        """
+        gaps = 0
+        for day in ALL_DAYS:
+            if not mask & self.day_masks.get(day, 0):
+                continue
+            previous = None
+            for period, bit in self.day_periods[day]:
+                if not mask & bit:
+                    continue
+                if previous is not None and period - previous > 1:
+                    unknown, between = self._gap_slots(day, previous, period)
+                    if unknown or between & ~touchable:
+                        gaps += 1
+                previous = period
+        return gaps
+
+    def _gap_slots(self, day: str, first: int, last: int) -> Tuple[bool, int]:
+        """(has a period no option uses, mask of known slots) strictly between two periods."""
+        key = (day, first, last)
+        cached = self._gap_cache.get(key)
+        if cached is None:
+            unknown = False
+            between = 0
+            for period in range(first + 1, last):
+                bit = self.slot_masks.get((day, period))
+                if bit is None:
+                    unknown = True
+                else:
+                    between |= bit
+            cached = self._gap_cache[key] = (unknown, between)
+        return cached
+
+    def _score_upper_bound(
+        self, forced: int, conflicts: int, fixed_gaps: int, max_slots: int
+    ) -> float:
+        days_used = sum(1 for mask in self.day_masks.values() if forced & mask)
+        conflict_count = conflicts.bit_count()
+        prefs = self.prefs
+        if not prefs:
+            return -(conflict_count * 100 + fixed_gaps * 10 + days_used * 5)
+
+        score = 0.0
+        if prefs.desired_free_days:
+            desired = set(prefs.desired_free_days)
+            if prefs.strict_free_days:
+                achieved = sum(
+                    1 for day in desired
+                    if day in ALL_DAYS and not forced & self.day_masks.get(day, 0)
+                )
+            else:
+                achieved = sum(
+                    1 for day in desired
+                    if (forced & self.day_masks.get(day, 0)).bit_count() <= 1
+                )
+            score += prefs.weight_free_days * (achieved / len(desired)) * 100
+
+        if prefs.compress_classes:
+            score += prefs.weight_compression * ((7 - days_used) / 7) * 100
+
+        if max_slots > 0:
+            # Each fixed gap splits a day, costing at least one slot of its longest block
+            ratio = max(0.0, 1.0 - fixed_gaps / max_slots)
+            score += (prefs.weight_gaps + prefs.weight_consecutive) * ratio * 100
+
+        score -= prefs.weight_conflicts * conflict_count * 10
+        return score
 
 
 @register_scheduler
 class AStarScheduler(BaseScheduler):
-    """Heuristic-informed search that favours promising partial schedules."""
+    """Heuristic-informed search that returns schedules in optimal score order."""
 
     metadata = AlgorithmMetadata(
         name="A*",
         category="informed-search",
         complexity="O(b^d)",
-        description="A* search with conflict-based heuristics",
+        description="A* search with an admissible score bound and IDA* memory fallback",
         optimal=True,
         supports_preferences=True,
     )
@@ -48,46 +258,89 @@ class AStarScheduler(BaseScheduler):
         max_conflicts: int = 1,
         scheduler_prefs: Optional[SchedulerPrefs] = None,
         timeout_seconds: int = 180,
+        max_open_nodes: int = 500_000,
+        min_ects: int = 0,
     ) -> None:
         super().__init__(
             max_results=max_results,
             max_ects=max_ects,
+            min_ects=min_ects,
             allow_conflicts=allow_conflicts,
             max_conflicts=max_conflicts,
             scheduler_prefs=scheduler_prefs,
             timeout_seconds=timeout_seconds,
         )
+        self.max_open_nodes = max(1, max_open_nodes)
 
     def _run_algorithm(self, search: PreparedSearch) -> List[Schedule]:
-        counter = itertools.count()
-        open_set = []  # type: List[Tuple[float, int, int, List[Course], int]]
-        heapq.heappush(open_set, (0.0, next(counter), 0, [], 0))
-
-        results = []  # type: List[Schedule]
-        visited: Set[Tuple[int, frozenset]] = set()
+        table = OptionTable(search)
+        bound = CompletionBound(
+            table, self.scheduler_prefs, search.mandatory_codes,
+            self.max_ects, self.allow_conflicts, search.ects_bounds,
+        )
+        radices = [max(1, len(table.options[group])) for group in table.group_keys]
         start = time.time()
+        stats = self._last_run_stats
+        stats.update({"peak_open": 1, "memory_fallback": False, "ida_iterations": 0})
+
+        root_bound = bound.lower_bound(0, 0, 0, 0)
+        if math.isinf(root_bound) and root_bound > 0:
+            return []
+
+        # Cost of the k-th warm-start incumbent: dearer states cannot make the top k
+        cutoff = self._warm_start_cutoff(table, search)
+
+        counter = itertools.count()
+        open_set: List[OpenState] = [(root_bound, 0, next(counter), 0, 0, 0, 0, 0)]
+        found: List[Tuple[float, int]] = []
 
-        while open_set and len(results) < self.max_results:
+        while open_set and len(found) < self.max_results:
             if self._check_timeout(start):
                 break
+            if len(open_set) > self.max_open_nodes:
+                stats["memory_fallback"] = True
+                found.extend(self._ida_star(table, bound, radices, open_set[0][0], found, start))
+                break
 
-            _, _, group_index, current_courses, current_ects = heapq.heappop(open_set)
+            priority, _, _, depth, code, ects, occupied, conflicts = heapq.heappop(open_set)
             self._last_run_stats["nodes_explored"] += 1
 
-            signature = self._create_signature(group_index, current_courses)
-            if signature in visited:
+            if depth > len(table.group_keys):
+                found.append((priority, code))
                 continue
-            visited.add(signature)
-
-            if self._is_complete_schedule(group_index, search, current_courses, results):
+            if depth == len(table.group_keys):
+                # Leaves are scored lazily, only once they reach the top of the heap
+                cost = self._leaf_cost(table, radices, code)
+                if cost <= priority:
+                    found.append((cost, code))
+                elif not math.isinf(cost):
+                    heapq.heappush(
+                        open_set,
+                        (cost, -(depth + 1), next(counter), depth + 1, code, ects, occupied, conflicts),
+                    )
                 continue
 
-            self._expand_node(
-                search, group_index, current_courses, current_ects,
-                open_set, counter
-            )
-
-        return results
+            for child in self._children(table, bound, radices, depth, code, ects, occupied, conflicts):
+                if child[0] > cutoff:
+                    stats["branches_pruned"] += 1
+                    continue
+                heapq.heappush(open_set, (child[0], -child[1], next(counter)) + child[1:])
+            stats["peak_open"] = max(stats["peak_open"], len(open_set))
+
+        if found:
+            stats["best_cost"] = found[0][0]
+        return [self._decode(table, radices, code) for _, code in found[: self.max_results]]
+
+    def _warm_start_cutoff(self, table: OptionTable, search: PreparedSearch) -> float:
+        costs = []
+        for schedule in search.warm_start:
+            scorer = IncrementalScorer(self.scheduler_prefs)
+            for group, index in table.assignment_for(schedule).items():
+                scorer.add(table.get(group, index))
+            costs.append(scorer.cost())
+        if len(costs) < self.max_results:
+            return math.inf
+        return sorted(costs)[self.max_results - 1]
 
     def _check_timeout(self, start: float) -> bool:
         """Check if algorithm has exceeded timeout."""
@@ -96,95 +349,120 @@ class AStarScheduler(BaseScheduler):
             return True
         return False
 
-    @staticmethod
-    def _create_signature(
-        group_index: int, current_courses: List[Course]
-    ) -> Tuple[int, frozenset]:
-        """Create a unique signature for state deduplication using frozenset."""
-        return (
-            group_index,
-            frozenset(course.code for course in current_courses),
-        )
-
-    def _is_complete_schedule(
-        self,
-        group_index: int,
-        search: PreparedSearch,
-        current_courses: List[Course],
-        results: List[Schedule]
-    ) -> bool:
-        """Check if we've processed all groups and add valid schedule to results."""
-        if group_index >= len(search.group_keys):
-            if current_courses:
-                schedule = Schedule(current_courses.copy())
-                if self._is_valid_final_schedule(schedule):
-                    results.append(schedule)
-            return True
-        return False
-
-    def _expand_node(
+    def _children(
         self,
-        search: PreparedSearch,
-        group_index: int,
-        current_courses: List[Course],
-        current_ects: int,
-        open_set: List[Tuple[float, int, int, List[Course], int]],
-        counter: itertools.count
-    ) -> None:
-        """Expand current node by trying all options for the current group."""
-        group_key = search.group_keys[group_index]
-        options = search.group_options.get(group_key, [])
-
-        remaining = len(search.group_keys) - (group_index + 1)
-        heuristic_penalty = estimate_remaining_group_penalty(remaining)
-
-        for option in options:
-            new_courses, new_ects = self._apply_option(
-                option, current_courses, current_ects
-            )
-
-            if not self._is_valid_partial_selection(new_courses):
+        table: OptionTable,
+        bound: CompletionBound,
+        radices: List[int],
+        depth: int,
+        code: int,
+        ects: int,
+        occupied: int,
+        conflicts: int,
+    ) -> List[Tuple[float, int, int, int, int, int]]:
+        """
+        Feasible children of a state as (priority, depth, code, ects, occupied, conflicts).
+
+        The priority is the completion bound; for complete children it is the
+        bound of the finished masks, refined to the exact cost by the caller.
+        """
+        group = table.group_keys[depth]
+        children = []
+        for index, option in enumerate(table.options[group]):
+            child_code = code * radices[depth] + index
+            child_ects, child_occupied, child_conflicts = ects, occupied, conflicts
+            if option is not None:
+                child_ects += option.ects
+                child_conflicts |= (occupied & option.mask) | option.overlap_mask
+                child_occupied |= option.mask
+                if child_ects > self.max_ects or not self._conflicts_allowed(child_conflicts):
+                    self._last_run_stats["branches_pruned"] += 1
+                    continue
+
+            priority = bound.lower_bound(depth + 1, child_ects, child_occupied, child_conflicts)
+            if math.isinf(priority) and priority > 0:
                 self._last_run_stats["branches_pruned"] += 1
                 continue
-
-            self._add_to_open_set(
-                open_set, counter, new_courses, new_ects,
-                group_index, heuristic_penalty
+            children.append(
+                (priority, depth + 1, child_code, child_ects, child_occupied, child_conflicts)
             )
+        return children
 
-    @staticmethod
-    def _apply_option(
-        option: Optional[List[Course]],
-        current_courses: List[Course],
-        current_ects: int
-    ) -> Tuple[List[Course], int]:
-        """Apply an option (skip or add courses) to current state."""
-        if option is None:
-            return current_courses.copy(), current_ects
-
-        new_courses = current_courses + option
-        new_ects = current_ects + sum(course.ects for course in option)
-        return new_courses, new_ects
+    def _conflicts_allowed(self, conflict_mask: int) -> bool:
+        if not conflict_mask:
+            return True
+        return self.allow_conflicts and conflict_mask.bit_count() <= self.max_conflicts
+
+    def _leaf_cost(self, table: OptionTable, radices: List[int], code: int) -> float:
+        """Exact cost of a complete state, ``inf`` if it is not a valid schedule."""
+        scorer = IncrementalScorer(self.scheduler_prefs)
+        selected = False
+        for group, index in self._unpack(table, radices, code).items():
+            option = table.get(group, index)
+            if option is not None:
+                scorer.add(option)
+                selected = True
+        # ECTS, conflicts and mandatory groups are already enforced by construction
+        if not selected or scorer.violates_strict_free_days():
+            return math.inf
+        return scorer.cost()
+
+    def _ida_star(
+        self,
+        table: OptionTable,
+        bound: CompletionBound,
+        radices: List[int],
+        threshold: float,
+        found: List[Tuple[float, int]],
+        start: float,
+    ) -> List[Tuple[float, int]]:
+        """
+        Finish the search with IDA*, keeping only a depth-first stack in memory.
+
+        Every iteration collects all complete states with cost <= threshold.
+        Once enough are collected they are exactly the best remaining ones.
+        """
+        wanted = self.max_results - len(found)
+        known = {code for _, code in found}
+        while True:
+            self._last_run_stats["ida_iterations"] += 1
+            collected: List[Tuple[float, int]] = []
+            exceeded = math.inf
+            stack = [(0, 0, 0, 0, 0)]
+            while stack:
+                if self._check_timeout(start):
+                    return sorted(collected)[:wanted]
+                depth, code, ects, occupied, conflicts = stack.pop()
+                self._last_run_stats["nodes_explored"] += 1
+                for priority, child_depth, child_code, *rest in self._children(
+                    table, bound, radices, depth, code, ects, occupied, conflicts
+                ):
+                    if child_depth == len(table.group_keys) and priority <= threshold:
+                        if child_code in known:
+                            continue
+                        priority = self._leaf_cost(table, radices, child_code)
+                        if priority <= threshold:
+                            collected.append((priority, child_code))
+                            continue
+                    if priority > threshold:
+                        exceeded = min(exceeded, priority)
+                    elif child_depth < len(table.group_keys):
+                        stack.append((child_depth, child_code, *rest))
+
+            collected.sort()
+            if len(collected) >= wanted or math.isinf(exceeded):
+                return collected[:wanted]
+            threshold = max(exceeded, threshold + IDA_THRESHOLD_STEP)
 
     @staticmethod
-    def _add_to_open_set(
-        open_set: List[Tuple[float, int, int, List[Course], int]],
-        counter: itertools.count,
-        new_courses: List[Course],
-        new_ects: int,
-        group_index: int,
-        heuristic_penalty: float
-    ) -> None:
-        """Calculate priority and add new state to open set."""
-        schedule = Schedule(new_courses)
-        cost = estimate_conflict_penalty(schedule)
-        total_priority = cost + heuristic_penalty
-
-        heapq.heappush(
-            open_set,
-            (total_priority, next(counter), group_index + 1, new_courses, new_ects),
-        )
+    def _unpack(table: OptionTable, radices: List[int], code: int) -> Dict[str, int]:
+        assignment: Dict[str, int] = {}
+        for group, radix in zip(reversed(table.group_keys), reversed(radices)):
+            code, assignment[group] = divmod(code, radix)
+        return assignment
 
+    def _decode(self, table: OptionTable, radices: List[int], code: int) -> Schedule:
+        return table.to_schedule(self._unpack(table, radices, code))
 
 
-__all__ = ["AStarScheduler"]
+__all__ = ["AStarScheduler", "CompletionBound"]
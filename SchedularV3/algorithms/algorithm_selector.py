@@ -1,11 +1,38 @@
-"""Algorithm recommendation utilities."""
+"""Algorithm recommendation utilities.
+
+``select_scheduler`` ranks algorithms from their static metadata alone.
+``auto_select_scheduler`` additionally sizes the actual search space (option
+counts of the ``PreparedSearch``, or an exact DP count when that is cheap)
+and consults a ``RuntimeHistory`` of measured runtime and quality per
+algorithm and size bucket, so it only picks algorithms expected to finish
+within a latency target.
+"""
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, Type
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Type
+
+if TYPE_CHECKING:
+    from core.models import CourseGroup
 
 from . import iter_registered_schedulers
-from .base_scheduler import AlgorithmMetadata, BaseScheduler
+from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
+
+
+# States the exact DP count may memoise before falling back to the product estimate
+EXACT_COUNT_STATE_BUDGET = 20_000
+# Assumed throughput of exhaustive searches until runs have been measured
+PRIOR_NODES_PER_SECOND = 100_000
+# Assumed runtime of bounded heuristics until runs have been measured
+PRIOR_HEURISTIC_SECONDS = 1.0
+# Categories whose runtime grows with the size of the search space
+EXHAUSTIVE_CATEGORIES = {"complete-search", "constraint-programming"}
+# Upper log10 size of each bucket; larger spaces fall into "huge"
+SIZE_BUCKETS = (("tiny", 2.0), ("small", 4.0), ("medium", 6.0), ("large", 9.0))
 
 
 def score_algorithm(metadata: AlgorithmMetadata, requirements: Dict[str, Any]) -> float:
@@ -88,4 +115,222 @@ def instantiate_scheduler(
     return scheduler_cls(**kwargs)
 
 
-__all__ = ["instantiate_scheduler", "select_scheduler"]
+# ----------------------------------------------------------------------
+# Size-aware selection
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class SearchSizeEstimate:
+    """Size of a prepared search space."""
+
+    groups: int
+    # log10 of the product of per-group option counts (upper bound)
+    log10_upper: float
+    # Exact number of valid schedules, when the DP count fit its budget
+    exact_count: Optional[int] = None
+
+    @property
+    def log10_size(self) -> float:
+        if self.exact_count is not None:
+            return math.log10(self.exact_count) if self.exact_count else 0.0
+        return self.log10_upper
+
+    @property
+    def bucket(self) -> str:
+        return size_bucket(self.log10_size)
+
+
+def size_bucket(log10_size: float) -> str:
+    """Name of the ``SIZE_BUCKETS`` bucket a log10 space size falls into."""
+    for name, upper in SIZE_BUCKETS:
+        if log10_size < upper:
+            return name
+    return "huge"
+
+
+def estimate_search_space(
+    scheduler: BaseScheduler,
+    search: PreparedSearch,
+    max_states: int = EXACT_COUNT_STATE_BUDGET,
+) -> SearchSizeEstimate:
+    """Size ``search`` under ``scheduler``'s hard constraints, exactly if cheap."""
+    from .solution_space import SolutionSpace, StateBudgetExceeded
+
+    log10_upper = sum(
+        math.log10(len(search.group_options[group]))
+        for group in search.group_keys
+        if search.group_options.get(group)
+    )
+    try:
+        exact = SolutionSpace.from_search(scheduler, search, max_states=max_states).count()
+    except StateBudgetExceeded:
+        exact = None
+    return SearchSizeEstimate(len(search.group_keys), log10_upper, exact)
+
+
+def estimate_selection(
+    scheduler: BaseScheduler,
+    course_groups: Dict[str, CourseGroup],
+    mandatory_codes: Set[str],
+    optional_codes: Optional[Set[str]] = None,
+) -> Optional[SearchSizeEstimate]:
+    """Size the search ``scheduler`` would run; None if the selection admits no options."""
+    search = scheduler._prepare_search_space(course_groups, mandatory_codes, optional_codes)
+    if search is None:
+        return None
+    return estimate_search_space(scheduler, search)
+
+
+class RuntimeHistory:
+    """
+    Measured runtime and quality per algorithm and size bucket.
+
+    Entries are running means kept as
+    ``{algorithm: {bucket: {"runs", "mean_seconds", "max_seconds", "mean_score", "timeouts"}}}``
+    and persisted as JSON when a ``path`` is given.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._entries: Dict[str, Dict[str, Dict[str, float]]] = {}
+        if self.path is not None and self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                if isinstance(loaded, dict):
+                    self._entries = loaded
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def get(self, algorithm: str, bucket: str) -> Optional[Dict[str, float]]:
+        entry = self._entries.get(algorithm, {}).get(bucket)
+        return dict(entry) if entry else None
+
+    def record(
+        self,
+        algorithm: str,
+        bucket: str,
+        seconds: float,
+        best_score: Optional[float] = None,
+        timed_out: bool = False,
+    ) -> None:
+        entry = self._entries.setdefault(algorithm, {}).setdefault(
+            bucket,
+            {"runs": 0, "mean_seconds": 0.0, "max_seconds": 0.0, "scored_runs": 0,
+             "mean_score": 0.0, "timeouts": 0},
+        )
+        entry["runs"] += 1
+        entry["mean_seconds"] += (seconds - entry["mean_seconds"]) / entry["runs"]
+        entry["max_seconds"] = max(entry["max_seconds"], seconds)
+        if best_score is not None:
+            entry["scored_runs"] += 1
+            entry["mean_score"] += (best_score - entry["mean_score"]) / entry["scored_runs"]
+        if timed_out:
+            entry["timeouts"] += 1
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, indent=2)
+
+
+@dataclass(frozen=True)
+class AutoSelection:
+    """Outcome of ``auto_select_scheduler``."""
+
+    scheduler_cls: Type[BaseScheduler]
+    estimate: SearchSizeEstimate
+    predicted_seconds: float
+    meets_target: bool
+    measured: bool
+
+
+def predict_runtime(
+    metadata: AlgorithmMetadata,
+    estimate: SearchSizeEstimate,
+    history: Optional[RuntimeHistory] = None,
+) -> float:
+    """Measured mean runtime for the bucket if known, else a metadata-based prior."""
+    entry = history.get(metadata.name, estimate.bucket) if history else None
+    if entry and entry["runs"]:
+        # A run that hit its timeout says nothing good about the mean
+        return entry["max_seconds"] if entry["timeouts"] else entry["mean_seconds"]
+    if metadata.category in EXHAUSTIVE_CATEGORIES or metadata.optimal:
+        return 10 ** min(estimate.log10_size, 300.0) / PRIOR_NODES_PER_SECOND
+    return PRIOR_HEURISTIC_SECONDS
+
+
+def auto_select_scheduler(
+    scheduler: BaseScheduler,
+    course_groups: Dict[str, CourseGroup],
+    mandatory_codes: Set[str],
+    optional_codes: Optional[Set[str]] = None,
+    latency_target: float = 5.0,
+    history: Optional[RuntimeHistory] = None,
+    requirements: Optional[Dict[str, Any]] = None,
+) -> Optional[AutoSelection]:
+    """
+    Pick the best algorithm expected to finish within ``latency_target`` seconds.
+
+    ``scheduler`` supplies the hard constraints (ECTS limit, conflicts, free
+    days) used to prepare and size the search; it is only read, so pass a
+    throwaway instance or size before the run. Among algorithms predicted to
+    meet the target, optimal ones win, then the metadata match with
+    ``requirements``, then the faster prediction. Measured scores are not
+    used: they were recorded on whatever selections fell into the bucket
+    and are not comparable between algorithms. If none is predicted to meet
+    the target the fastest one is returned.
+
+    Returns:
+        The selection, or None if the selection admits no valid options
+    """
+    estimate = estimate_selection(scheduler, course_groups, mandatory_codes, optional_codes)
+    if estimate is None:
+        return None
+    requirements = requirements or {}
+
+    candidates: List[AutoSelection] = []
+    ranking: Dict[Type[BaseScheduler], tuple] = {}
+    for scheduler_cls in iter_registered_schedulers():
+        metadata = getattr(scheduler_cls, "metadata", None)
+        if not isinstance(metadata, AlgorithmMetadata):
+            continue
+        entry = history.get(metadata.name, estimate.bucket) if history else None
+        predicted = predict_runtime(metadata, estimate, history)
+        selection = AutoSelection(
+            scheduler_cls=scheduler_cls,
+            estimate=estimate,
+            predicted_seconds=predicted,
+            meets_target=predicted <= latency_target,
+            measured=bool(entry and entry["runs"]),
+        )
+        candidates.append(selection)
+        ranking[scheduler_cls] = (
+            metadata.optimal,
+            score_algorithm(metadata, requirements),
+            -predicted,
+        )
+
+    if not candidates:
+        fallback = _default_scheduler()
+        return AutoSelection(fallback, estimate, math.inf, False, False)
+
+    feasible = [selection for selection in candidates if selection.meets_target]
+    if feasible:
+        return max(feasible, key=lambda selection: ranking[selection.scheduler_cls])
+    return min(candidates, key=lambda selection: selection.predicted_seconds)
+
+
+__all__ = [
+    "AutoSelection",
+    "RuntimeHistory",
+    "SearchSizeEstimate",
+    "auto_select_scheduler",
+    "estimate_search_space",
+    "estimate_selection",
+    "instantiate_scheduler",
+    "predict_runtime",
+    "select_scheduler",
+    "size_bucket",
+]
@@ -15,10 +15,13 @@ benchmarked, auto-selected, and executed interchangeably.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import functools
+import random
 import time
-from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
 
 if TYPE_CHECKING:
     from core.models import Course, CourseGroup, Schedule, Transcript
@@ -31,11 +34,19 @@ except ImportError as e:
     raise ImportError(f"Required module core.models not found: {e}")
 
 try:
-    from utils.schedule_metrics import SchedulerPrefs, score_schedule
+    from utils.schedule_metrics import SchedulerPrefs
 except ImportError as e:
     raise ImportError(f"Required module utils.schedule_metrics not found: {e}")
 
+try:
+    from utils.result_cache import cached_score
+except ImportError as e:
+    raise ImportError(f"Required module utils.result_cache not found: {e}")
+
 from .constraints import ConstraintUtils
+from .diversity import DIVERSITY_POOL_FACTOR, DiverseTopK
+from .ects_bounds import EctsBounds
+from .symmetry import SYMMETRY_POOL_CAP, SymmetryInfo, collapse_sections, detect_symmetries
 
 # Işık University smart filtering (optional)
 ISIK_FILTERING_AVAILABLE = False
@@ -97,6 +108,12 @@ class PreparedSearch:
     valid_selections: Dict[str, List[List[Course]]]
     mandatory_codes: Set[str]
     optional_codes: Set[str]
+    # Previous results still valid under the current pins, best first
+    warm_start: List[Schedule] = field(default_factory=list)
+    # Interchangeable groups and their lexicographic ordering constraints
+    symmetry: Optional[SymmetryInfo] = None
+    # Suffix ECTS bounds over ``group_keys`` for knapsack pruning
+    ects_bounds: Optional[EctsBounds] = None
 
 
 class BaseScheduler(ABC):
@@ -109,6 +126,9 @@ class BaseScheduler(ABC):
         description="Base scheduler – should be subclassed",
         optimal=False,
     )
+    # Whether ``_run_algorithm`` enforces the chain ordering constraints of
+    # ``PreparedSearch.symmetry``; other algorithms gather a larger pool
+    breaks_symmetry: bool = False
 
     def __init__(
         self,
@@ -121,20 +141,34 @@ class BaseScheduler(ABC):
         timeout_seconds: int = 120,
         transcript: Optional[Transcript] = None,
         enable_smart_filtering: bool = True,
+        min_ects: int = 0,
+        seed: Optional[int] = None,
     ) -> None:
         self.max_results = max_results
         self.max_ects = max_ects
+        self.min_ects = min_ects
         self.allow_conflicts = allow_conflicts
         self.max_conflicts = max_conflicts
         self.transcript = transcript
         self.enable_smart_filtering = enable_smart_filtering and ISIK_FILTERING_AVAILABLE
         self.scheduler_prefs = scheduler_prefs or SchedulerPrefs()
         self.timeout_seconds = timeout_seconds
+        # Prove obviously infeasible requests before running the search
+        self.check_feasibility = True
+        # Merge sections meeting at identical times (e.g. other teachers) and
+        # break group symmetry; off by default so every teacher stays selectable
+        self.collapse_identical_sections = False
 
         self._performance_history = []  # type: List[Dict[str, Any]]
         self._last_run_stats = {}  # type: Dict[str, Any]
         self._results = []  # type: List[Schedule]
         self._active_mandatory_codes = set()  # type: Set[str]
+        self._pinned_sections = set()  # type: Set[str]
+        self._previous_results = []  # type: List[Schedule]
+        self._diversity = None  # type: Optional[Tuple[float, int]]
+        # Private random streams; None seeds every run from fresh entropy
+        self.seed = seed
+        self._reset_random_streams()
 
     # ------------------------------------------------------------------
     # Abstract behaviour
@@ -156,8 +190,14 @@ class BaseScheduler(ABC):
         course_groups: Dict[str, CourseGroup],
         mandatory_codes: Set[str],
         optional_codes: Optional[Set[str]] = None,
+        valid_selections: Optional[Dict[str, List[List[Course]]]] = None,
     ) -> List[Schedule]:
-        """Shared entry point used by every scheduler implementation."""
+        """Shared entry point used by every scheduler implementation.
+
+        ``valid_selections`` may carry the section combinations of every group
+        of ``course_groups`` (``build_valid_selections``) so that runs over
+        the same catalog do not rebuild them.
+        """
 
         self._results.clear()
         self._last_run_stats = {
@@ -165,22 +205,156 @@ class BaseScheduler(ABC):
             "branches_pruned": 0,
             "generated": 0,
         }
+        self._reset_random_streams()
+        # Entropy of this run; pass it back as ``seed`` to replay an unseeded run
+        self._last_run_stats["seed"] = self._seed_sequence.entropy
 
         if not course_groups or not mandatory_codes:
             self._last_run_stats["status"] = "invalid-input"
             return []
 
-        search = self._prepare_search_space(course_groups, mandatory_codes, optional_codes)
+        search = self._prepare_search_space(
+            course_groups, mandatory_codes, optional_codes, valid_selections
+        )
         if search is None:
             self._last_run_stats["status"] = "no-valid-selections"
             return []
 
-        raw_results = self._run_algorithm(search)
+        if self.check_feasibility and self._prove_infeasible(search):
+            self._last_run_stats["status"] = "infeasible"
+            return []
+
+        requested = self.max_results
+        factor = 1
+        if self._diversity is not None:
+            # Gather a larger candidate pool to pick diverse results from
+            factor = self._diversity[1]
+        if search.symmetry is not None and not self.breaks_symmetry:
+            # Symmetric duplicates are only dropped after the run; one enlarged
+            # pool serves both, so the factors do not compound
+            symmetry_factor = min(search.symmetry.multiplicity, SYMMETRY_POOL_CAP)
+            self._last_run_stats["symmetry_pool_factor"] = symmetry_factor
+            factor = max(factor, symmetry_factor)
+        self.max_results = requested * factor
+        try:
+            raw_results = self._run_algorithm(search)
+        finally:
+            self.max_results = requested
+        if search.warm_start:
+            raw_results = self._merge_warm_start(raw_results, search.warm_start)
+        if search.symmetry is not None:
+            raw_results = self._drop_symmetric_duplicates(raw_results, search.symmetry)
         self._results = self._finalize_results(raw_results)
         self._last_run_stats["generated"] = len(self._results)
         self._last_run_stats["status"] = "ok"
         return self._results
 
+    def warm_start(
+        self,
+        pinned_sections: Iterable[str] = (),
+        previous_results: Iterable[Schedule] = (),
+    ) -> None:
+        """
+        Seed subsequent runs with pinned sections and an earlier result set.
+
+        Groups containing a pinned section code keep only the options with
+        every pinned section of that group and become mandatory, so the search
+        only branches over unpinned groups. Previous schedules that are still
+        valid are offered to the algorithm as incumbents and merged into its
+        results, so a re-solve never returns worse schedules than before.
+        """
+        self._pinned_sections = set(pinned_sections)
+        self._previous_results = list(previous_results)
+
+    def diversify_results(
+        self,
+        tolerance: Optional[float] = 0.1,
+        pool_factor: int = DIVERSITY_POOL_FACTOR,
+    ) -> None:
+        """
+        Return diverse instead of plain top-k results from subsequent runs.
+
+        Selection is post-hoc: algorithms are asked for ``pool_factor`` times
+        ``max_results`` candidates, so a diverse run costs more than a plain
+        one. The best candidate is kept, and the others are picked by max-min
+        Hamming distance among candidates scoring within ``tolerance``
+        (relative) of it. ``tolerance=None`` restores plain top-k.
+        """
+        self._diversity = None if tolerance is None else (tolerance, max(1, pool_factor))
+
+    def count_valid_schedules(
+        self,
+        course_groups: Dict[str, CourseGroup],
+        mandatory_codes: Set[str],
+        optional_codes: Optional[Set[str]] = None,
+    ) -> int:
+        """
+        Exact number of schedules satisfying this scheduler's hard constraints.
+
+        Counts with a memoised DP over groups instead of enumerating; raises
+        ``StateBudgetExceeded`` for catalogs too large to count. Sections that
+        ``collapse_identical_sections`` would merge are counted separately.
+        """
+        from .solution_space import SolutionSpace
+
+        if not course_groups or not mandatory_codes:
+            return 0
+        search = self._prepare_uncollapsed_space(course_groups, mandatory_codes, optional_codes)
+        if search is None:
+            return 0
+        return SolutionSpace.from_search(self, search).count()
+
+    def sample_valid_schedules(
+        self,
+        course_groups: Dict[str, CourseGroup],
+        mandatory_codes: Set[str],
+        optional_codes: Optional[Set[str]] = None,
+        count: int = 1,
+        rng: Optional[random.Random] = None,
+    ) -> List[Schedule]:
+        """Draw ``count`` valid schedules uniformly at random (with replacement).
+
+        Samples the same space ``count_valid_schedules`` counts, so every
+        section can be drawn even when collapsing is enabled.
+        """
+        from .solution_space import SolutionSpace
+
+        if not course_groups or not mandatory_codes:
+            return []
+        search = self._prepare_uncollapsed_space(course_groups, mandatory_codes, optional_codes)
+        if search is None:
+            return []
+        space = SolutionSpace.from_search(self, search)
+        samples = space.sample_many(count, rng or self._rng)
+        return [space.table.to_schedule(assignment) for assignment in samples]
+
+    @staticmethod
+    def build_valid_selections(
+        course_groups: Dict[str, CourseGroup],
+    ) -> Dict[str, List[List[Course]]]:
+        """Section combinations of every group, reusable across selections of one catalog."""
+        valid_selections, _ = ConstraintUtils.build_group_options(course_groups, set())
+        return valid_selections
+
+    # ------------------------------------------------------------------
+    # Random streams
+    # ------------------------------------------------------------------
+    def _reset_random_streams(self) -> None:
+        """Restart the private streams so equal seeds give identical runs."""
+        self._seed_sequence = np.random.SeedSequence(self.seed)
+        self._rng = random.Random(int(self._seed_sequence.generate_state(1, np.uint64)[0]))
+
+    def _numpy_rng(self) -> np.random.Generator:
+        """NumPy generator on a stream independent of ``_rng``."""
+        return np.random.default_rng(self._seed_sequence.spawn(1)[0])
+
+    def _spawn_seeds(self, count: int) -> List[int]:
+        """Seeds of ``count`` independent streams, e.g. one per parallel worker."""
+        return [
+            int(child.generate_state(1, np.uint64)[0])
+            for child in self._seed_sequence.spawn(count)
+        ]
+
     # ------------------------------------------------------------------
     # Helper methods
     # ------------------------------------------------------------------
@@ -189,12 +363,32 @@ class BaseScheduler(ABC):
         course_groups: Dict[str, CourseGroup],
         mandatory_codes: Set[str],
         optional_codes: Optional[Set[str]] = None,
+        shared_selections: Optional[Dict[str, List[List[Course]]]] = None,
     ) -> Optional[PreparedSearch]:
         """Build constraint-aware search structures shared across algorithms."""
 
-        valid_selections, group_options = ConstraintUtils.build_group_options(
-            course_groups, mandatory_codes
-        )
+        if shared_selections is None:
+            valid_selections, group_options = ConstraintUtils.build_group_options(
+                course_groups, mandatory_codes
+            )
+        else:
+            # Same layout as build_group_options; the dicts are per run, the lists shared
+            valid_selections = dict(shared_selections)
+            group_options = {
+                code: list(selections) if code in mandatory_codes else [None] + selections
+                for code, selections in shared_selections.items()
+            }
+
+        if self._pinned_sections:
+            selected = set(mandatory_codes) | set(optional_codes or ())
+            pinned_groups = self._apply_pins(
+                course_groups, selected, valid_selections, group_options
+            )
+            if pinned_groups is None:
+                return None
+            mandatory_codes = set(mandatory_codes) | pinned_groups
+            if optional_codes is not None:
+                optional_codes = set(optional_codes) - pinned_groups
 
         invalid_mandatory = [code for code in mandatory_codes if not valid_selections.get(code)]
         if invalid_mandatory:
@@ -212,26 +406,159 @@ class BaseScheduler(ABC):
         filtered_keys = [key for key in all_keys if key in included_codes]
 
         mandatory_keys = [key for key in filtered_keys if key in mandatory_codes]
-        optional_keys = [key for key in filtered_keys if key in optional_codes]
+        # A code listed as both mandatory and optional is mandatory
+        optional_keys = [
+            key for key in filtered_keys
+            if key in optional_codes and key not in mandatory_codes
+        ]
+
+        collapsed = 0
+        if self.collapse_identical_sections:
+            collapsed = collapse_sections(filtered_keys, group_options, valid_selections)
+        self._last_run_stats["collapsed_sections"] = collapsed
 
         mandatory_keys.sort(key=lambda k: len(group_options.get(k, [])))
         optional_keys.sort(key=lambda k: len(group_options.get(k, [])))
 
         self._active_mandatory_codes = set(mandatory_codes)
 
-        return PreparedSearch(
-            group_keys=mandatory_keys + optional_keys,
+        group_keys = mandatory_keys + optional_keys
+        # Both symmetries ignore who teaches a section, so they go together
+        symmetry = None
+        if self.collapse_identical_sections:
+            symmetry = detect_symmetries(group_keys, group_options, mandatory_codes)
+        self._last_run_stats["symmetric_chains"] = symmetry.chains if symmetry else 0
+
+        search = PreparedSearch(
+            group_keys=group_keys,
             mandatory_keys=mandatory_keys,
             optional_keys=optional_keys,
             group_options=group_options,
             valid_selections=valid_selections,
             mandatory_codes=set(mandatory_codes),
             optional_codes=set(optional_codes),
+            symmetry=symmetry,
+            ects_bounds=EctsBounds(
+                group_keys, group_options, mandatory_codes, self.min_ects, self.max_ects
+            ),
         )
+        if self._previous_results:
+            search.warm_start = self._warm_start_incumbents(search)
+        return search
+
+    def _prepare_uncollapsed_space(
+        self,
+        course_groups: Dict[str, CourseGroup],
+        mandatory_codes: Set[str],
+        optional_codes: Optional[Set[str]] = None,
+    ) -> Optional[PreparedSearch]:
+        """Search space with every section kept apart; leaves the last run's stats alone."""
+        collapse, stats = self.collapse_identical_sections, self._last_run_stats
+        self.collapse_identical_sections, self._last_run_stats = False, {}
+        try:
+            return self._prepare_search_space(course_groups, mandatory_codes, optional_codes)
+        finally:
+            self.collapse_identical_sections, self._last_run_stats = collapse, stats
+
+    def _apply_pins(
+        self,
+        course_groups: Dict[str, CourseGroup],
+        selected_codes: Set[str],
+        valid_selections: Dict[str, List[List[Course]]],
+        group_options: Dict[str, List[Optional[List[Course]]]],
+    ) -> Optional[Set[str]]:
+        """Restrict pinned groups to matching selections; None if a pin cannot be met.
+
+        Only groups in ``selected_codes`` are pinned; pins of other groups are
+        reported as ``ignored_pins`` rather than bringing the course back in.
+        """
+        pinned_groups = set()
+        ignored = set(self._pinned_sections)
+        for main_code, group in course_groups.items():
+            pins = {course.code for course in group.courses} & self._pinned_sections
+            if not pins or main_code not in selected_codes:
+                continue
+            ignored -= pins
+            kept = [
+                selection for selection in valid_selections.get(main_code, [])
+                if pins <= {course.code for course in selection}
+            ]
+            if not kept:
+                self._last_run_stats["unsatisfiable_pins"] = sorted(pins)
+                return None
+            valid_selections[main_code] = kept
+            group_options[main_code] = list(kept)
+            pinned_groups.add(main_code)
+        self._last_run_stats["pinned_groups"] = len(pinned_groups)
+        self._last_run_stats["ignored_pins"] = sorted(ignored)
+        return pinned_groups
+
+    def _warm_start_incumbents(self, search: PreparedSearch) -> List[Schedule]:
+        """Previous results expressible in ``search`` and still valid, best first.
+
+        Incumbents are rebuilt from the current catalog, so a section whose
+        times changed since the earlier run is scored and returned as it is now.
+        """
+        from .incremental import OptionTable
+
+        table = OptionTable(search)
+        incumbents = []
+        seen = set()
+        for previous in self._previous_results:
+            assignment = table.assignment_for(previous)
+            if assignment is None:
+                continue
+            key = tuple(assignment[group] for group in table.group_keys)
+            if key in seen:
+                continue
+            seen.add(key)
+            schedule = table.to_schedule(assignment)
+            if self._is_valid_final_schedule(schedule):
+                incumbents.append(schedule)
+        self._sort_schedules(incumbents)
+        self._last_run_stats["warm_start_incumbents"] = len(incumbents)
+        return incumbents
+
+    def _prove_infeasible(self, search: PreparedSearch) -> bool:
+        """Run the millisecond pre-check; records the unsatisfiable core if it fires."""
+        from .feasibility import check_feasibility
+
+        report = check_feasibility(self, search)
+        if report is None:
+            return False
+        self._last_run_stats["infeasible_core"] = report.core
+        self._last_run_stats["infeasibility_reasons"] = report.reasons
+        self._last_run_stats["feasibility_seconds"] = report.seconds
+        return True
+
+    def _drop_symmetric_duplicates(
+        self, results: List[Schedule], symmetry: SymmetryInfo
+    ) -> List[Schedule]:
+        """Keep the first schedule of every canonical equivalence class."""
+        unique = []
+        seen = set()
+        for schedule in results:
+            key = symmetry.canonical_key(schedule)
+            if key not in seen:
+                seen.add(key)
+                unique.append(schedule)
+        self._last_run_stats["canonical_duplicates"] = len(results) - len(unique)
+        return unique
+
+    @staticmethod
+    def _merge_warm_start(results: List[Schedule], incumbents: List[Schedule]) -> List[Schedule]:
+        """Append incumbents that the run did not rediscover."""
+        known = {schedule.identity for schedule in results}
+        return list(results) + [
+            schedule for schedule in incumbents if schedule.identity not in known
+        ]
 
     def _finalize_results(self, results: Iterable[Schedule]) -> List[Schedule]:
         """Sort schedules based on preferences and apply result limits."""
 
+        if self._diversity is not None:
+            return self._finalize_diverse_results(results)
+
         filtered = []  # type: List[Schedule]
         for schedule in results:
             if not self._is_valid_final_schedule(schedule):
@@ -249,6 +576,25 @@ class BaseScheduler(ABC):
         self._sort_schedules(filtered)
         return filtered
 
+    def _finalize_diverse_results(self, results: Iterable[Schedule]) -> List[Schedule]:
+        """Pick diverse results from the finished run's candidates."""
+        tolerance, pool_factor = self._diversity
+        selector = DiverseTopK(
+            self.max_results,
+            lambda schedule: cached_score(schedule, self.scheduler_prefs),
+            tolerance=tolerance,
+            pool_factor=pool_factor,
+        )
+        for schedule in results:
+            if self._is_valid_final_schedule(schedule):
+                selector.add(schedule)
+
+        selected = selector.select()
+        self._last_run_stats["diversity_pool"] = len(selector)
+        self._last_run_stats["diversity_min_distance"] = selector.min_distance
+        self._sort_schedules(selected)
+        return selected
+
     def filter_courses_by_prerequisites(
         self, courses: List[Course]
     ) -> List[Course]:
@@ -306,19 +652,19 @@ class BaseScheduler(ABC):
             return
 
         if self.scheduler_prefs:
-            schedules.sort(key=lambda s: score_schedule(s, self.scheduler_prefs), reverse=True)
+            schedules.sort(key=lambda s: cached_score(s, self.scheduler_prefs), reverse=True)
         else:
             schedules.sort(key=lambda s: (s.conflict_count, -s.total_credits))
 
     def _select_worst_schedule(self, schedules: Sequence[Schedule]) -> Schedule:
         """Select the worst schedule from the given list based on quality metrics."""
         if self.scheduler_prefs:
-            return min(schedules, key=lambda s: score_schedule(s, self.scheduler_prefs))
+            return min(schedules, key=lambda s: cached_score(s, self.scheduler_prefs))
         return max(schedules, key=lambda s: (s.conflict_count, -s.total_credits))
 
     def _is_schedule_better(self, candidate: Schedule, incumbent: Schedule) -> bool:
         if self.scheduler_prefs:
-            return score_schedule(candidate, self.scheduler_prefs) > score_schedule(
+            return cached_score(candidate, self.scheduler_prefs) > cached_score(
                 incumbent, self.scheduler_prefs
             )
         return (
@@ -343,6 +689,24 @@ class BaseScheduler(ABC):
 
         return schedule.conflict_count == 0
 
+    def _is_admissible_state(
+        self, conflicts: int, ects: int, free_day_violation: bool, complete: bool = False
+    ) -> bool:
+        """Hard constraints of ``_is_valid_final_schedule`` on pre-computed totals.
+
+        Used by searches that track ECTS, conflicts and strict free-day
+        violations incrementally instead of rebuilding a ``Schedule``. The
+        ECTS minimum only applies to ``complete`` states; partial ones can
+        still grow.
+        """
+        if ects > self.max_ects or free_day_violation:
+            return False
+        if complete and ects < self.min_ects:
+            return False
+        if self.allow_conflicts:
+            return conflicts <= self.max_conflicts
+        return conflicts == 0
+
     def _is_valid_final_schedule(self, schedule: Schedule) -> bool:
         """
         Validate that a schedule meets all hard constraints.
@@ -353,7 +717,7 @@ class BaseScheduler(ABC):
         Returns:
             True if schedule is valid, False otherwise
         """
-        if schedule.total_credits > self.max_ects:
+        if not self.min_ects <= schedule.total_credits <= self.max_ects:
             return False
 
         if not self.allow_conflicts:
@@ -409,7 +773,7 @@ class BaseScheduler(ABC):
         conflicts = [schedule.conflict_count for schedule in self._results]
         preference_scores = []  # type: List[float]
         if self.scheduler_prefs:
-            preference_scores = [score_schedule(schedule, self.scheduler_prefs) for schedule in self._results]
+            preference_scores = [cached_score(schedule, self.scheduler_prefs) for schedule in self._results]
 
         def _summary(values: List[float]) -> Dict[str, float]:
             if not values:
@@ -429,7 +793,10 @@ class BaseScheduler(ABC):
 
     def analyze_failure(self, course_groups: Optional[Dict[str, CourseGroup]] = None) -> List[str]:
         """
-        Provide generic failure diagnostics for subclasses to extend.
+        Provide failure diagnostics for subclasses to extend.
+
+        Reports the minimal unsatisfiable set of mandatory courses found by
+        the feasibility pre-check when it proved the request infeasible.
 
         Args:
             course_groups: Optional course groups dictionary (for future use)
@@ -444,6 +811,10 @@ class BaseScheduler(ABC):
             issues.append(
                 "Mandatory course(s) missing valid combinations: " + ", ".join(sorted(invalid))
             )
+        issues.extend(self._last_run_stats.get("infeasibility_reasons", []))
+        core = self._last_run_stats.get("infeasible_core")
+        if core and len(core) > 1:
+            issues.append("Smallest conflicting set of mandatory courses: " + ", ".join(core))
 
         if not issues:
             issues.append("No schedules generated – check constraints or increase limits")
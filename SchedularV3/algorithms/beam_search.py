@@ -0,0 +1,267 @@
+"""Beam search scheduler with diversity-aware pruning.
+
+Groups are assigned one level at a time in MRV order (fewest admissible
+options first, then most slot-sharing neighbours). After each level only
+the ``beam_width`` best partial schedules survive, ranked by the
+``CompletionBound`` of A* plus a diversity penalty: a candidate pays for
+every section it shares with the candidates already kept on that level.
+Each level costs O(beam_width x options x groups), so runtime and memory are
+linear in the beam width.
+
+``latency_tier`` picks a width from ``LATENCY_TIERS`` for callers that care
+about response time rather than the exact width.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import heapq
+import math
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from core.models import Schedule
+    from utils.schedule_metrics import SchedulerPrefs
+
+# Runtime imports
+try:
+    from core.models import Schedule
+except ImportError as e:
+    raise ImportError(f"Required module core.models not found: {e}")
+
+try:
+    from utils.schedule_metrics import SchedulerPrefs
+except ImportError as e:
+    raise ImportError(f"Required module utils.schedule_metrics not found: {e}")
+
+from . import register_scheduler
+from .a_star_scheduler import CompletionBound
+from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
+from .ects_bounds import EctsBounds
+from .incremental import IncrementalScorer, OptionTable
+
+
+# Beam width per latency tier
+LATENCY_TIERS: Dict[str, int] = {
+    "interactive": 8,
+    "fast": 32,
+    "balanced": 128,
+    "thorough": 512,
+}
+
+# (option indices, ects, occupied mask, conflict mask)
+BeamState = Tuple[Tuple[int, ...], int, int, int]
+
+
+@register_scheduler
+class BeamSearchScheduler(BaseScheduler):
+    """Keeps the best few partial schedules per level for bounded latency."""
+
+    metadata = AlgorithmMetadata(
+        name="BeamSearch",
+        category="informed-search",
+        complexity="O(width * b * d)",
+        description="Beam search with a score bound and diversity-aware pruning",
+        optimal=False,
+        supports_preferences=True,
+    )
+
+    def __init__(
+        self,
+        max_results: int = 5,
+        max_ects: int = 31,
+        allow_conflicts: bool = False,
+        max_conflicts: int = 1,
+        scheduler_prefs: Optional[SchedulerPrefs] = None,
+        timeout_seconds: int = 60,
+        beam_width: int = 64,
+        diversity_weight: float = 2.0,
+        latency_tier: Optional[str] = None,
+        min_ects: int = 0,
+    ) -> None:
+        super().__init__(
+            max_results=max_results,
+            max_ects=max_ects,
+            min_ects=min_ects,
+            allow_conflicts=allow_conflicts,
+            max_conflicts=max_conflicts,
+            scheduler_prefs=scheduler_prefs,
+            timeout_seconds=timeout_seconds,
+        )
+        if latency_tier is not None:
+            beam_width = self.width_for_latency(latency_tier)
+        self.beam_width = max(1, beam_width)
+        self.diversity_weight = max(0.0, diversity_weight)
+
+    @staticmethod
+    def width_for_latency(tier: str) -> int:
+        """Beam width for a latency tier name (see ``LATENCY_TIERS``)."""
+        try:
+            return LATENCY_TIERS[tier]
+        except KeyError:
+            raise ValueError(
+                f"Unknown latency tier {tier!r}; expected one of {', '.join(LATENCY_TIERS)}"
+            ) from None
+
+    def _run_algorithm(self, search: PreparedSearch) -> List[Schedule]:
+        table = OptionTable(
+            dataclasses.replace(search, group_keys=self._mrv_order(search))
+        )
+        # ``search.ects_bounds`` follows the search order, not the MRV order
+        ects_bounds = EctsBounds(
+            table.group_keys, search.group_options, search.mandatory_codes,
+            self.min_ects, self.max_ects,
+        )
+        bound = CompletionBound(
+            table, self.scheduler_prefs, search.mandatory_codes,
+            self.max_ects, self.allow_conflicts, ects_bounds,
+        )
+        stats = self._last_run_stats
+        stats.update({"beam_width": self.beam_width, "peak_candidates": 0})
+        start = time.time()
+
+        beam: List[BeamState] = [((), 0, 0, 0)]
+        for depth, group in enumerate(table.group_keys):
+            if time.time() - start >= self.timeout_seconds:
+                stats["timeout_reached"] = True
+                return []
+
+            candidates = self._expand(table, bound, beam, depth, group)
+            stats["peak_candidates"] = max(stats["peak_candidates"], len(candidates))
+            beam = self._select(table, candidates)
+            if not beam:
+                return []
+
+        return self._best_complete(table, beam)
+
+    def _mrv_order(self, search: PreparedSearch) -> List[str]:
+        """Groups with the fewest admissible options first, ties by slot degree."""
+        table = OptionTable(search)
+        union_masks = {}
+        admissible = {}
+        for group in table.group_keys:
+            mask = 0
+            count = 0
+            for option in table.options[group]:
+                if option is None or option.ects > self.max_ects:
+                    continue
+                count += 1
+                mask |= option.mask
+            union_masks[group] = mask
+            admissible[group] = count
+
+        def degree(group: str) -> int:
+            return sum(
+                1 for other, mask in union_masks.items()
+                if other != group and mask & union_masks[group]
+            )
+
+        return sorted(
+            table.group_keys,
+            key=lambda group: (
+                group not in search.mandatory_codes,
+                admissible[group],
+                -degree(group),
+            ),
+        )
+
+    def _expand(
+        self,
+        table: OptionTable,
+        bound: CompletionBound,
+        beam: List[BeamState],
+        depth: int,
+        group: str,
+    ) -> List[Tuple[float, BeamState]]:
+        candidates = []
+        for indices, ects, occupied, conflicts in beam:
+            for index, option in enumerate(table.options[group]):
+                child_ects, child_occupied, child_conflicts = ects, occupied, conflicts
+                if option is not None:
+                    child_ects += option.ects
+                    child_conflicts |= (occupied & option.mask) | option.overlap_mask
+                    child_occupied |= option.mask
+                    if not self._is_admissible_state(
+                        child_conflicts.bit_count(), child_ects, False
+                    ):
+                        self._last_run_stats["branches_pruned"] += 1
+                        continue
+
+                self._last_run_stats["nodes_explored"] += 1
+                priority = bound.lower_bound(depth + 1, child_ects, child_occupied, child_conflicts)
+                if math.isinf(priority) and priority > 0:
+                    self._last_run_stats["branches_pruned"] += 1
+                    continue
+                candidates.append(
+                    (priority, (indices + (index,), child_ects, child_occupied, child_conflicts))
+                )
+        return candidates
+
+    def _select(
+        self, table: OptionTable, candidates: List[Tuple[float, BeamState]]
+    ) -> List[BeamState]:
+        """
+        Keep ``beam_width`` candidates, best bound first, penalising shared sections.
+
+        Penalties only grow as candidates are kept, so a lazy heap re-checks a
+        popped candidate and re-queues it if its penalty went up meanwhile.
+        """
+        if len(candidates) <= self.beam_width:
+            return [state for _, state in candidates]
+
+        # Bounds are -inf when preference weights are negative; rank those by ECTS
+        heap = [
+            (priority if not math.isinf(priority) else 0.0, -state[1], order, 0.0, state)
+            for order, (priority, state) in enumerate(candidates)
+        ]
+        heapq.heapify(heap)
+        shared: Dict[Tuple[int, int], int] = {}
+        kept: List[BeamState] = []
+
+        while heap and len(kept) < self.beam_width:
+            key, neg_ects, order, penalty, state = heapq.heappop(heap)
+            current = self._diversity_penalty(shared, state[0])
+            if current > penalty:
+                heapq.heappush(heap, (key - penalty + current, neg_ects, order, current, state))
+                continue
+            kept.append(state)
+            for position, index in enumerate(state[0]):
+                # Skipping an optional group is not a shared section
+                if table.get(table.group_keys[position], index) is not None:
+                    shared[(position, index)] = shared.get((position, index), 0) + 1
+        return kept
+
+    def _diversity_penalty(
+        self, shared: Dict[Tuple[int, int], int], indices: Tuple[int, ...]
+    ) -> float:
+        """Weight x share of the beam using each section of ``indices``, averaged."""
+        if not self.diversity_weight:
+            return 0.0
+        overlap = sum(shared.get((position, index), 0) for position, index in enumerate(indices))
+        return self.diversity_weight * overlap / (len(indices) * self.beam_width)
+
+    def _best_complete(self, table: OptionTable, beam: List[BeamState]) -> List[Schedule]:
+        """Score complete states exactly and return the best ``max_results``."""
+        ranked = []
+        for indices, ects, _, _ in beam:
+            if ects < self.min_ects or not any(
+                table.get(group, index) for group, index in zip(table.group_keys, indices)
+            ):
+                continue
+            scorer = IncrementalScorer(self.scheduler_prefs)
+            for group, index in zip(table.group_keys, indices):
+                scorer.add(table.get(group, index))
+            if not scorer.violates_strict_free_days():
+                ranked.append((scorer.cost(), indices))
+
+        ranked.sort()
+        if ranked:
+            self._last_run_stats["best_cost"] = ranked[0][0]
+        return [
+            table.to_schedule(dict(zip(table.group_keys, indices)))
+            for _, indices in ranked[: self.max_results]
+        ]
+
+
+__all__ = ["BeamSearchScheduler", "LATENCY_TIERS"]
@@ -1,9 +1,17 @@
-"""Benchmark utilities for comparing scheduling algorithms."""
+"""Benchmark utilities for comparing scheduling algorithms.
+
+Stochastic schedulers accept a ``seed``; ``AlgorithmBenchmark.run`` repeats
+every algorithm once per seed so comparisons are reproducible and report the
+spread (standard deviation, 95% confidence interval) next to the mean.
+"""
 
 from __future__ import annotations
 
+import inspect
+import math
+import statistics
 import time
-from typing import TYPE_CHECKING, Dict, Iterable, Optional, Sequence, Tuple, Type, Union
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
 
 if TYPE_CHECKING:
     from core.models import CourseGroup, Schedule
@@ -27,6 +35,23 @@ from .evaluator import evaluate_schedule
 
 AlgorithmSpec = Union[str, Type[BaseScheduler]]
 
+# Two-sided 95% Student-t critical values by degrees of freedom (1..30)
+_T95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+
+
+def _spread(values: List[float]) -> Tuple[float, float, float]:
+    """Mean, sample standard deviation and 95% confidence half-width."""
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, 0.0, 0.0
+    std = statistics.stdev(values)
+    critical = _T95[len(values) - 2] if len(values) - 1 <= len(_T95) else 1.96
+    return mean, std, critical * std / math.sqrt(len(values))
+
 
 class AlgorithmBenchmark:
     """Execute multiple algorithms on identical input data and collect metrics."""
@@ -47,38 +72,74 @@ class AlgorithmBenchmark:
         self,
         algorithms: Iterable[AlgorithmSpec],
         per_algorithm_kwargs: Optional[Dict[str, Dict]] = None,
+        seeds: Optional[Sequence[int]] = None,
     ) -> Dict[str, Dict[str, float]]:
+        """
+        Run every algorithm once per seed and summarise the runs.
+
+        Args:
+            algorithms: Registered names or scheduler classes
+            per_algorithm_kwargs: Constructor kwargs keyed by algorithm name
+            seeds: Seeds passed to schedulers accepting ``seed``; a single
+                unseeded run when omitted
+
+        Returns:
+            Per algorithm: mean ``duration``, ``results``, ``best_conflicts``
+            and ``best_score``, plus ``runs`` and the ``*_std`` / ``*_ci95``
+            spread of duration and best score
+        """
         per_algorithm_kwargs = per_algorithm_kwargs or {}
+        run_seeds: List[Optional[int]] = list(seeds) if seeds else [None]
         summary: Dict[str, Dict[str, float]] = {}
 
         for spec in algorithms:
             scheduler_cls = self._resolve_spec(spec)
             name = scheduler_cls.metadata.name if hasattr(scheduler_cls, "metadata") else scheduler_cls.__name__
-
             kwargs = per_algorithm_kwargs.get(name, {})
-            scheduler = scheduler_cls(scheduler_prefs=self.prefs, **kwargs)
-
-            start = time.perf_counter()
-            schedules = scheduler.generate_schedules(
-                self.course_groups,
-                self.mandatory_codes,
-                optional_codes=self.optional_codes,
-            )
-            duration = time.perf_counter() - start
-
-            evaluation = {}
-            if schedules:
-                evaluation = evaluate_schedule(schedules[0], self.prefs)
-
+            seeded = "seed" in inspect.signature(scheduler_cls).parameters
+
+            runs = [
+                self._run_once(scheduler_cls, dict(kwargs, seed=seed) if seeded else kwargs)
+                for seed in run_seeds
+            ]
+            duration, duration_std, duration_ci = _spread([run["duration"] for run in runs])
+            score, score_std, score_ci = _spread([run["best_score"] for run in runs])
             summary[name] = {
                 "duration": duration,
-                "results": len(schedules),
-                "best_conflicts": evaluation.get("conflicts", 0.0),
-                "best_score": evaluation.get("score", 0.0),
+                "results": statistics.fmean(run["results"] for run in runs),
+                "best_conflicts": statistics.fmean(run["best_conflicts"] for run in runs),
+                "best_score": score,
+                "runs": len(runs),
+                "duration_std": duration_std,
+                "duration_ci95": duration_ci,
+                "best_score_std": score_std,
+                "best_score_ci95": score_ci,
             }
 
         return summary
 
+    def _run_once(self, scheduler_cls: Type[BaseScheduler], kwargs: Dict) -> Dict[str, float]:
+        scheduler = scheduler_cls(scheduler_prefs=self.prefs, **kwargs)
+
+        start = time.perf_counter()
+        schedules = scheduler.generate_schedules(
+            self.course_groups,
+            self.mandatory_codes,
+            optional_codes=self.optional_codes,
+        )
+        duration = time.perf_counter() - start
+
+        evaluation = {}
+        if schedules:
+            evaluation = evaluate_schedule(schedules[0], self.prefs)
+
+        return {
+            "duration": duration,
+            "results": len(schedules),
+            "best_conflicts": evaluation.get("conflicts", 0.0),
+            "best_score": evaluation.get("score", 0.0),
+        }
+
     def _resolve_spec(self, spec: AlgorithmSpec) -> Type[BaseScheduler]:
         if isinstance(spec, str):
             cls = get_registered_scheduler(spec)
@@ -1,10 +1,22 @@
-"""Breadth-first search scheduler implementation."""
+"""Breadth-first search scheduler implementation.
+
+Frontier states are compact tuples ``(option indices, ects, occupied mask,
+conflict mask, partial cost)`` rather than course lists, so a child costs one
+small tuple and its ECTS and conflicts are derived from the parent with
+integer arithmetic. One ``IncrementalScorer`` walks the frontier in order,
+adding and removing only the options that differ from the previous state, to
+price each child. The frontier is expanded one level at a time; if the next
+level grows beyond ``max_frontier`` states it is cut down to the
+``max_frontier`` cheapest states, i.e. the search degrades into a beam search
+instead of exhausting memory. Children that break the lexicographic ordering of
+interchangeable groups (``PreparedSearch.symmetry``) are never generated.
+"""
 
 from __future__ import annotations
 
-from collections import deque
+import heapq
 import time
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
     from core.models import Course, Schedule
@@ -23,6 +35,13 @@ except ImportError as e:
 
 from . import register_scheduler
 from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
+from .ects_bounds import EctsBounds
+from .incremental import EncodedOption, IncrementalScorer, OptionTable
+
+
+# (option index per assigned group, ects, occupied slot mask, conflict slot mask,
+#  cost of the partial schedule)
+FrontierState = Tuple[Tuple[int, ...], int, int, int, float]
 
 
 @register_scheduler
@@ -37,6 +56,7 @@ class BFSScheduler(BaseScheduler):
         optimal=True,
         supports_parallel=True,
     )
+    breaks_symmetry = True
 
     def __init__(
         self,
@@ -46,79 +66,180 @@ class BFSScheduler(BaseScheduler):
         max_conflicts: int = 1,
         scheduler_prefs: Optional[SchedulerPrefs] = None,
         timeout_seconds: int = 180,
+        max_frontier: int = 250_000,
+        min_ects: int = 0,
     ) -> None:
         super().__init__(
             max_results=max_results,
             max_ects=max_ects,
+            min_ects=min_ects,
             allow_conflicts=allow_conflicts,
             max_conflicts=max_conflicts,
             scheduler_prefs=scheduler_prefs,
             timeout_seconds=timeout_seconds,
         )
+        self.max_frontier = max(1, max_frontier)
 
     def _run_algorithm(self, search: PreparedSearch) -> List[Schedule]:
-        queue = deque([(0, [], 0)])  # (group_index, courses, ects)
-        results: List[Schedule] = []
+        table = OptionTable(search)
+        level: List[FrontierState] = [((), 0, 0, 0, 0.0)]
+        # Scorer positioned on the state being expanded, and the options it holds
+        scorer = IncrementalScorer(self.scheduler_prefs)
+        placed: List[Optional[EncodedOption]] = []
         start = time.time()
-
-        while queue and len(results) < self.max_results:
-            if self._should_timeout(start):
-                self._last_run_stats["timeout_reached"] = True
-                break
-
-            group_index, current_courses, current_ects = queue.popleft()
-            self._last_run_stats["nodes_explored"] += 1
-
-            if self._process_leaf_node(group_index, current_courses, search, results):
-                continue
-
-            self._process_branch_node(group_index, current_courses, current_ects, search, queue)
-
-        return results
+        stats = self._last_run_stats
+        stats.update({"peak_frontier": 1, "beam_mode": False, "frontier_truncations": 0})
+
+        position = {group: index for index, group in enumerate(table.group_keys)}
+        for group_index, group_key in enumerate(table.group_keys):
+            constraint = self._ordering_constraint(search, group_key, position)
+            next_level: List[FrontierState] = []
+            for state in level:
+                if self._should_timeout(start):
+                    stats["timeout_reached"] = True
+                    return []
+
+                group_ranks, floor = None, -1
+                if constraint is not None:
+                    # Interchangeable groups must not decrease in signature rank
+                    previous_position, previous_ranks, group_ranks = constraint
+                    floor = previous_ranks[state[0][previous_position]]
+                self._move_scorer(scorer, placed, state[0], table)
+                self._expand_state(
+                    state, table.options[group_key], next_level, group_ranks, floor,
+                    search.ects_bounds, group_index + 1, scorer,
+                )
+                if len(next_level) >= 2 * self.max_frontier:
+                    next_level = self._truncate_frontier(next_level)
+
+            if len(next_level) > self.max_frontier:
+                next_level = self._truncate_frontier(next_level)
+
+            stats["nodes_explored"] += len(level)
+            stats["peak_frontier"] = max(stats["peak_frontier"], len(next_level))
+            level = next_level
+            if not level:
+                return []
+
+        return self._collect_leaves(level, table)
 
     def _should_timeout(self, start: float) -> bool:
         """Check if timeout has been reached."""
         return time.time() - start >= self.timeout_seconds
 
-    def _process_leaf_node(
+    @staticmethod
+    def _ordering_constraint(
+        search: PreparedSearch, group: str, position: Dict[str, int]
+    ) -> Optional[Tuple[int, List[int], List[int]]]:
+        """(predecessor position, predecessor ranks, own ranks) of a symmetric group."""
+        symmetry = search.symmetry
+        previous = symmetry.predecessors.get(group) if symmetry else None
+        if previous is None or position[previous] > position[group]:
+            return None
+        return position[previous], symmetry.ranks[previous], symmetry.ranks[group]
+
+    @staticmethod
+    def _move_scorer(
+        scorer: IncrementalScorer,
+        placed: List[Optional[EncodedOption]],
+        indices: Tuple[int, ...],
+        table: OptionTable,
+    ) -> None:
+        """Re-position ``scorer`` on ``indices``, touching only the differing suffix.
+
+        Consecutive frontier states share long prefixes, so walking the
+        frontier in order costs about one add/remove per trie edge.
+        """
+        common = 0
+        limit = min(len(placed), len(indices))
+        while common < limit and placed[common] is table.get(
+            table.group_keys[common], indices[common]
+        ):
+            common += 1
+        while len(placed) > common:
+            scorer.remove(placed.pop())
+        for group, index in zip(table.group_keys[common:], indices[common:]):
+            option = table.get(group, index)
+            scorer.add(option)
+            placed.append(option)
+
+    def _expand_state(
         self,
-        group_index: int,
-        current_courses: List[Course],
-        search: PreparedSearch,
-        results: List[Schedule],
-    ) -> bool:
-        """Process a leaf node (all groups assigned). Returns True if processed."""
-        if group_index >= len(search.group_keys):
-            if current_courses:
-                schedule = Schedule(current_courses.copy())
-                if self._is_valid_final_schedule(schedule):
-                    results.append(schedule)
+        state: FrontierState,
+        options: List[Optional[EncodedOption]],
+        next_level: List[FrontierState],
+        group_ranks: Optional[List[int]] = None,
+        floor: int = -1,
+        bounds: Optional[EctsBounds] = None,
+        depth: int = 0,
+        scorer: Optional[IncrementalScorer] = None,
+    ) -> None:
+        """Append every feasible child of ``state`` for the next group.
+
+        With ``bounds``, children whose ECTS cannot complete over the groups
+        from ``depth`` on are pruned as well. ``scorer`` must hold ``state``;
+        children then carry their partial cost (otherwise the parent's).
+        """
+        indices, ects, occupied, conflict_mask, cost = state
+        for index, option in enumerate(options):
+            if group_ranks is not None and group_ranks[index] < floor:
+                self._last_run_stats["branches_pruned"] += 1
+                continue
+            new_ects = ects + option.ects if option is not None else ects
+            if bounds is not None and not bounds.allows(depth, new_ects):
+                self._last_run_stats["branches_pruned"] += 1
+                continue
+            if option is None:
+                next_level.append((indices + (index,), ects, occupied, conflict_mask, cost))
+                continue
+
+            new_conflicts = conflict_mask | (occupied & option.mask) | option.overlap_mask
+            if new_ects > self.max_ects or not self._conflicts_allowed(new_conflicts):
+                self._last_run_stats["branches_pruned"] += 1
+                continue
+            new_cost = cost
+            if scorer is not None:
+                scorer.add(option)
+                new_cost = scorer.cost()
+                scorer.remove(option)
+            next_level.append(
+                (
+                    indices + (option.index,), new_ects, occupied | option.mask,
+                    new_conflicts, new_cost,
+                )
+            )
+
+    def _conflicts_allowed(self, conflict_mask: int) -> bool:
+        if not conflict_mask:
             return True
-        return False
+        return self.allow_conflicts and bin(conflict_mask).count("1") <= self.max_conflicts
 
-    def _process_branch_node(
-        self,
-        group_index: int,
-        current_courses: List[Course],
-        current_ects: int,
-        search: PreparedSearch,
-        queue: deque,
-    ) -> None:
-        """Process a branch node (add children to queue)."""
-        group_key = search.group_keys[group_index]
-        options = search.group_options.get(group_key, [])
+    def _truncate_frontier(self, frontier: List[FrontierState]) -> List[FrontierState]:
+        """Keep the ``max_frontier`` cheapest partial states (beam mode)."""
+        self._last_run_stats["beam_mode"] = True
+        self._last_run_stats["frontier_truncations"] += 1
+        self._last_run_stats["branches_pruned"] += len(frontier) - self.max_frontier
 
-        for option in options:
-            if option is None:
-                queue.append((group_index + 1, current_courses, current_ects))
-            else:
-                new_courses = current_courses + option
-                new_ects = current_ects + sum(course.ects for course in option)
-
-                if self._is_valid_partial_selection(new_courses):
-                    queue.append((group_index + 1, new_courses, new_ects))
-                else:
-                    self._last_run_stats["branches_pruned"] += 1
+        kept = set(
+            heapq.nsmallest(self.max_frontier, range(len(frontier)), key=lambda i: frontier[i][4])
+        )
+        # Preserve breadth-first order among the survivors
+        return [state for i, state in enumerate(frontier) if i in kept]
+
+    def _collect_leaves(self, level: List[FrontierState], table: OptionTable) -> List[Schedule]:
+        """Turn complete states into schedules, in frontier order."""
+        results: List[Schedule] = []
+        for indices, _, _, _, _ in level:
+            if len(results) >= self.max_results:
+                break
+            self._last_run_stats["nodes_explored"] += 1
+            courses = table.courses_for(dict(zip(table.group_keys, indices)))
+            if not courses:
+                continue
+            schedule = Schedule(courses)
+            if self._is_valid_final_schedule(schedule):
+                results.append(schedule)
+        return results
 
 
 __all__ = ["BFSScheduler"]
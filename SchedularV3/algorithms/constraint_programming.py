@@ -1,17 +1,37 @@
-"""Constraint programming inspired backtracking scheduler."""
+"""Constraint programming inspired backtracking scheduler.
+
+Groups are variables and their options are values. The search combines:
+
+- dynamic variable ordering: after every assignment the next group is the
+  one with the smallest filtered domain (MRV), ties broken by the number of
+  unassigned groups it shares time slots with (degree);
+- forward checking on slot masks, ECTS (knapsack look-ahead over the
+  unassigned groups, see ``EctsBounds``) and strict free days, recording for
+  every removed value the assigned groups responsible for removing it;
+- conflict-directed backjumping: a group whose domain is exhausted returns
+  the union of those explanations, and every level not in it is skipped;
+- a nogood store: each exhausted conflict set is recorded as a bitmask over
+  option ids (one bit per option of every group) and used by forward
+  checking to discard the same incompatible combination elsewhere in the
+  tree;
+- lexicographic ordering constraints between interchangeable groups (see
+  ``symmetry``), explained by the chain neighbour that triggers them.
+
+An empty conflict set at the root proves that the selection is infeasible.
+"""
 
 from __future__ import annotations
 
 import time
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
-    from core.models import Course, Schedule
+    from core.models import Schedule
     from utils.schedule_metrics import SchedulerPrefs
 
 # Runtime imports
 try:
-    from core.models import Course, Schedule
+    from core.models import Schedule
 except ImportError as e:
     raise ImportError(f"Required module core.models not found: {e}")
 
@@ -22,7 +42,120 @@ except ImportError as e:
 
 from . import register_scheduler
 from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
-from .heuristics import rank_options_by_score
+from .ects_bounds import EctsBounds
+from .incremental import ALL_DAYS, OptionTable
+from .symmetry import SymmetryInfo
+
+
+# group position -> (remaining option indices, groups that removed the others)
+Domains = Dict[int, Tuple[List[int], int]]
+
+
+class _SearchContext:
+    """Assignment state and nogood store of one CP run."""
+
+    def __init__(
+        self,
+        table: OptionTable,
+        forbidden_mask: int,
+        symmetry: Optional[SymmetryInfo] = None,
+        ects_bounds: Optional[EctsBounds] = None,
+    ) -> None:
+        self.table = table
+        self.options = [table.options[group] for group in table.group_keys]
+        self.forbidden_mask = forbidden_mask
+
+        # ECTS every group must add at least / can add at most, by position,
+        # and their sums over the unassigned groups
+        self.cheapest = [
+            ects_bounds.cheapest.get(group, 0) if ects_bounds else 0 for group in table.group_keys
+        ]
+        self.largest = [
+            ects_bounds.largest.get(group, 0) if ects_bounds else 0 for group in table.group_keys
+        ]
+        self.pending_min = sum(self.cheapest)
+        self.pending_max = sum(self.largest)
+
+        # Lexicographic ordering constraints: position -> (chain neighbour, ranks)
+        self.ranks: Dict[int, List[int]] = {}
+        self.predecessor: Dict[int, int] = {}
+        self.successor: Dict[int, int] = {}
+        if symmetry is not None:
+            position_of = {group: position for position, group in enumerate(table.group_keys)}
+            for group, ranks in symmetry.ranks.items():
+                if group in position_of:
+                    self.ranks[position_of[group]] = ranks
+            for following, previous in symmetry.predecessors.items():
+                if following in position_of and previous in position_of:
+                    self.predecessor[position_of[following]] = position_of[previous]
+                    self.successor[position_of[previous]] = position_of[following]
+
+        # Every option of every group owns one bit of the nogood encoding
+        self.option_bits: List[List[int]] = []
+        self.bit_group: Dict[int, int] = {}
+        for position, options in enumerate(self.options):
+            bits = []
+            for _ in options:
+                bit = 1 << len(self.bit_group)
+                self.bit_group[bit] = position
+                bits.append(bit)
+            self.option_bits.append(bits)
+
+        # Groups that share at least one slot (degree heuristic)
+        group_masks = [self._union_mask(options) for options in self.options]
+        self.neighbours = [
+            sum(
+                1 << other
+                for other, other_mask in enumerate(group_masks)
+                if other != position and mask & other_mask
+            )
+            for position, mask in enumerate(group_masks)
+        ]
+
+        self.assignment: Dict[int, int] = {}
+        self.assigned_mask = 0
+        self.selected = 0
+        self.ects = 0
+        self.occupied = 0
+        self.conflicts = 0
+        self.nogoods: Dict[int, List[int]] = {}
+        self.nogood_count = 0
+        self.solutions = 0
+        self.aborted = False
+        self.start = time.time()
+
+    @staticmethod
+    def _union_mask(options) -> int:
+        mask = 0
+        for option in options:
+            if option is not None:
+                mask |= option.mask
+        return mask
+
+    def groups_of(self, option_mask: int) -> int:
+        """Group bitmask of the options set in ``option_mask``."""
+        groups = 0
+        while option_mask:
+            bit = option_mask & -option_mask
+            groups |= 1 << self.bit_group[bit]
+            option_mask ^= bit
+        return groups
+
+    def assigned_groups_touching(self, slot_mask: int) -> int:
+        groups = 0
+        for position, index in self.assignment.items():
+            option = self.options[position][index]
+            if option is not None and option.mask & slot_mask:
+                groups |= 1 << position
+        return groups
+
+    def ects_groups(self) -> int:
+        groups = 0
+        for position, index in self.assignment.items():
+            option = self.options[position][index]
+            if option is not None and option.ects:
+                groups |= 1 << position
+        return groups
 
 
 @register_scheduler
@@ -33,11 +166,12 @@ class ConstraintProgrammingScheduler(BaseScheduler):
         name="ConstraintProgramming",
         category="constraint-programming",
         complexity="O(b^d)",
-        description="Backtracking with MRV and forward checking",
+        description="Backjumping search with forward checking and nogood learning",
         optimal=True,
         supports_preferences=True,
         supports_parallel=False,
     )
+    breaks_symmetry = True
 
     def __init__(
         self,
@@ -46,48 +180,55 @@ class ConstraintProgrammingScheduler(BaseScheduler):
         allow_conflicts: bool = False,
         scheduler_prefs: Optional[SchedulerPrefs] = None,
         timeout_seconds: int = 300,
+        max_nogoods: int = 50_000,
+        min_ects: int = 0,
     ) -> None:
         super().__init__(
             max_results=max_results,
             max_ects=max_ects,
+            min_ects=min_ects,
             allow_conflicts=allow_conflicts,
             scheduler_prefs=scheduler_prefs,
             timeout_seconds=timeout_seconds,
         )
+        self.max_nogoods = max(0, max_nogoods)
 
     def _run_algorithm(self, search: PreparedSearch) -> List[Schedule]:
-        ordered_groups = self._order_groups(search)
-        results: List[Schedule] = []
-        start = time.time()
-        self._cp_backtrack(search, ordered_groups, 0, [], results, start)
-        return results
-
-    def _order_groups(self, search: PreparedSearch) -> List[str]:
-        """Order groups by number of options (MRV heuristic)."""
-        return sorted(
-            search.group_keys,
-            key=lambda key: len(search.group_options.get(key, [])) or 999,
+        table = OptionTable(search)
+        context = _SearchContext(
+            table, self._forbidden_mask(table), search.symmetry, search.ects_bounds
         )
+        stats = self._last_run_stats
+        stats.update({"backjumps": 0, "nogoods": 0, "nogood_prunes": 0})
 
-    def _cp_backtrack(
-        self,
-        search: PreparedSearch,
-        ordered_groups: List[str],
-        index: int,
-        current_courses: List[Course],
-        results: List[Schedule],
-        start: float,
-    ) -> None:
-        if self._should_terminate_search(results, start):
-            return
+        results: List[Schedule] = []
+        domains: Domains = {}
+        for position, options in enumerate(context.options):
+            # Smaller options first, skipping an optional group last
+            ordered = sorted(
+                range(len(options)),
+                key=lambda index: (
+                    options[index] is None,
+                    len(options[index].courses) if options[index] is not None else 0,
+                ),
+            )
+            domains[position] = self._filter(context, position, ordered)
 
-        self._last_run_stats["nodes_explored"] += 1
+        # A mandatory group without any admissible option needs no search
+        if all(values for values, _ in domains.values()):
+            self._cp_backtrack(context, domains, results)
 
-        if index >= len(ordered_groups):
-            self._finalize_schedule(current_courses, results)
-            return
+        stats["nogoods"] = context.nogood_count
+        stats["proven_infeasible"] = not results and not context.aborted
+        return results
 
-        self._process_group(search, ordered_groups, index, current_courses, results, start)
+    def _forbidden_mask(self, table: OptionTable) -> int:
+        """Slots on strict free days; options using them are never admissible."""
+        prefs = self.scheduler_prefs
+        if not prefs or not prefs.strict_free_days or not prefs.desired_free_days:
+            return 0
+        days = set(prefs.desired_free_days) & set(ALL_DAYS)
+        return sum(1 << bit for (day, _), bit in table.slot_bits.items() if day in days)
 
     def _should_terminate_search(self, results: List[Schedule], start: float) -> bool:
         """Check if search should terminate early."""
@@ -98,102 +239,203 @@ class ConstraintProgrammingScheduler(BaseScheduler):
             return True
         return False
 
-    def _finalize_schedule(self, current_courses: List[Course], results: List[Schedule]) -> None:
-        """Finalize and store a valid schedule."""
-        schedule = Schedule(current_courses.copy())
-        if self._is_valid_final_schedule(schedule):
-            results.append(schedule)
+    def _cp_backtrack(
+        self, context: _SearchContext, domains: Domains, results: List[Schedule]
+    ) -> int:
+        """
+        Search below the current assignment.
+
+        Returns:
+            Bitmask of the assigned groups that explain the failure of this
+            subtree (all of them when it produced a schedule or was cut short)
+        """
+        if self._should_terminate_search(results, context.start):
+            context.aborted = True
+            return context.assigned_mask
 
-    def _process_group(
-        self,
-        search: PreparedSearch,
-        ordered_groups: List[str],
-        index: int,
-        current_courses: List[Course],
-        results: List[Schedule],
-        start: float,
-    ) -> None:
-        """Process all options for the current group."""
-        group_key = ordered_groups[index]
-        options = search.group_options.get(group_key, [])
-        ranked = sorted(options, key=lambda opt: len(opt) if opt else float('inf'))
+        self._last_run_stats["nodes_explored"] += 1
 
-        for option in ranked:
-            self._try_option(search, ordered_groups, index, option, current_courses, results, start)
+        if not domains:
+            self._finalize_schedule(context, results)
+            return context.assigned_mask
+
+        position = self._select_group(context, domains)
+        values, conflict = domains[position]
+        remaining = {key: value for key, value in domains.items() if key != position}
+        group_bit = 1 << position
+        solutions_before = context.solutions
+
+        for index in values:
+            saved = self._assign(context, position, index)
+            child_domains, wipeout = self._forward_check(context, remaining)
+            if wipeout is not None:
+                self._last_run_stats["branches_pruned"] += 1
+                child_conflict = wipeout
+            else:
+                child_conflict = self._cp_backtrack(context, child_domains, results)
+            self._unassign(context, position, index, saved)
+
+            if context.aborted:
+                return context.assigned_mask
+            if (
+                wipeout is None
+                and not child_conflict & group_bit
+                and context.solutions == solutions_before
+            ):
+                # This group played no part in the failure below: jump over it
+                self._last_run_stats["backjumps"] += 1
+                return child_conflict
+            conflict |= child_conflict & ~group_bit
+
+        if context.solutions != solutions_before:
+            return context.assigned_mask
+
+        self._record_nogood(context, conflict)
+        return conflict
+
+    def _select_group(self, context: _SearchContext, domains: Domains) -> int:
+        """Smallest remaining domain first, most constraining group on ties."""
+        unassigned = sum(1 << position for position in domains)
+        return min(
+            domains,
+            key=lambda position: (
+                len(domains[position][0]),
+                -(context.neighbours[position] & unassigned).bit_count(),
+                position,
+            ),
+        )
 
-    def _try_option(
-        self,
-        search: PreparedSearch,
-        ordered_groups: List[str],
-        index: int,
-        option: Optional[List[Course]],
-        current_courses: List[Course],
-        results: List[Schedule],
-        start: float,
+    def _assign(self, context: _SearchContext, position: int, index: int) -> Tuple[int, int, int]:
+        """Apply an assignment and return the totals needed to undo it."""
+        saved = (context.ects, context.occupied, context.conflicts)
+        option = context.options[position][index]
+        context.assignment[position] = index
+        context.assigned_mask |= 1 << position
+        context.selected |= context.option_bits[position][index]
+        context.pending_min -= context.cheapest[position]
+        context.pending_max -= context.largest[position]
+        if option is not None:
+            context.ects += option.ects
+            context.conflicts |= (context.occupied & option.mask) | option.overlap_mask
+            context.occupied |= option.mask
+        return saved
+
+    def _unassign(
+        self, context: _SearchContext, position: int, index: int, saved: Tuple[int, int, int]
     ) -> None:
-        """Try a single option for the current group."""
-        if option is None:
-            self._try_skip_option(search, ordered_groups, index, current_courses, results, start)
-            return
+        del context.assignment[position]
+        context.assigned_mask &= ~(1 << position)
+        context.selected &= ~context.option_bits[position][index]
+        context.pending_min += context.cheapest[position]
+        context.pending_max += context.largest[position]
+        context.ects, context.occupied, context.conflicts = saved
 
-        tentative = current_courses + option
-        if not self._is_valid_partial_selection(tentative):
-            self._last_run_stats["branches_pruned"] += 1
-            return
-
-        if not self._forward_check(search, ordered_groups[index + 1 :], tentative):
-            self._last_run_stats["branches_pruned"] += 1
+    def _forward_check(
+        self, context: _SearchContext, domains: Domains
+    ) -> Tuple[Domains, Optional[int]]:
+        """
+        Filter the unassigned domains against the new assignment.
+
+        Returns:
+            Tuple of (filtered domains, explanation of a wiped-out domain or None)
+        """
+        filtered: Domains = {}
+        for position, (values, culprits) in domains.items():
+            kept, removed_by = self._filter(context, position, values)
+            culprits |= removed_by
+            if not kept:
+                return filtered, culprits
+            filtered[position] = (kept, culprits)
+        return filtered, None
+
+    def _filter(
+        self, context: _SearchContext, position: int, values
+    ) -> Tuple[List[int], int]:
+        """Values of one group consistent with the current assignment."""
+        kept: List[int] = []
+        culprits = 0
+        for index in values:
+            reason = self._prune_reason(context, position, index)
+            if reason is None:
+                kept.append(index)
+            else:
+                culprits |= reason
+        return kept, culprits
+
+    def _prune_reason(
+        self, context: _SearchContext, position: int, index: int
+    ) -> Optional[int]:
+        """Assigned groups that rule out an option, or None when it is consistent."""
+        option = context.options[position][index]
+        if option is not None and option.mask & context.forbidden_mask:
+            return 0
+
+        ects = context.ects + (option.ects if option is not None else 0)
+        # Other unassigned groups add at least their cheapest, at most their largest option
+        if ects + context.pending_min - context.cheapest[position] > self.max_ects:
+            return context.ects_groups()
+        if ects + context.pending_max - context.largest[position] < self.min_ects:
+            return context.assigned_mask
+
+        if option is not None:
+            conflicts = context.conflicts | (context.occupied & option.mask) | option.overlap_mask
+            if not self._is_admissible_state(conflicts.bit_count(), 0, False):
+                return context.assigned_groups_touching(conflicts)
+
+        if position in context.ranks:
+            rank = context.ranks[position][index]
+            previous = context.predecessor.get(position)
+            if previous in context.assignment and (
+                context.ranks[previous][context.assignment[previous]] > rank
+            ):
+                return 1 << previous
+            following = context.successor.get(position)
+            if following in context.assignment and (
+                rank > context.ranks[following][context.assignment[following]]
+            ):
+                return 1 << following
+
+        bit = context.option_bits[position][index]
+        for nogood in context.nogoods.get(bit, ()):
+            rest = nogood & ~bit
+            if rest & context.selected == rest:
+                self._last_run_stats["nogood_prunes"] += 1
+                return context.groups_of(rest)
+        return None
+
+    def _record_nogood(self, context: _SearchContext, conflict: int) -> None:
+        """Store the options chosen for ``conflict`` as an incompatible set."""
+        if not conflict or context.nogood_count >= self.max_nogoods:
             return
 
-        self._cp_backtrack(search, ordered_groups, index + 1, tentative, results, start)
-
-    def _try_skip_option(
-        self,
-        search: PreparedSearch,
-        ordered_groups: List[str],
-        index: int,
-        current_courses: List[Course],
-        results: List[Schedule],
-        start: float,
-    ) -> None:
-        """Try skipping the current group (if optional)."""
-        group_key = ordered_groups[index]
-        if group_key not in search.mandatory_codes:
-            self._cp_backtrack(
-                search,
-                ordered_groups,
-                index + 1,
-                current_courses,
-                results,
-                start,
-            )
-
-    def _forward_check(
-        self,
-        search: PreparedSearch,
-        remaining_groups: List[str],
-        tentative_courses: List[Course],
-    ) -> bool:
-        for group in remaining_groups:
-            options = search.group_options.get(group, [])
-            if not options:
-                return False
-
-            if group not in search.mandatory_codes:
-                continue
-
-            has_valid = False
-            for option in options:
-                if option is None:
-                    continue
-                if self._is_valid_partial_selection(tentative_courses + option):
-                    has_valid = True
-                    break
-
-            if not has_valid:
-                return False
-
-        return True
+        nogood = 0
+        for position, index in context.assignment.items():
+            if conflict & (1 << position):
+                nogood |= context.option_bits[position][index]
+
+        bits = []
+        remaining = nogood
+        while remaining:
+            bit = remaining & -remaining
+            bits.append(bit)
+            remaining ^= bit
+        # Keep the store subset-minimal: skip sets implied by a smaller one
+        for bit in bits:
+            if any(stored & nogood == stored for stored in context.nogoods.get(bit, ())):
+                return
+        for bit in bits:
+            context.nogoods.setdefault(bit, []).append(nogood)
+        context.nogood_count += 1
+
+    def _finalize_schedule(self, context: _SearchContext, results: List[Schedule]) -> None:
+        """Finalize and store a valid schedule."""
+        table = context.table
+        schedule = table.to_schedule(
+            {table.group_keys[position]: index for position, index in context.assignment.items()}
+        )
+        if self._is_valid_final_schedule(schedule):
+            results.append(schedule)
+            context.solutions += 1
 
 
 __all__ = ["ConstraintProgrammingScheduler"]
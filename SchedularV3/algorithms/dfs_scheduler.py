@@ -60,6 +60,7 @@ class DFSScheduler(BaseScheduler):
         supports_preferences=True,
         supports_constraints=True,
     )
+    breaks_symmetry = True
 
     def __init__(
         self,
@@ -69,6 +70,7 @@ class DFSScheduler(BaseScheduler):
         max_conflicts: int = 1,
         scheduler_prefs: Optional[SchedulerPrefs] = None,
         timeout_seconds: int = 300,
+        min_ects: int = 0,
     ):
         """
         Initialize the DFS scheduler.
@@ -80,10 +82,12 @@ class DFSScheduler(BaseScheduler):
             max_conflicts: Maximum number of conflicts allowed
             scheduler_prefs: Advanced scheduler preferences for optimization
             timeout_seconds: Maximum time to spend searching (in seconds)
+            min_ects: Minimum ECTS credits a schedule must reach
         """
         super().__init__(
             max_results=max_results,
             max_ects=max_ects,
+            min_ects=min_ects,
             allow_conflicts=allow_conflicts,
             max_conflicts=max_conflicts,
             scheduler_prefs=scheduler_prefs,
@@ -95,6 +99,8 @@ class DFSScheduler(BaseScheduler):
         self._pruned_branches = 0
         self._best_score = float("-inf")
         self._active_mandatory_codes: Set[str] = set()
+        # Option index chosen for each group on the current DFS path
+        self._chosen: Dict[str, int] = {}
 
     # ------------------------------------------------------------------
     # BaseScheduler contract
@@ -105,6 +111,7 @@ class DFSScheduler(BaseScheduler):
         self._pruned_branches = 0
         self._best_score = float("-inf")
         self._active_mandatory_codes = set(search.mandatory_codes)
+        self._chosen = {}
 
         results: List[Schedule] = []
 
@@ -156,10 +163,16 @@ class DFSScheduler(BaseScheduler):
         group_key = search.group_keys[group_index]
         options = search.group_options.get(group_key, [])
 
-        for option in options:
+        for index, option in enumerate(options):
+            # Lexicographic ordering constraints between interchangeable groups
+            if search.symmetry and not search.symmetry.allows(group_key, index, self._chosen):
+                self._pruned_branches += 1
+                continue
+            self._chosen[group_key] = index
             self._process_dfs_option(
                 search, current_courses, current_ects, group_index, results, group_key, option
             )
+            del self._chosen[group_key]
 
     def _handle_dfs_base_case(self, current_courses: List[Course], results: List[Schedule]) -> None:
         """Handle the base case when all groups have been processed."""
@@ -184,6 +197,12 @@ class DFSScheduler(BaseScheduler):
         option: Optional[List[Course]],
     ) -> None:
         """Process a single option for the current group."""
+        new_ects = current_ects + sum(course.ects for course in option or ())
+        # Knapsack look-ahead: remaining mandatory load and reachable minimum
+        if search.ects_bounds and not search.ects_bounds.allows(group_index + 1, new_ects):
+            self._pruned_branches += 1
+            return
+
         if self._should_prune_branch(option, current_courses, current_ects, group_key):
             self._pruned_branches += 1
             return
@@ -198,7 +217,6 @@ class DFSScheduler(BaseScheduler):
             )
         else:
             new_courses = current_courses + option
-            new_ects = current_ects + sum(course.ects for course in option)
             self._dfs_search(
                 search,
                 current_courses=new_courses,
@@ -1,11 +1,19 @@
-"""Dijkstra-based scheduler treating each partial selection as a graph node."""
+"""Dijkstra-based scheduler treating each partial selection as a graph node.
+
+A node is identified by two integers: the index of the next group and a
+bitmask of the selected options (every option of every group owns one bit).
+Queue entries are small tuples of ints; the course list is only rebuilt for
+complete nodes. The node cost (``estimate_conflict_penalty`` of the partial
+selection) is carried along and updated per edge by re-deriving only the
+days the added option touches.
+"""
 
 from __future__ import annotations
 
 import heapq
 import itertools
 import time
-from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
     from core.models import Course, Schedule
@@ -24,7 +32,68 @@ except ImportError as e:
 
 from . import register_scheduler
 from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
-from .heuristics import estimate_conflict_penalty
+from .incremental import ALL_DAYS, EncodedOption, OptionTable
+
+
+# (cost, tie-breaker, group index, selected-option mask, ects, occupied slots, conflict slots)
+QueueEntry = Tuple[float, int, int, int, int, int, int]
+NodeKey = Tuple[int, int]
+
+# Weights of ``estimate_conflict_penalty``
+CONFLICT_WEIGHT = 100
+GAP_WEIGHT = 10
+DAY_WEIGHT = 5
+
+
+class _PenaltyModel:
+    """Per-day decomposition of ``estimate_conflict_penalty`` over slot masks."""
+
+    def __init__(self, table: OptionTable) -> None:
+        self.day_masks: Dict[str, int] = {}
+        self.day_periods: Dict[str, List[Tuple[int, int]]] = {}
+        for (day, period), bit in sorted(table.slot_bits.items()):
+            self.day_masks[day] = self.day_masks.get(day, 0) | (1 << bit)
+            self.day_periods.setdefault(day, []).append((period, 1 << bit))
+        self.option_days: Dict[Tuple[str, int], Tuple[str, ...]] = {}
+        self._day_cache: Dict[Tuple[str, int], int] = {}
+
+    def touched_days(self, option: EncodedOption) -> Tuple[str, ...]:
+        key = (option.group, option.index)
+        days = self.option_days.get(key)
+        if days is None:
+            days = self.option_days[key] = tuple(
+                day for day, mask in self.day_masks.items() if option.mask & mask
+            )
+        return days
+
+    def day_penalty(self, day: str, occupied: int) -> int:
+        """Gap and day-used penalty contributed by one day."""
+        day_bits = occupied & self.day_masks[day]
+        if not day_bits:
+            return 0
+        key = (day, day_bits)
+        penalty = self._day_cache.get(key)
+        if penalty is None:
+            gaps = 0
+            if day in ALL_DAYS:
+                previous = None
+                for period, bit in self.day_periods[day]:
+                    if day_bits & bit:
+                        if previous is not None and period - previous > 1:
+                            gaps += 1
+                        previous = period
+            penalty = self._day_cache[key] = gaps * GAP_WEIGHT + DAY_WEIGHT
+        return penalty
+
+    def edge_cost(
+        self, option: EncodedOption, occupied: int, conflicts: int, new_conflicts: int
+    ) -> int:
+        """Penalty change of adding ``option`` to a node."""
+        new_occupied = occupied | option.mask
+        delta = (new_conflicts.bit_count() - conflicts.bit_count()) * CONFLICT_WEIGHT
+        for day in self.touched_days(option):
+            delta += self.day_penalty(day, new_occupied) - self.day_penalty(day, occupied)
+        return delta
 
 
 @register_scheduler
@@ -48,10 +117,12 @@ class DijkstraScheduler(BaseScheduler):
         max_conflicts: int = 1,
         scheduler_prefs: Optional[SchedulerPrefs] = None,
         timeout_seconds: int = 180,
+        min_ects: int = 0,
     ) -> None:
         super().__init__(
             max_results=max_results,
             max_ects=max_ects,
+            min_ects=min_ects,
             allow_conflicts=allow_conflicts,
             max_conflicts=max_conflicts,
             scheduler_prefs=scheduler_prefs,
@@ -59,12 +130,14 @@ class DijkstraScheduler(BaseScheduler):
         )
 
     def _run_algorithm(self, search: PreparedSearch) -> List[Schedule]:
-        counter = itertools.count()
-        queue: List[Tuple[float, int, int, List[Course], int]] = []
-        heapq.heappush(queue, (0.0, next(counter), 0, [], 0))
+        table = OptionTable(search)
+        penalties = _PenaltyModel(table)
+        option_bits = self._assign_option_bits(table)
 
+        counter = itertools.count()
+        queue: List[QueueEntry] = [(0, next(counter), 0, 0, 0, 0, 0)]
         results: List[Schedule] = []
-        distances: Dict[Tuple[int, Tuple[str, ...]], float] = {}
+        distances: Dict[NodeKey, float] = {}
         start = time.time()
 
         while queue and len(results) < self.max_results:
@@ -72,88 +145,96 @@ class DijkstraScheduler(BaseScheduler):
                 self._last_run_stats["timeout_reached"] = True
                 break
 
-            cost, _, group_index, current_courses, current_ects = heapq.heappop(queue)
+            cost, _, group_index, selected, ects, occupied, conflicts = heapq.heappop(queue)
             self._last_run_stats["nodes_explored"] += 1
 
-            signature = self._compute_signature(group_index, current_courses)
-
-            if self._should_skip_node(signature, distances, cost):
+            key = (group_index, selected)
+            if key in distances and distances[key] <= cost:
                 continue
+            distances[key] = cost
 
-            distances[signature] = cost
-
-            if group_index >= len(search.group_keys):
-                self._try_add_result(current_courses, results)
+            if group_index >= len(table.group_keys):
+                self._try_add_result(self._decode(table, option_bits, selected), results)
                 continue
 
             self._expand_node(
-                queue, counter, group_index, current_courses, current_ects, search, results
+                queue, counter, table, penalties, option_bits,
+                group_index, cost, selected, ects, occupied, conflicts,
             )
 
+        self._last_run_stats["distinct_nodes"] = len(distances)
         return results
 
-    def _compute_signature(self, group_index: int, current_courses: List[Course]) -> Tuple[int, Tuple[str, ...]]:
-        """Compute node signature for visited tracking."""
-        return (group_index, tuple(sorted(course.code for course in current_courses)))
-
-    def _should_skip_node(
-        self,
-        signature: Tuple[int, Tuple[str, ...]],
-        distances: Dict[Tuple[int, Tuple[str, ...]], float],
-        cost: float,
-    ) -> bool:
-        """Check if node should be skipped (already visited with better cost)."""
-        return signature in distances and distances[signature] <= cost
+    @staticmethod
+    def _assign_option_bits(table: OptionTable) -> Dict[Tuple[str, int], int]:
+        """Give every option of every group (including ``None``) its own bit."""
+        bits: Dict[Tuple[str, int], int] = {}
+        for group in table.group_keys:
+            for index in range(len(table.options[group])):
+                bits[(group, index)] = 1 << len(bits)
+        return bits
+
+    @staticmethod
+    def _decode(
+        table: OptionTable, option_bits: Dict[Tuple[str, int], int], selected: int
+    ) -> List[Course]:
+        courses: List[Course] = []
+        for (group, index), bit in option_bits.items():
+            if selected & bit:
+                option = table.get(group, index)
+                if option is not None:
+                    courses.extend(option.courses)
+        return courses
 
     def _try_add_result(self, current_courses: List[Course], results: List[Schedule]) -> None:
         """Try to add current course selection to results."""
         if current_courses:
-            schedule = Schedule(current_courses.copy())
+            schedule = Schedule(current_courses)
             if self._is_valid_final_schedule(schedule):
                 results.append(schedule)
 
     def _expand_node(
         self,
-        queue: List[Tuple[float, int, int, List[Course], int]],
+        queue: List[QueueEntry],
         counter: itertools.count,
+        table: OptionTable,
+        penalties: _PenaltyModel,
+        option_bits: Dict[Tuple[str, int], int],
         group_index: int,
-        current_courses: List[Course],
-        current_ects: int,
-        search: PreparedSearch,
-        results: List[Schedule],
+        cost: float,
+        selected: int,
+        ects: int,
+        occupied: int,
+        conflicts: int,
     ) -> None:
         """Expand a node by adding its children to the queue."""
-        group_key = search.group_keys[group_index]
-        options = search.group_options.get(group_key, [])
-
-        for option in options:
-            new_courses, new_ects = self._compute_option_values(
-                current_courses, current_ects, option
-            )
+        group_key = table.group_keys[group_index]
+        for index, option in enumerate(table.options[group_key]):
+            child_selected = selected | option_bits[(group_key, index)]
+            if option is None:
+                heapq.heappush(
+                    queue,
+                    (
+                        cost, next(counter), group_index + 1, child_selected,
+                        ects, occupied, conflicts,
+                    ),
+                )
+                continue
 
-            if not self._is_valid_partial_selection(new_courses):
+            new_ects = ects + option.ects
+            new_conflicts = conflicts | (occupied & option.mask) | option.overlap_mask
+            if not self._is_admissible_state(new_conflicts.bit_count(), new_ects, False):
                 self._last_run_stats["branches_pruned"] += 1
                 continue
 
-            schedule = Schedule(new_courses)
-            new_cost = self._compute_cost(schedule)
-
+            new_cost = cost + penalties.edge_cost(option, occupied, conflicts, new_conflicts)
             heapq.heappush(
                 queue,
-                (new_cost, next(counter), group_index + 1, new_courses, new_ects),
+                (
+                    new_cost, next(counter), group_index + 1, child_selected,
+                    new_ects, occupied | option.mask, new_conflicts,
+                ),
             )
 
-    def _compute_option_values(
-        self, current_courses: List[Course], current_ects: int, option: Optional[List[Course]]
-    ) -> Tuple[List[Course], int]:
-        """Compute new courses and ECTS for an option."""
-        if option is None:
-            return current_courses.copy(), current_ects
-        return current_courses + option, current_ects + sum(course.ects for course in option)
-
-    def _compute_cost(self, schedule: Schedule) -> float:
-        """Compute cost of a schedule."""
-        return estimate_conflict_penalty(schedule)
-
 
 __all__ = ["DijkstraScheduler"]
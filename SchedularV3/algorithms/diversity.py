@@ -0,0 +1,119 @@
+"""Diversity-aware top-k selection of schedules.
+
+Plain top-k keeps the k best-scoring schedules, which often differ in a
+single lab section. ``DiverseTopK`` keeps a bounded pool of the best
+candidates offered to it and then picks k of them greedily by max-min
+Hamming distance between option vectors (which section, if any, is taken
+for each course group). Only candidates within ``tolerance`` of the best
+score compete on diversity; the rest only fill up a short selection.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, List, Set, Tuple
+
+if TYPE_CHECKING:
+    from core.models import Schedule
+
+# Runtime imports
+try:
+    from core.models import Schedule
+except ImportError as e:
+    raise ImportError(f"Required module core.models not found: {e}")
+
+
+# Candidates kept per requested result
+DIVERSITY_POOL_FACTOR = 4
+
+OptionVector = Dict[str, FrozenSet[str]]
+
+
+def option_vector(schedule: Schedule) -> OptionVector:
+    """Section codes chosen for each course group of ``schedule``."""
+    chosen: Dict[str, set] = {}
+    for course in schedule.courses:
+        chosen.setdefault(course.main_code, set()).add(course.code)
+    return {group: frozenset(codes) for group, codes in chosen.items()}
+
+
+def hamming_distance(first: OptionVector, second: OptionVector) -> int:
+    """Number of course groups whose choice differs (taking vs. skipping counts)."""
+    return sum(
+        1 for group in first.keys() | second.keys() if first.get(group) != second.get(group)
+    )
+
+
+class DiverseTopK:
+    """Bounded candidate pool with greedy max-min diverse selection."""
+
+    def __init__(
+        self,
+        k: int,
+        score: Callable[[Schedule], float],
+        tolerance: float = 0.1,
+        pool_factor: int = DIVERSITY_POOL_FACTOR,
+    ) -> None:
+        self.k = max(1, k)
+        self.score = score
+        self.tolerance = max(0.0, tolerance)
+        self.pool_size = self.k * max(1, pool_factor)
+        self._pool: List[Tuple[float, int, Schedule, OptionVector]] = []
+        self._vectors: Set[FrozenSet] = set()
+        self._counter = itertools.count()
+        self.min_distance = 0
+
+    def __len__(self) -> int:
+        return len(self._pool)
+
+    def add(self, schedule: Schedule) -> None:
+        """Offer a candidate; O(log pool) unless it duplicates a pooled schedule."""
+        vector = option_vector(schedule)
+        key = frozenset(vector.items())
+        if key in self._vectors:
+            return
+        # Earlier candidates win ties, as in plain top-k
+        entry = (self.score(schedule), -next(self._counter), schedule, vector)
+        if len(self._pool) < self.pool_size:
+            heapq.heappush(self._pool, entry)
+        elif entry[:2] > self._pool[0][:2]:
+            evicted = heapq.heappushpop(self._pool, entry)
+            self._vectors.discard(frozenset(evicted[3].items()))
+        else:
+            return
+        self._vectors.add(key)
+
+    def select(self) -> List[Schedule]:
+        """Best candidate first, then the most distant eligible ones, topped up by score."""
+        ranked = sorted(self._pool, key=lambda entry: entry[:2], reverse=True)
+        if not ranked:
+            return []
+        best = ranked[0][0]
+        floor = best - self.tolerance * max(1.0, abs(best))
+        eligible = [entry for entry in ranked if entry[0] >= floor]
+
+        chosen = [eligible[0]]
+        distance = {id(entry): hamming_distance(entry[3], eligible[0][3]) for entry in eligible[1:]}
+        remaining = eligible[1:]
+        self.min_distance = 0
+        while remaining and len(chosen) < self.k:
+            pick = max(remaining, key=lambda entry: (distance[id(entry)], entry[:2]))
+            self.min_distance = (
+                distance[id(pick)] if len(chosen) == 1
+                else min(self.min_distance, distance[id(pick)])
+            )
+            chosen.append(pick)
+            remaining.remove(pick)
+            for entry in remaining:
+                distance[id(entry)] = min(distance[id(entry)], hamming_distance(entry[3], pick[3]))
+
+        if len(chosen) < self.k:
+            taken = {id(entry) for entry in chosen}
+            chosen.extend(
+                [entry for entry in ranked if id(entry) not in taken][: self.k - len(chosen)]
+            )
+        return [entry[2] for entry in chosen]
+
+
+__all__ = ["DIVERSITY_POOL_FACTOR", "DiverseTopK", "hamming_distance", "option_vector"]
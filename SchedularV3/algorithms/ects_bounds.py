@@ -0,0 +1,67 @@
+"""ECTS knapsack bounds for pruning partial selections.
+
+A partial selection over the first ``position`` groups of a search can only
+be completed if the mandatory groups still to come fit under ``max_ects`` with
+their cheapest options, and if taking the largest option of every remaining
+group still reaches ``min_ects``. ``EctsBounds`` precomputes both suffix sums
+once per search so the check is two additions per node.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set
+
+if TYPE_CHECKING:
+    from core.models import Course
+
+# Runtime imports
+try:
+    from core.models import Course
+except ImportError as e:
+    raise ImportError(f"Required module core.models not found: {e}")
+
+
+class EctsBounds:
+    """Suffix minima/maxima of the ECTS the remaining groups can add."""
+
+    def __init__(
+        self,
+        group_keys: Sequence[str],
+        group_options: Dict[str, List[Optional[List[Course]]]],
+        mandatory_codes: Set[str],
+        min_ects: int,
+        max_ects: int,
+    ) -> None:
+        self.min_ects = min_ects
+        self.max_ects = max_ects
+        # group -> ECTS of its cheapest option (0 for optional groups) / largest option
+        self.cheapest: Dict[str, int] = {}
+        self.largest: Dict[str, int] = {}
+        for group in group_keys:
+            totals = [
+                sum(course.ects for course in option)
+                for option in group_options.get(group, [])
+                if option is not None
+            ]
+            mandatory = group in mandatory_codes
+            self.cheapest[group] = min(totals) if mandatory and totals else 0
+            self.largest[group] = max(totals, default=0)
+
+        # position -> ECTS the groups from ``position`` on must / can at most add
+        count = len(group_keys)
+        self.min_needed = [0] * (count + 1)
+        self.max_reachable = [0] * (count + 1)
+        for position in range(count - 1, -1, -1):
+            group = group_keys[position]
+            self.min_needed[position] = self.min_needed[position + 1] + self.cheapest[group]
+            self.max_reachable[position] = self.max_reachable[position + 1] + self.largest[group]
+
+    def allows(self, position: int, ects: int) -> bool:
+        """Whether ``ects`` taken by the groups before ``position`` can still complete."""
+        return (
+            ects + self.min_needed[position] <= self.max_ects
+            and ects + self.max_reachable[position] >= self.min_ects
+        )
+
+
+__all__ = ["EctsBounds"]
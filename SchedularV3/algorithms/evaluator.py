@@ -20,18 +20,22 @@ try:
         SchedulerPrefs,
         analyze_schedule_efficiency,
         compute_schedule_stats,
-        score_schedule,
     )
 except ImportError as e:
     raise ImportError(f"Required module utils.schedule_metrics not found: {e}")
 
+try:
+    from utils.result_cache import cached_score
+except ImportError as e:
+    raise ImportError(f"Required module utils.result_cache not found: {e}")
+
 
 def evaluate_schedule(schedule: Schedule, prefs: Optional[SchedulerPrefs] = None) -> Dict[str, float]:
     """Return key metrics for a single schedule."""
 
     stats = compute_schedule_stats(schedule)
     efficiency = analyze_schedule_efficiency(schedule)
-    score = score_schedule(schedule, prefs) if prefs else None
+    score = cached_score(schedule, prefs) if prefs else None
 
     return {
         "score": score if score is not None else 0.0,
@@ -0,0 +1,247 @@
+"""Fast infeasibility pre-check for prepared searches.
+
+Skipping an optional group never breaks a hard constraint, so a request is
+feasible exactly when its mandatory groups can be assigned together. Before
+an algorithm runs, ``check_feasibility`` looks for cheap proofs that they
+cannot:
+
+- the largest options of all selected groups missing the ECTS minimum;
+- a mandatory group without any option that fits the ECTS limit, avoids the
+  strict free days and has no internal clash;
+- the cheapest admissible options of all mandatory groups exceeding the ECTS
+  limit;
+- two mandatory groups none of whose option pairs fit together;
+- failing those, a budgeted exact search over the mandatory groups alone.
+
+When one fires, the offending groups are shrunk (deletion-based) to a minimal
+unsatisfiable subset so the user learns exactly which courses clash.
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .base_scheduler import BaseScheduler, PreparedSearch
+
+from .incremental import ALL_DAYS, OptionTable
+
+
+# Nodes the exact satisfiability search may expand per call
+FEASIBILITY_NODE_BUDGET = 20_000
+
+# (slot mask, internal clash mask, ECTS) of an admissible option
+Domain = List[Tuple[int, int, int]]
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+@dataclass
+class InfeasibilityReport:
+    """Proof that a prepared search has no valid schedule."""
+
+    # Minimal set of mandatory groups that cannot be scheduled together
+    core: List[str]
+    reasons: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+class _Checker:
+    """Hard constraints of a scheduler evaluated on option bitsets."""
+
+    def __init__(self, scheduler: BaseScheduler, table: OptionTable) -> None:
+        self.max_ects = scheduler.max_ects
+        self.max_conflicts = scheduler.max_conflicts if scheduler.allow_conflicts else 0
+        self.free_days: List[str] = []
+        self.forbidden = 0
+        prefs = scheduler.scheduler_prefs
+        if prefs and prefs.strict_free_days and prefs.desired_free_days:
+            self.free_days = list(prefs.desired_free_days)
+            for (day, _), bit in table.slot_bits.items():
+                if day in self.free_days:
+                    self.forbidden |= 1 << bit
+
+    def fits(self, clashes: int, ects: int) -> bool:
+        return ects <= self.max_ects and clashes.bit_count() <= self.max_conflicts
+
+    def why_inadmissible(self, mask: int, clashes: int, ects: int) -> Optional[str]:
+        if ects > self.max_ects:
+            return f"needs more than the {self.max_ects} ECTS limit"
+        if mask & self.forbidden:
+            return "meets on a strict free day (" + ", ".join(self.free_days) + ")"
+        if clashes.bit_count() > self.max_conflicts:
+            return "clashes with itself (lecture and lab/PS overlap)"
+        return None
+
+
+def check_feasibility(
+    scheduler: BaseScheduler,
+    search: PreparedSearch,
+    node_budget: int = FEASIBILITY_NODE_BUDGET,
+) -> Optional[InfeasibilityReport]:
+    """
+    Prove ``search`` infeasible under ``scheduler``'s hard constraints.
+
+    Returns:
+        A report with a minimal unsatisfiable core of mandatory groups, or
+        None if no proof was found (the search may still turn out empty)
+    """
+    start = time.perf_counter()
+    report = _find_core(scheduler, search, node_budget)
+    if report is not None:
+        report.seconds = time.perf_counter() - start
+    return report
+
+
+def _find_core(
+    scheduler: BaseScheduler, search: PreparedSearch, node_budget: int
+) -> Optional[InfeasibilityReport]:
+    table = OptionTable(search).restricted(search.mandatory_keys)
+    checker = _Checker(scheduler, table)
+
+    unknown_days = [day for day in checker.free_days if day not in ALL_DAYS]
+    if unknown_days:
+        return InfeasibilityReport(
+            core=[],
+            reasons=["Strict free day(s) not in the week: " + ", ".join(unknown_days)],
+        )
+
+    bounds = search.ects_bounds
+    if bounds is not None and bounds.max_reachable[0] < scheduler.min_ects:
+        return InfeasibilityReport(
+            core=[],
+            reasons=[
+                f"The selected courses add up to at most {bounds.max_reachable[0]} ECTS, "
+                f"below the {scheduler.min_ects} ECTS minimum"
+            ],
+        )
+
+    # Per-group admissibility
+    domains: Dict[str, Domain] = {}
+    reasons: List[str] = []
+    for group in table.group_keys:
+        admissible = set()
+        causes = set()
+        for option in table.options[group]:
+            if option is None:
+                continue
+            cause = checker.why_inadmissible(option.mask, option.overlap_mask, option.ects)
+            if cause is None:
+                admissible.add((option.mask, option.overlap_mask, option.ects))
+            else:
+                causes.add(cause)
+        if not admissible:
+            cause = (
+                causes.pop() if len(causes) == 1
+                else "violates the ECTS, free-day or conflict limits"
+            )
+            reasons.append(f"{group}: every section combination {cause}")
+        domains[group] = sorted(admissible, key=lambda entry: entry[2])
+    if reasons:
+        first = next(group for group in table.group_keys if not domains[group])
+        return InfeasibilityReport(core=[first], reasons=reasons)
+
+    # ECTS lower bound from the cheapest admissible options
+    cheapest = {group: domain[0][2] for group, domain in domains.items()}
+    if sum(cheapest.values()) > checker.max_ects:
+        heaviest: List[str] = []
+        total = 0
+        for group in sorted(cheapest, key=lambda group: -cheapest[group]):
+            heaviest.append(group)
+            total += cheapest[group]
+            if total > checker.max_ects:
+                break
+        core = _shrink(heaviest, domains, checker, node_budget)
+        return InfeasibilityReport(core=core, reasons=[_joint_reason(core, cheapest, checker)])
+
+    # Pairwise incompatibility
+    pairs = [
+        (first, second)
+        for first, second in itertools.combinations(table.group_keys, 2)
+        if _satisfiable([domains[first], domains[second]], checker, node_budget) is False
+    ]
+    if pairs:
+        return InfeasibilityReport(
+            core=list(pairs[0]),
+            reasons=[
+                f"{first} and {second}: no combination of their sections fits together "
+                "(time clash or ECTS limit)"
+                for first, second in pairs
+            ],
+        )
+
+    # Budgeted exact check over all mandatory groups
+    groups = list(table.group_keys)
+    if _satisfiable([domains[group] for group in groups], checker, node_budget) is not False:
+        return None
+    core = _shrink(groups, domains, checker, node_budget)
+    return InfeasibilityReport(core=core, reasons=[_joint_reason(core, cheapest, checker)])
+
+
+def _joint_reason(core: List[str], cheapest: Dict[str, int], checker: _Checker) -> str:
+    minimum = sum(cheapest[group] for group in core)
+    if minimum > checker.max_ects:
+        return (
+            f"Mandatory courses {', '.join(core)} need at least {minimum} ECTS, "
+            f"above the {checker.max_ects} ECTS limit"
+        )
+    return (
+        f"Mandatory courses {', '.join(core)} cannot all be scheduled together "
+        "without time clashes within the ECTS limit"
+    )
+
+
+def _shrink(
+    groups: Sequence[str], domains: Dict[str, Domain], checker: _Checker, node_budget: int
+) -> List[str]:
+    """Drop groups whose removal keeps the set unsatisfiable (deletion filter)."""
+    core = list(groups)
+    for group in list(core):
+        if len(core) == 1:
+            break
+        rest = [other for other in core if other != group]
+        if _satisfiable([domains[other] for other in rest], checker, node_budget) is False:
+            core = rest
+    return core
+
+
+def _satisfiable(domains: List[Domain], checker: _Checker, node_budget: int) -> Optional[bool]:
+    """Whether one option per domain fits together; None if the budget ran out."""
+    ordered = sorted(domains, key=len)
+    # Cheapest ECTS still needed by the remaining domains
+    suffix = [0] * (len(ordered) + 1)
+    for position in range(len(ordered) - 1, -1, -1):
+        suffix[position] = suffix[position + 1] + ordered[position][0][2]
+    nodes = 0
+
+    def extend(position: int, occupied: int, clashes: int, ects: int) -> bool:
+        nonlocal nodes
+        if position == len(ordered):
+            return True
+        nodes += 1
+        if nodes > node_budget:
+            raise _BudgetExceeded
+        for mask, own, option_ects in ordered[position]:
+            total = ects + option_ects
+            if total + suffix[position + 1] > checker.max_ects:
+                # Domains are sorted by ECTS
+                break
+            merged = clashes | own | (occupied & mask)
+            if checker.fits(merged, total) and extend(
+                position + 1, occupied | mask, merged, total
+            ):
+                return True
+        return False
+
+    try:
+        return extend(0, 0, 0, 0)
+    except _BudgetExceeded:
+        return None
+
+
+__all__ = ["FEASIBILITY_NODE_BUDGET", "InfeasibilityReport", "check_feasibility"]
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import random
+import time
 from typing import TYPE_CHECKING, Dict, List, Optional
 
 if TYPE_CHECKING:
@@ -23,10 +23,14 @@ except ImportError as e:
 from . import register_scheduler
 from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
 from .heuristics import estimate_conflict_penalty
+from .solution_space import SolutionSpace, StateBudgetExceeded
 
 
 Individual = Dict[str, Optional[List[Course]]]
 
+# Memo states allowed for seeding the population with uniform feasible samples
+SEEDING_STATE_BUDGET = 200_000
+
 
 @register_scheduler
 class GeneticAlgorithmScheduler(BaseScheduler):
@@ -55,13 +59,17 @@ class GeneticAlgorithmScheduler(BaseScheduler):
         crossover_rate: float = 0.7,
         mutation_rate: float = 0.2,
         adaptive_mutation: bool = True,
+        seed: Optional[int] = None,
+        min_ects: int = 0,
     ) -> None:
         super().__init__(
             max_results=max_results,
             max_ects=max_ects,
+            min_ects=min_ects,
             allow_conflicts=allow_conflicts,
             scheduler_prefs=scheduler_prefs,
             timeout_seconds=timeout_seconds,
+            seed=seed,
         )
         self.population_size = max(6, population_size)
         self.generations = max(5, generations)
@@ -75,10 +83,13 @@ class GeneticAlgorithmScheduler(BaseScheduler):
             key: search.group_options.get(key, []) for key in search.group_keys
         }
 
-        population = [self._create_individual(search, options_map) for _ in range(self.population_size)]
+        # Adaptive mutation must not carry over from a previous run
+        self.mutation_rate = self.initial_mutation_rate
+        population = self._initial_population(search, options_map)
         best_schedule: Optional[Schedule] = None
         best_cost = float("inf")
 
+        start = time.time()
         for _ in range(self.generations):
             evaluated = [(individual, self._fitness(individual, search)) for individual in population]
             evaluated.sort(key=lambda item: item[1])
@@ -91,6 +102,9 @@ class GeneticAlgorithmScheduler(BaseScheduler):
 
             next_population = self._evolve_population(evaluated, options_map)
             population = next_population[: self.population_size]
+            if time.time() - start >= self.timeout_seconds:
+                self._last_run_stats["timeout_reached"] = True
+                break
 
         return [best_schedule] if best_schedule else []
 
@@ -147,7 +161,7 @@ class GeneticAlgorithmScheduler(BaseScheduler):
             parent_a = self._tournament_selection(evaluated)
             parent_b = self._tournament_selection(evaluated)
 
-            if random.random() < self.crossover_rate:
+            if self._rng.random() < self.crossover_rate:
                 child_a, child_b = self._crossover(parent_a, parent_b)
             else:
                 child_a, child_b = parent_a.copy(), parent_b.copy()
@@ -162,6 +176,37 @@ class GeneticAlgorithmScheduler(BaseScheduler):
     # ------------------------------------------------------------------
     # Genetic primitives
     # ------------------------------------------------------------------
+    def _initial_population(
+        self,
+        search: PreparedSearch,
+        options_map: Dict[str, List[Optional[List[Course]]]],
+    ) -> List[Individual]:
+        """Uniformly sampled valid schedules, or randomized greedy ones for huge spaces."""
+        try:
+            space = SolutionSpace.from_search(self, search, max_states=SEEDING_STATE_BUDGET)
+            samples = space.sample_many(self.population_size, self._rng)
+        except StateBudgetExceeded:
+            samples = []
+
+        self._last_run_stats["seeded_population"] = bool(samples)
+        # Warm-start incumbents go first so they survive into the first generation
+        warm = [self._individual_from(schedule, search) for schedule in search.warm_start]
+        if not samples:
+            return (warm + [
+                self._create_individual(search, options_map) for _ in range(self.population_size)
+            ])[: self.population_size]
+        return (warm + [
+            {group: options_map[group][index] for group, index in assignment.items()}
+            for assignment in samples
+        ])[: self.population_size]
+
+    @staticmethod
+    def _individual_from(schedule: Schedule, search: PreparedSearch) -> Individual:
+        chosen: Dict[str, List[Course]] = {}
+        for course in schedule.courses:
+            chosen.setdefault(course.main_code, []).append(course)
+        return {group: chosen.get(group) for group in search.group_keys}
+
     def _create_individual(
         self,
         search: PreparedSearch,
@@ -178,7 +223,7 @@ class GeneticAlgorithmScheduler(BaseScheduler):
                 continue
 
             attempt_options = options.copy()
-            random.shuffle(attempt_options)
+            self._rng.shuffle(attempt_options)
 
             chosen: Optional[List[Course]] = None
             for option in attempt_options:
@@ -228,7 +273,7 @@ class GeneticAlgorithmScheduler(BaseScheduler):
         return estimate_conflict_penalty(schedule)
 
     def _tournament_selection(self, evaluated: List[tuple]) -> Individual:
-        contenders = random.sample(evaluated, k=2)
+        contenders = self._rng.sample(evaluated, k=2)
         winner = min(contenders, key=lambda item: item[1])
         return winner[0].copy()
 
@@ -237,7 +282,7 @@ class GeneticAlgorithmScheduler(BaseScheduler):
         child_b: Individual = {}
 
         for key in parent_a.keys():
-            if random.random() < 0.5:
+            if self._rng.random() < 0.5:
                 child_a[key] = parent_a.get(key)
                 child_b[key] = parent_b.get(key)
             else:
@@ -247,15 +292,15 @@ class GeneticAlgorithmScheduler(BaseScheduler):
         return child_a, child_b
 
     def _mutate(self, individual: Individual, options_map: Dict[str, List[Optional[List[Course]]]]) -> None:
-        if random.random() >= self.mutation_rate:
+        if self._rng.random() >= self.mutation_rate:
             return
 
-        group_key = random.choice(list(individual.keys()))
+        group_key = self._rng.choice(list(individual.keys()))
         options = options_map.get(group_key, [])
         if not options:
             return
 
-        individual[group_key] = random.choice(options)
+        individual[group_key] = self._rng.choice(options)
 
 
 __all__ = ["GeneticAlgorithmScheduler"]
@@ -45,10 +45,12 @@ class GreedyScheduler(BaseScheduler):
         max_conflicts: int = 1,
         scheduler_prefs: Optional[SchedulerPrefs] = None,
         timeout_seconds: int = 60,
+        min_ects: int = 0,
     ) -> None:
         super().__init__(
             max_results=max_results,
             max_ects=max_ects,
+            min_ects=min_ects,
             allow_conflicts=allow_conflicts,
             max_conflicts=max_conflicts,
             scheduler_prefs=scheduler_prefs,
@@ -1,14 +1,84 @@
-"""Hill climbing local search scheduler."""
+"""Hill climbing local search scheduler.
+
+With ``restarts=1`` (the default) the scheduler climbs from a single greedy
+schedule using best-improvement scans. With ``restarts > 1`` it switches to a
+multi-start mode: every restart builds a randomized greedy schedule and climbs
+with first-improvement moves taken in random order, scored incrementally via
+``IncrementalScorer``. Restarts run concurrently in a process pool and share a
+global incumbent (cost and option vector) through shared memory; every other
+restart starts from a perturbation of that incumbent instead of from scratch.
+Identical local optima reached by different restarts are reported once.
+"""
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+import logging
+import math
+import multiprocessing
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 from core.models import Course, Schedule
 from utils.schedule_metrics import SchedulerPrefs, score_schedule
 from . import register_scheduler
 from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
 from .heuristics import estimate_conflict_penalty
+from .incremental import Assignment, IncrementalScorer, OptionTable
+
+logger = logging.getLogger(__name__)
+
+# Share of groups re-drawn when a restart perturbs the global incumbent.
+PERTURBATION_FRACTION = 0.25
+
+OptionVector = Tuple[int, ...]
+# (option vector or None, cost, moves evaluated, moves pruned)
+RestartResult = Tuple[Optional[OptionVector], float, int, int]
+
+
+class SharedIncumbent:
+    """Best cost and option vector visible to every restart of a run."""
+
+    def __init__(self, size: int) -> None:
+        self.cost = multiprocessing.Value("d", math.inf)
+        self.vector = multiprocessing.Array("i", max(1, size), lock=False)
+
+    def snapshot(self) -> Optional[OptionVector]:
+        with self.cost.get_lock():
+            if math.isinf(self.cost.value):
+                return None
+            return tuple(self.vector)
+
+    def offer(self, vector: OptionVector, cost: float) -> bool:
+        """Replace the incumbent if ``cost`` improves on it."""
+        with self.cost.get_lock():
+            if cost >= self.cost.value:
+                return False
+            self.cost.value = cost
+            self.vector[: len(vector)] = list(vector)
+            return True
+
+
+# Per-process search context installed by the pool initializer so that the
+# option table is pickled once per worker instead of once per restart.
+_WORKER_CONTEXT: Dict[str, Any] = {}
+
+
+def _init_worker(
+    scheduler: "HillClimbingScheduler", table: OptionTable, incumbent: SharedIncumbent
+) -> None:
+    _WORKER_CONTEXT["scheduler"] = scheduler
+    _WORKER_CONTEXT["table"] = table
+    _WORKER_CONTEXT["incumbent"] = incumbent
+
+
+def _worker_restart(restart: int, seed: int, deadline: float) -> RestartResult:
+    """Pool entry point; runs one restart using the installed worker context."""
+    return _WORKER_CONTEXT["scheduler"]._climb_restart(
+        _WORKER_CONTEXT["table"], _WORKER_CONTEXT["incumbent"], restart, seed, deadline
+    )
 
 
 @register_scheduler
@@ -33,17 +103,30 @@ class HillClimbingScheduler(BaseScheduler):
         scheduler_prefs: Optional[SchedulerPrefs] = None,
         timeout_seconds: int = 120,
         max_iterations: int = 30,
+        restarts: int = 1,
+        max_workers: Optional[int] = None,
+        use_multiprocessing: bool = True,
+        seed: Optional[int] = None,
+        min_ects: int = 0,
     ) -> None:
         super().__init__(
             max_results=max_results,
             max_ects=max_ects,
+            min_ects=min_ects,
             allow_conflicts=allow_conflicts,
             scheduler_prefs=scheduler_prefs,
             timeout_seconds=timeout_seconds,
+            seed=seed,
         )
         self.max_iterations = max_iterations
+        self.restarts = max(1, restarts)
+        self.max_workers = max_workers or min(self.restarts, os.cpu_count() or 1)
+        self.use_multiprocessing = use_multiprocessing
 
     def _run_algorithm(self, search: PreparedSearch) -> List[Schedule]:
+        if self.restarts > 1:
+            return self._run_multi_start(search)
+
         current_courses = self._build_initial_solution(search)
         if not current_courses:
             return []
@@ -143,6 +226,238 @@ class HillClimbingScheduler(BaseScheduler):
 
         return None
 
+    # ------------------------------------------------------------------
+    # Multi-start mode
+    # ------------------------------------------------------------------
+    def _run_multi_start(self, search: PreparedSearch) -> List[Schedule]:
+        table = OptionTable(search)
+        incumbent = SharedIncumbent(len(table.group_keys))
+        deadline = time.time() + self.timeout_seconds
+        seeds = self._spawn_seeds(self.restarts)
+
+        optima: Dict[OptionVector, float] = {}
+        stats = self._last_run_stats
+        stats.update({"restarts": 0, "local_optima": 0, "duplicate_optima": 0})
+
+        for vector, cost, explored, pruned in self._run_restarts(table, incumbent, seeds, deadline):
+            stats["restarts"] += 1
+            stats["nodes_explored"] += explored
+            stats["branches_pruned"] += pruned
+            if vector is None:
+                continue
+            if vector in optima:
+                stats["duplicate_optima"] += 1
+                continue
+            optima[vector] = cost
+
+        stats["local_optima"] = len(optima)
+        if not optima:
+            return []
+        stats["best_cost"] = min(optima.values())
+
+        results: List[Schedule] = []
+        for vector in sorted(optima, key=optima.__getitem__):
+            schedule = table.to_schedule(dict(zip(table.group_keys, vector)))
+            if self._is_valid_final_schedule(schedule):
+                results.append(schedule)
+            if len(results) >= self.max_results:
+                break
+        return results
+
+    def _run_restarts(
+        self,
+        table: OptionTable,
+        incumbent: SharedIncumbent,
+        seeds: List[int],
+        deadline: float,
+    ) -> List[RestartResult]:
+        executor = self._create_executor(table, incumbent)
+        if executor is None:
+            results = []
+            for restart, seed in enumerate(seeds):
+                if time.time() >= deadline:
+                    self._last_run_stats["timeout_reached"] = True
+                    break
+                results.append(self._climb_restart(table, incumbent, restart, seed, deadline))
+            return results
+
+        results = []
+        try:
+            pending = {
+                executor.submit(_worker_restart, restart, seed, deadline)
+                for restart, seed in enumerate(seeds)
+            }
+            while pending:
+                done, pending = wait(
+                    pending, timeout=max(0.0, deadline - time.time()), return_when=FIRST_COMPLETED
+                )
+                if not done:
+                    self._last_run_stats["timeout_reached"] = True
+                    for future in pending:
+                        future.cancel()
+                    break
+                results.extend(future.result() for future in done)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return results
+
+    def _create_executor(
+        self, table: OptionTable, incumbent: SharedIncumbent
+    ) -> Optional[Executor]:
+        if not self.use_multiprocessing or self.max_workers <= 1:
+            return None
+        try:
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self, table, incumbent),
+            )
+        except (OSError, ValueError) as exc:  # pragma: no cover - platform dependent
+            logger.warning("Falling back to serial hill climbing restarts: %s", exc)
+            return None
+
+    def _climb_restart(
+        self,
+        table: OptionTable,
+        incumbent: SharedIncumbent,
+        restart: int,
+        seed: int,
+        deadline: float,
+    ) -> RestartResult:
+        """
+        Run one restart: build a start state, then first-improvement climb.
+
+        Even restarts build a randomized greedy schedule; odd restarts perturb
+        the global incumbent (falling back to a fresh build if none exists yet).
+
+        Returns:
+            Tuple of (option vector of the local optimum or None, its cost,
+            moves evaluated, moves pruned)
+        """
+        rng = random.Random(seed)
+        assignment: Optional[Assignment] = None
+        if restart % 2 == 1:
+            assignment = self._perturb_incumbent(table, incumbent, rng)
+        if assignment is None:
+            assignment = self._randomized_greedy(table, {}, table.group_keys, rng)
+        if assignment is None:
+            return None, math.inf, 0, 0
+
+        scorer = IncrementalScorer(self.scheduler_prefs)
+        for group, index in assignment.items():
+            scorer.add(table.get(group, index))
+
+        explored = pruned = 0
+        cost = scorer.cost()
+        for _ in range(self.max_iterations):
+            if time.time() >= deadline:
+                break
+            move, moves_explored, moves_pruned = self._first_improvement(
+                table, assignment, scorer, cost, rng
+            )
+            explored += moves_explored
+            pruned += moves_pruned
+            if move is None:
+                break
+            group, index, cost = move
+            scorer.swap(table.get(group, assignment[group]), table.get(group, index))
+            assignment[group] = index
+
+        vector = tuple(assignment[group] for group in table.group_keys)
+        incumbent.offer(vector, cost)
+        return vector, cost, explored, pruned
+
+    def _randomized_greedy(
+        self,
+        table: OptionTable,
+        fixed: Assignment,
+        groups: List[str],
+        rng: random.Random,
+    ) -> Optional[Assignment]:
+        """
+        Complete ``fixed`` by giving each of ``groups`` a random admissible option.
+
+        Returns None when a mandatory group cannot be placed.
+        """
+        assignment = dict(fixed)
+        scorer = IncrementalScorer(self.scheduler_prefs)
+        for group, index in assignment.items():
+            scorer.add(table.get(group, index))
+
+        for group in groups:
+            options = [option for option in table.options[group] if option is not None]
+            rng.shuffle(options)
+            for option in options:
+                scorer.add(option)
+                if self._is_admissible_state(
+                    scorer.conflicts, scorer.total_ects, scorer.violates_strict_free_days()
+                ):
+                    assignment[group] = option.index
+                    break
+                scorer.remove(option)
+            else:
+                if None not in table.options[group]:
+                    return None
+                assignment[group] = table.options[group].index(None)
+        return assignment
+
+    def _perturb_incumbent(
+        self, table: OptionTable, incumbent: SharedIncumbent, rng: random.Random
+    ) -> Optional[Assignment]:
+        """Re-draw a random subset of the incumbent's groups (iterated local search kick)."""
+        vector = incumbent.snapshot()
+        if vector is None:
+            return None
+        keys = table.group_keys
+        kicked = set(rng.sample(keys, max(1, int(len(keys) * PERTURBATION_FRACTION))))
+        fixed = {group: index for group, index in zip(keys, vector) if group not in kicked}
+        return self._randomized_greedy(
+            table, fixed, [group for group in keys if group in kicked], rng
+        )
+
+    def _first_improvement(
+        self,
+        table: OptionTable,
+        assignment: Assignment,
+        scorer: IncrementalScorer,
+        current_cost: float,
+        rng: random.Random,
+    ) -> Tuple[Optional[Tuple[str, int, float]], int, int]:
+        """Return the first improving move found in random order, plus move counts."""
+        masks = {}
+        occupied = 0
+        for group, index in assignment.items():
+            option = table.get(group, index)
+            masks[group] = option.mask if option is not None else 0
+            occupied |= masks[group]
+
+        moves = [
+            (group, option)
+            for group in table.group_keys
+            for option in table.options[group]
+            if option is not None and option.index != assignment[group]
+        ]
+        rng.shuffle(moves)
+
+        explored = pruned = 0
+        for group, option in moves:
+            # Without conflicts the group masks are disjoint, so XOR removes
+            # exactly the current group's slots from the occupancy mask.
+            if not self.allow_conflicts and option.mask & (occupied ^ masks[group]):
+                pruned += 1
+                continue
+
+            current = table.get(group, assignment[group])
+            cost, conflicts, ects, free_day_violation = scorer.evaluate_swap(current, option)
+            explored += 1
+            if not self._is_admissible_state(conflicts, ects, free_day_violation, complete=True):
+                pruned += 1
+                continue
+            if cost < current_cost:
+                return (group, option.index, cost), explored, pruned
+
+        return None, explored, pruned
+
     def _cost(self, schedule: Schedule) -> float:
         if self.scheduler_prefs:
             return -score_schedule(schedule, self.scheduler_prefs)
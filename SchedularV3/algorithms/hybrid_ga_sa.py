@@ -1,16 +1,27 @@
-"""Hybrid genetic algorithm + simulated annealing scheduler."""
+"""Hybrid genetic algorithm + simulated annealing scheduler.
+
+The GA explores globally; its distinct elites are then refined with simulated
+annealing. Refinements are independent, so they are fanned out over a process
+pool, each task getting an equal share of the time left after the GA stage.
+"""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, List, Optional, cast
+from concurrent.futures import Executor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+import logging
+import math
+import os
+import random
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, cast
 
 if TYPE_CHECKING:
-    from core.models import Schedule
+    from core.models import Course, Schedule
     from utils.schedule_metrics import SchedulerPrefs
 
 # Runtime imports
 try:
-    from core.models import Schedule
+    from core.models import Course, Schedule
 except ImportError as e:
     raise ImportError(f"Required module core.models not found: {e}")
 
@@ -24,6 +35,50 @@ from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
 from .genetic_algorithm import GeneticAlgorithmScheduler
 from .simulated_annealing import AnnealingOptimizer
 
+logger = logging.getLogger(__name__)
+
+GroupOptions = Dict[str, List[Optional[List[Course]]]]
+
+# Share of ``timeout_seconds`` reserved for refining the GA elites
+REFINE_BUDGET_SHARE = 0.25
+
+# Per-process search context installed by the pool initializer so that the
+# course catalogue is pickled once per worker instead of once per refinement.
+_WORKER_CONTEXT: Dict[str, object] = {}
+
+
+def _init_worker(
+    optimizer: AnnealingOptimizer, group_keys: List[str], group_options: GroupOptions
+) -> None:
+    _WORKER_CONTEXT["optimizer"] = optimizer
+    _WORKER_CONTEXT["group_keys"] = group_keys
+    _WORKER_CONTEXT["group_options"] = group_options
+
+
+def _worker_refine(schedule: Schedule, seed: int, time_budget: float) -> Schedule:
+    """Pool entry point; refines one elite using the installed worker context."""
+    return refine_schedule(
+        _WORKER_CONTEXT["optimizer"],  # type: ignore[arg-type]
+        _WORKER_CONTEXT["group_keys"],  # type: ignore[arg-type]
+        _WORKER_CONTEXT["group_options"],  # type: ignore[arg-type]
+        schedule,
+        seed,
+        time_budget,
+    )
+
+
+def refine_schedule(
+    optimizer: AnnealingOptimizer,
+    group_keys: List[str],
+    group_options: GroupOptions,
+    schedule: Schedule,
+    seed: int,
+    time_budget: float,
+) -> Schedule:
+    """Anneal a single GA elite within ``time_budget`` seconds."""
+    optimizer.rng = random.Random(seed)
+    return optimizer.optimize(schedule, group_keys, group_options, time_budget=time_budget)
+
 
 @register_scheduler
 class HybridGASAScheduler(BaseScheduler):
@@ -51,49 +106,150 @@ class HybridGASAScheduler(BaseScheduler):
         population_size: int = 30,
         generations: int = 50,
         annealing_iterations: int = 20,
+        max_workers: Optional[int] = None,
+        use_multiprocessing: bool = True,
+        seed: Optional[int] = None,
+        min_ects: int = 0,
     ) -> None:
         super().__init__(
             max_results=max_results,
             max_ects=max_ects,
+            min_ects=min_ects,
             allow_conflicts=allow_conflicts,
             max_conflicts=max_conflicts,
             scheduler_prefs=scheduler_prefs,
             timeout_seconds=timeout_seconds,
+            seed=seed,
         )
         self.population_size = population_size
         self.generations = generations
         self.annealing_iterations = annealing_iterations
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_multiprocessing = use_multiprocessing
+        self.refine_share = REFINE_BUDGET_SHARE
 
     def _run_algorithm(self, search: PreparedSearch) -> List[Schedule]:
+        start = time.time()
         ga_ctor = cast(Any, GeneticAlgorithmScheduler)
         ga = ga_ctor(
             max_results=self.max_results,
             max_ects=self.max_ects,
+            min_ects=self.min_ects,
             allow_conflicts=self.allow_conflicts,
             scheduler_prefs=self.scheduler_prefs,
-            timeout_seconds=self.timeout_seconds,
+            # The GA must leave time for the refinement stage
+            timeout_seconds=self.timeout_seconds * (1.0 - self.refine_share),
             population_size=self.population_size,
             generations=self.generations,
+            seed=self._spawn_seeds(1)[0],
         )
         ga._active_mandatory_codes = self._active_mandatory_codes
         ga_results = ga._run_algorithm(search)
+        if ga.last_run_stats.get("timeout_reached"):
+            self._last_run_stats["ga_timeout_reached"] = True
 
         if not ga_results:
             return []
 
+        candidates = ga_results[: self.max_results * 2]
+        elites = self._distinct_elites(candidates)
+        self._last_run_stats["duplicate_elites"] = len(candidates) - len(elites)
+
         optimizer = AnnealingOptimizer(
             max_ects=self.max_ects,
             scheduler_prefs=self.scheduler_prefs,
             iterations=self.annealing_iterations,
         )
+        remaining = max(0.0, self.timeout_seconds - (time.time() - start))
+        refined = self._refine_elites(optimizer, elites, search, remaining)
 
         optimized_results: List[Schedule] = []
-        for schedule in ga_results[: self.max_results * 2]:
-            refined = optimizer.optimize(schedule, search.group_keys, search.group_options)
-            if self._is_valid_final_schedule(refined):
-                optimized_results.append(refined)
+        for schedule in self._distinct_elites(refined):
+            if self._is_valid_final_schedule(schedule):
+                optimized_results.append(schedule)
 
         return optimized_results[: self.max_results]
 
+    @staticmethod
+    def _distinct_elites(schedules: List[Schedule]) -> List[Schedule]:
+        """Drop schedules selecting the same course sections as an earlier one."""
+        seen: Set[frozenset] = set()
+        distinct: List[Schedule] = []
+        for schedule in schedules:
+            signature = frozenset(course.code for course in schedule.courses)
+            if signature not in seen:
+                seen.add(signature)
+                distinct.append(schedule)
+        return distinct
+
+    def _refine_elites(
+        self,
+        optimizer: AnnealingOptimizer,
+        elites: List[Schedule],
+        search: PreparedSearch,
+        remaining: float,
+    ) -> List[Schedule]:
+        """
+        Anneal every elite, in parallel when a process pool is available.
+
+        Each task gets ``remaining / waves`` seconds, where a wave is one round
+        of ``workers`` concurrent tasks. An elite whose refinement does not come
+        back in time is kept unrefined.
+        """
+        # One independent stream per elite, whichever worker refines it
+        seeds = self._spawn_seeds(len(elites))
+        executor = self._create_executor(optimizer, search, len(elites))
+        workers = self._worker_count(executor, len(elites))
+        budget = remaining / max(1, math.ceil(len(elites) / workers))
+        self._last_run_stats["refinement_budget"] = budget
+        self._last_run_stats["refinement_workers"] = workers
+
+        if executor is None:
+            return [
+                refine_schedule(
+                    optimizer, search.group_keys, search.group_options, elite, seed, budget
+                )
+                for elite, seed in zip(elites, seeds)
+            ]
+
+        deadline = time.time() + remaining
+        refined: List[Schedule] = []
+        try:
+            futures = [
+                executor.submit(_worker_refine, elite, seed, budget)
+                for elite, seed in zip(elites, seeds)
+            ]
+            for elite, future in zip(elites, futures):
+                try:
+                    # Small grace period for pickling the result back
+                    refined.append(future.result(timeout=max(0.0, deadline - time.time()) + 1.0))
+                except FutureTimeoutError:
+                    self._last_run_stats["timeout_reached"] = True
+                    future.cancel()
+                    refined.append(elite)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return refined
+
+    def _create_executor(
+        self, optimizer: AnnealingOptimizer, search: PreparedSearch, tasks: int
+    ) -> Optional[Executor]:
+        if not self.use_multiprocessing or min(self.max_workers, tasks) <= 1:
+            return None
+        try:
+            return ProcessPoolExecutor(
+                max_workers=min(self.max_workers, tasks),
+                initializer=_init_worker,
+                initargs=(optimizer, search.group_keys, search.group_options),
+            )
+        except (OSError, ValueError) as exc:  # pragma: no cover - platform dependent
+            logger.warning("Falling back to serial refinement: %s", exc)
+            return None
+
+    def _worker_count(self, executor: Optional[Executor], tasks: int) -> int:
+        if executor is None:
+            return 1
+        return max(1, min(self.max_workers, tasks))
+
 
 __all__ = ["HybridGASAScheduler"]
@@ -1,17 +1,35 @@
-"""Iterative deepening depth-first search scheduler."""
+"""Iterative deepening depth-first search scheduler.
+
+Each iteration runs a depth-limited DFS over compact states (group index,
+ECTS, occupied and conflict slot masks). A bounded transposition table keyed
+by ``(depth, occupied, conflicts, ECTS)`` carries knowledge between
+iterations:
+
+- subtrees with no surviving node at the depth limit are recorded as proven
+  infeasible and never re-entered;
+- every other state keeps its ``CompletionBound`` lower bound and the option
+  that led to its best child, which is tried first on the next iteration.
+
+The final (full-depth) iteration is a branch-and-bound search for the
+``max_results`` best schedules, pruning states whose bound cannot beat the
+current k-th best cost.
+"""
 
 from __future__ import annotations
 
+import heapq
+import itertools
+import math
 import time
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
-    from core.models import Course, Schedule
+    from core.models import Schedule
     from utils.schedule_metrics import SchedulerPrefs
 
 # Runtime imports
 try:
-    from core.models import Course, Schedule
+    from core.models import Schedule
 except ImportError as e:
     raise ImportError(f"Required module core.models not found: {e}")
 
@@ -21,7 +39,37 @@ except ImportError as e:
     raise ImportError(f"Required module utils.schedule_metrics not found: {e}")
 
 from . import register_scheduler
+from .a_star_scheduler import CompletionBound
 from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
+from .ects_bounds import EctsBounds
+from .incremental import IncrementalScorer, OptionTable
+
+
+# (depth, occupied mask, conflict mask, ects)
+TableKey = Tuple[int, int, int, int]
+# [lower bound (inf = proven infeasible), option index of the best child or None]
+TableEntry = List
+
+
+class _SearchContext:
+    """Mutable state shared by one IDDFS run."""
+
+    def __init__(
+        self,
+        table: OptionTable,
+        bound: CompletionBound,
+        prefs: SchedulerPrefs,
+        ects_bounds: Optional[EctsBounds],
+    ) -> None:
+        self.table = table
+        self.bound = bound
+        self.ects_bounds = ects_bounds
+        self.scorer = IncrementalScorer(prefs)
+        self.path: List[int] = []
+        # Max-heap (negated costs) of the best complete assignments found
+        self.best: List[Tuple[float, int, Tuple[int, ...]]] = []
+        self.counter = itertools.count()
+        self.start = time.time()
 
 
 @register_scheduler
@@ -32,7 +80,7 @@ class IDDFSScheduler(BaseScheduler):
         name="IDDFS",
         category="complete-search",
         complexity="O(b^d)",
-        description="Iterative deepening DFS scheduler",
+        description="Iterative deepening DFS with a transposition table",
         optimal=True,
     )
 
@@ -45,97 +93,207 @@ class IDDFSScheduler(BaseScheduler):
         scheduler_prefs: Optional[SchedulerPrefs] = None,
         timeout_seconds: int = 240,
         depth_increment: int = 1,
+        table_size: int = 200_000,
+        min_ects: int = 0,
     ) -> None:
         super().__init__(
             max_results=max_results,
             max_ects=max_ects,
+            min_ects=min_ects,
             allow_conflicts=allow_conflicts,
             max_conflicts=max_conflicts,
             scheduler_prefs=scheduler_prefs,
             timeout_seconds=timeout_seconds,
         )
         self.depth_increment = max(1, depth_increment)
+        self.table_size = max(1, table_size)
+        self._transpositions: Dict[TableKey, TableEntry] = {}
 
     def _run_algorithm(self, search: PreparedSearch) -> List[Schedule]:
-        results: List[Schedule] = []
-        max_depth = len(search.group_keys)
-        depth_limit = self.depth_increment
-        start = time.time()
-
-        while depth_limit <= max_depth and len(results) < self.max_results:
-            self._iddfs(
-                search,
-                depth_limit=depth_limit,
-                group_index=0,
-                current_courses=[],
-                current_ects=0,
-                results=results,
-                start=start,
-            )
+        table = OptionTable(search)
+        bound = CompletionBound(
+            table, self.scheduler_prefs, search.mandatory_codes,
+            self.max_ects, self.allow_conflicts, search.ects_bounds,
+        )
+        context = _SearchContext(table, bound, self.scheduler_prefs, search.ects_bounds)
+        self._transpositions = {}
+        stats = self._last_run_stats
+        stats.update({"iterations": 0, "table_hits": 0, "infeasible_subtrees": 0})
 
-            if self._last_run_stats.get("timeout_reached"):
+        max_depth = len(table.group_keys)
+        depth_limit = min(self.depth_increment, max_depth)
+        while True:
+            stats["iterations"] += 1
+            self._iddfs(context, depth_limit, 0, 0, 0, 0)
+            if stats.get("timeout_reached") or depth_limit >= max_depth:
                 break
+            # Always finish with a full-depth iteration
+            depth_limit = min(depth_limit + self.depth_increment, max_depth)
 
-            depth_limit += self.depth_increment
-
-        return results
+        stats["table_entries"] = len(self._transpositions)
+        ranked = sorted((-neg_cost, path) for neg_cost, _, path in context.best)
+        if ranked:
+            stats["best_cost"] = ranked[0][0]
+        return [
+            table.to_schedule(dict(zip(table.group_keys, path))) for _, path in ranked
+        ]
 
     def _iddfs(
         self,
-        search: PreparedSearch,
-        *,
+        context: _SearchContext,
         depth_limit: int,
-        group_index: int,
-        current_courses: List[Course],
-        current_ects: int,
-        results: List[Schedule],
-        start: float,
-    ) -> None:
-        if time.time() - start >= self.timeout_seconds:
+        depth: int,
+        ects: int,
+        occupied: int,
+        conflicts: int,
+    ) -> bool:
+        """
+        Depth-limited search below one state.
+
+        Returns:
+            False only if the subtree is proven to contain no complete schedule
+        """
+        if time.time() - context.start >= self.timeout_seconds:
             self._last_run_stats["timeout_reached"] = True
-            return
+            return True
 
         self._last_run_stats["nodes_explored"] += 1
+        table = context.table
 
-        if group_index >= len(search.group_keys) or group_index >= depth_limit:
-            if group_index >= len(search.group_keys) and current_courses:
-                schedule = Schedule(current_courses.copy())
-                if self._is_valid_final_schedule(schedule):
-                    results.append(schedule)
-            return
-
-        group_key = search.group_keys[group_index]
-        options = search.group_options.get(group_key, [])
+        if depth == len(table.group_keys):
+            if ects < self.min_ects:
+                return False
+            self._record_leaf(context)
+            return True
+        if depth >= depth_limit:
+            return True
 
-        for option in options:
-            if option is None:
-                self._iddfs(
-                    search,
-                    depth_limit=depth_limit,
-                    group_index=group_index + 1,
-                    current_courses=current_courses,
-                    current_ects=current_ects,
-                    results=results,
-                    start=start,
-                )
-                continue
+        key = (depth, occupied, conflicts, ects)
+        entry = self._transpositions.get(key)
+        if entry is not None:
+            self._last_run_stats["table_hits"] += 1
+            if math.isinf(entry[0]):
+                self._last_run_stats["branches_pruned"] += 1
+                return False
+        else:
+            entry = [context.bound.lower_bound(depth, ects, occupied, conflicts), None]
+            if math.isinf(entry[0]):
+                self._store(key, entry)
+                return False
 
-            new_courses = current_courses + option
-            new_ects = current_ects + sum(course.ects for course in option)
+        if depth_limit == len(table.group_keys) and self._cannot_improve(context, entry[0]):
+            self._last_run_stats["branches_pruned"] += 1
+            return True
 
-            if not self._is_valid_partial_selection(new_courses):
+        reached = False
+        best_child: Optional[Tuple[float, int]] = None
+        group = table.group_keys[depth]
+        for index in self._ordered_options(context, depth, entry, ects, occupied, conflicts):
+            option = table.get(group, index)
+            child_ects, child_occupied, child_conflicts = ects, occupied, conflicts
+            if option is not None:
+                child_ects += option.ects
+                child_conflicts |= (occupied & option.mask) | option.overlap_mask
+                child_occupied |= option.mask
+                if child_ects > self.max_ects or not self._conflicts_allowed(child_conflicts):
+                    self._last_run_stats["branches_pruned"] += 1
+                    continue
+            if context.ects_bounds is not None and not context.ects_bounds.allows(
+                depth + 1, child_ects
+            ):
                 self._last_run_stats["branches_pruned"] += 1
                 continue
 
-            self._iddfs(
-                search,
-                depth_limit=depth_limit,
-                group_index=group_index + 1,
-                current_courses=new_courses,
-                current_ects=new_ects,
-                results=results,
-                start=start,
+            context.path.append(index)
+            context.scorer.add(option)
+            child_reached = self._iddfs(
+                context, depth_limit, depth + 1, child_ects, child_occupied, child_conflicts
             )
+            context.scorer.remove(option)
+            context.path.pop()
+
+            if child_reached:
+                reached = True
+                child_entry = self._transpositions.get(
+                    (depth + 1, child_occupied, child_conflicts, child_ects)
+                )
+                child_bound = child_entry[0] if child_entry else entry[0]
+                if best_child is None or child_bound < best_child[0]:
+                    best_child = (child_bound, index)
+
+        if not reached:
+            entry[0] = math.inf
+            self._last_run_stats["infeasible_subtrees"] += 1
+        elif best_child is not None:
+            entry[1] = best_child[1]
+        self._store(key, entry)
+        return reached
+
+    def _ordered_options(
+        self,
+        context: _SearchContext,
+        depth: int,
+        entry: TableEntry,
+        ects: int,
+        occupied: int,
+        conflicts: int,
+    ) -> List[int]:
+        """
+        Option indices for a state: last iteration's best child first, then by
+        the cached bound of the child state (unknown children keep their order).
+        """
+        group = context.table.group_keys[depth]
+        options = context.table.options[group]
+
+        def child_bound(index: int) -> float:
+            option = options[index]
+            if option is None:
+                child_key = (depth + 1, occupied, conflicts, ects)
+            else:
+                child_key = (
+                    depth + 1,
+                    occupied | option.mask,
+                    conflicts | (occupied & option.mask) | option.overlap_mask,
+                    ects + option.ects,
+                )
+            child_entry = self._transpositions.get(child_key)
+            return child_entry[0] if child_entry else entry[0]
+
+        return sorted(
+            range(len(options)),
+            key=lambda index: (index != entry[1], child_bound(index)),
+        )
+
+    def _record_leaf(self, context: _SearchContext) -> None:
+        scorer = context.scorer
+        if scorer.violates_strict_free_days() or all(
+            context.table.get(group, index) is None
+            for group, index in zip(context.table.group_keys, context.path)
+        ):
+            return
+        cost = scorer.cost()
+        entry = (-cost, next(context.counter), tuple(context.path))
+        if len(context.best) < self.max_results:
+            heapq.heappush(context.best, entry)
+        elif cost < -context.best[0][0]:
+            heapq.heapreplace(context.best, entry)
+
+    def _cannot_improve(self, context: _SearchContext, lower_bound: float) -> bool:
+        """True if no completion can enter the current top-k."""
+        return len(context.best) >= self.max_results and lower_bound >= -context.best[0][0]
+
+    def _conflicts_allowed(self, conflict_mask: int) -> bool:
+        if not conflict_mask:
+            return True
+        return self.allow_conflicts and conflict_mask.bit_count() <= self.max_conflicts
+
+    def _store(self, key: TableKey, entry: TableEntry) -> None:
+        """Insert into the bounded table, evicting the oldest tenth when full."""
+        table = self._transpositions
+        if key not in table and len(table) >= self.table_size:
+            for old_key in list(itertools.islice(table, max(1, self.table_size // 10))):
+                del table[old_key]
+        table[key] = entry
 
 
 __all__ = ["IDDFSScheduler"]
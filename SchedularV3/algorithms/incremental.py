@@ -0,0 +1,284 @@
+"""Option-index encoding and incremental scoring for local search.
+
+Local-search schedulers repeatedly evaluate "replace the option of one group"
+moves. Rebuilding a ``Schedule`` and calling ``score_schedule`` for every
+neighbour costs O(courses * slots) per move. This module provides:
+
+- ``OptionTable``: every option of every group pre-encoded once (ECTS total,
+  time slots, weekly occupancy bitmask) and addressed by ``(group, index)``.
+- ``IncrementalScorer``: a running tally of slot occupancy that re-derives
+  day statistics only for the days a move touches, so a move can be scored
+  in O(option slots) while matching ``score_schedule`` exactly.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from core.models import Course, Schedule
+    from utils.schedule_metrics import SchedulerPrefs
+
+# Runtime imports
+try:
+    from core.models import Course, Schedule
+except ImportError as e:
+    raise ImportError(f"Required module core.models not found: {e}")
+
+try:
+    from utils.schedule_metrics import SchedulerPrefs
+except ImportError as e:
+    raise ImportError(f"Required module utils.schedule_metrics not found: {e}")
+
+from .base_scheduler import PreparedSearch
+
+
+# Mirrors the day list used by ``compute_schedule_stats``.
+ALL_DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_ALL_DAYS_SET = frozenset(ALL_DAYS)
+
+Assignment = Dict[str, int]
+
+
+@dataclass(frozen=True)
+class EncodedOption:
+    """Pre-computed attributes of a single group option."""
+
+    group: str
+    index: int
+    courses: Tuple[Course, ...]
+    ects: int
+    slots: Tuple[Tuple[str, int], ...]
+    mask: int
+    # Slots the option itself occupies more than once (e.g. lecture/lab clash)
+    overlap_mask: int = 0
+
+
+class OptionTable:
+    """Index of every option of every group in a prepared search."""
+
+    def __init__(self, search: PreparedSearch) -> None:
+        self.group_keys: List[str] = list(search.group_keys)
+        self.mandatory_codes = set(search.mandatory_codes)
+        self.slot_bits: Dict[Tuple[str, int], int] = {}
+        self.options: Dict[str, List[Optional[EncodedOption]]] = {}
+
+        for group in self.group_keys:
+            encoded: List[Optional[EncodedOption]] = []
+            for index, option in enumerate(search.group_options.get(group, [])):
+                encoded.append(None if option is None else self._encode(group, index, option))
+            self.options[group] = encoded
+
+    def _encode(self, group: str, index: int, option: List[Course]) -> EncodedOption:
+        slots = tuple(slot for course in option for slot in course.schedule)
+        mask = overlap_mask = 0
+        for slot in slots:
+            bit = 1 << self.slot_bits.setdefault(slot, len(self.slot_bits))
+            if mask & bit:
+                overlap_mask |= bit
+            mask |= bit
+        return EncodedOption(
+            group=group,
+            index=index,
+            courses=tuple(option),
+            ects=sum(course.ects for course in option),
+            slots=slots,
+            mask=mask,
+            overlap_mask=overlap_mask,
+        )
+
+    def get(self, group: str, index: int) -> Optional[EncodedOption]:
+        return self.options[group][index]
+
+    def restricted(self, group_keys: Sequence[str]) -> OptionTable:
+        """View over a subset of groups sharing this table's slot encoding."""
+        view = copy.copy(self)
+        view.group_keys = list(group_keys)
+        return view
+
+    def courses_for(self, assignment: Assignment) -> List[Course]:
+        """Expand an assignment into the flat course list used by ``Schedule``."""
+        courses: List[Course] = []
+        for group in self.group_keys:
+            index = assignment.get(group)
+            if index is None:
+                continue
+            option = self.options[group][index]
+            if option is not None:
+                courses.extend(option.courses)
+        return courses
+
+    def to_schedule(self, assignment: Assignment) -> Schedule:
+        return Schedule(self.courses_for(assignment))
+
+    def assignment_for(self, schedule: Schedule) -> Optional[Assignment]:
+        """Option indices reproducing ``schedule``; None if it is not expressible here."""
+        chosen: Dict[str, set] = {}
+        for course in schedule.courses:
+            chosen.setdefault(course.main_code, set()).add(course.code)
+
+        assignment: Assignment = {}
+        for group in self.group_keys:
+            codes = chosen.pop(group, set())
+            for index, option in enumerate(self.options[group]):
+                option_codes = {course.code for course in option.courses} if option else set()
+                if option_codes == codes:
+                    assignment[group] = index
+                    break
+            else:
+                return None
+        return None if chosen else assignment
+
+
+class IncrementalScorer:
+    """
+    Running schedule statistics supporting O(move) add/remove and scoring.
+
+    ``cost()`` returns ``-score_schedule(schedule, prefs)`` when preferences
+    are configured and ``estimate_conflict_penalty(schedule)`` otherwise, so it
+    can replace the ``_cost`` helpers of the local-search schedulers.
+    """
+
+    def __init__(self, prefs: Optional[SchedulerPrefs] = None) -> None:
+        self.prefs = prefs
+        self.total_ects = 0
+        self.conflicts = 0
+        self._slot_counts: Counter = Counter()
+        self._day_periods: Dict[str, Counter] = {}
+        # day -> (distinct slots, gaps, longest consecutive block)
+        self._day_stats: Dict[str, Tuple[int, int, int]] = {}
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+    def add(self, option: Optional[EncodedOption]) -> None:
+        if option is None:
+            return
+        self.total_ects += option.ects
+        for slot in option.slots:
+            self._slot_counts[slot] += 1
+            if self._slot_counts[slot] == 2:
+                self.conflicts += 1
+            day, period = slot
+            self._day_periods.setdefault(day, Counter())[period] += 1
+        self._refresh_days(day for day, _ in option.slots)
+
+    def remove(self, option: Optional[EncodedOption]) -> None:
+        if option is None:
+            return
+        self.total_ects -= option.ects
+        for slot in option.slots:
+            self._slot_counts[slot] -= 1
+            if self._slot_counts[slot] == 1:
+                self.conflicts -= 1
+            elif self._slot_counts[slot] == 0:
+                del self._slot_counts[slot]
+            day, period = slot
+            periods = self._day_periods[day]
+            periods[period] -= 1
+            if periods[period] == 0:
+                del periods[period]
+        self._refresh_days(day for day, _ in option.slots)
+
+    def swap(self, old: Optional[EncodedOption], new: Optional[EncodedOption]) -> None:
+        self.remove(old)
+        self.add(new)
+
+    def _refresh_days(self, days: Iterable[str]) -> None:
+        for day in set(days):
+            periods = self._day_periods.get(day)
+            if not periods:
+                self._day_periods.pop(day, None)
+                self._day_stats.pop(day, None)
+                continue
+
+            ordered = sorted(periods)
+            gaps = 0
+            block = current = 1
+            for previous, period in zip(ordered, ordered[1:]):
+                if period - previous > 1:
+                    gaps += 1
+                    current = 1
+                else:
+                    current += 1
+                    block = max(block, current)
+            self._day_stats[day] = (len(ordered), gaps, block)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def day_slot_count(self, day: str) -> int:
+        stats = self._day_stats.get(day)
+        return stats[0] if stats else 0
+
+    def violates_strict_free_days(self) -> bool:
+        """Mirror ``meets_free_day_constraint(strict=True)`` for the current state."""
+        prefs = self.prefs
+        if not prefs or not prefs.strict_free_days or not prefs.desired_free_days:
+            return False
+        return any(
+            day not in _ALL_DAYS_SET or day in self._day_stats
+            for day in prefs.desired_free_days
+        )
+
+    def cost(self) -> float:
+        days_used = len(self._day_stats)
+        total_slots = 0
+        total_gaps = 0
+        total_blocks = 0
+        for day, (distinct, gaps, block) in self._day_stats.items():
+            total_slots += distinct
+            if day in _ALL_DAYS_SET:
+                total_gaps += gaps
+                total_blocks += block
+
+        prefs = self.prefs
+        if not prefs:
+            return self.conflicts * 100 + total_gaps * 10 + days_used * 5
+
+        score = 0.0
+        if prefs.desired_free_days:
+            desired = set(prefs.desired_free_days)
+            if prefs.strict_free_days:
+                achieved = sum(
+                    1 for day in desired if day in _ALL_DAYS_SET and day not in self._day_stats
+                )
+            else:
+                achieved = sum(1 for day in desired if self.day_slot_count(day) <= 1)
+            score += prefs.weight_free_days * (achieved / len(desired)) * 100
+
+        if prefs.compress_classes:
+            score += prefs.weight_compression * ((7 - days_used) / 7) * 100
+
+        if total_slots > 0:
+            score += prefs.weight_gaps * ((total_slots - total_gaps) / total_slots) * 100
+            score += prefs.weight_consecutive * (total_blocks / total_slots) * 100
+
+        score -= prefs.weight_conflicts * self.conflicts * 10
+        return -score
+
+    def evaluate_swap(
+        self, old: Optional[EncodedOption], new: Optional[EncodedOption]
+    ) -> Tuple[float, int, int, bool]:
+        """
+        Score replacing ``old`` by ``new`` without keeping the change.
+
+        Returns:
+            Tuple of (cost, conflicts, total_ects, violates_strict_free_days)
+        """
+        self.swap(old, new)
+        result = (self.cost(), self.conflicts, self.total_ects, self.violates_strict_free_days())
+        self.swap(new, old)
+        return result
+
+
+__all__ = [
+    "ALL_DAYS",
+    "Assignment",
+    "EncodedOption",
+    "IncrementalScorer",
+    "OptionTable",
+]
@@ -0,0 +1,331 @@
+"""Large Neighbourhood Search scheduler.
+
+Each iteration destroys part of the incumbent and repairs it exactly:
+
+- destroy: a random seed group plus the groups most related to it, where
+  two groups are related when their options compete for the same slots or
+  their current sections meet on the same days (Shaw removal, randomized
+  towards the most related groups);
+- repair: a branch-and-bound DFS over the freed groups with every other
+  group fixed, ordered and pruned by the A* ``CompletionBound`` and scored
+  with ``IncrementalScorer``; only strict improvements are accepted.
+
+Repairs run under a node budget. A repair that proves its neighbourhood
+optimal within a quarter of the budget lets the next neighbourhood grow by
+one group; a repair that runs out of budget shrinks it. After
+``stall_limit`` non-improving iterations the budget doubles (up to
+``MAX_BUDGET_FACTOR`` times the initial one) and it resets on improvement.
+The best warm-start incumbent, if any, replaces the initial full repair.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from core.models import Schedule
+    from utils.schedule_metrics import SchedulerPrefs
+
+# Runtime imports
+try:
+    from core.models import Schedule
+except ImportError as e:
+    raise ImportError(f"Required module core.models not found: {e}")
+
+try:
+    from utils.schedule_metrics import SchedulerPrefs
+except ImportError as e:
+    raise ImportError(f"Required module utils.schedule_metrics not found: {e}")
+
+from . import register_scheduler
+from .a_star_scheduler import CompletionBound
+from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
+from .ects_bounds import EctsBounds
+from .incremental import Assignment, IncrementalScorer, OptionTable
+
+# Bias of Shaw removal towards the most related groups (1 = uniform)
+RELATEDNESS_BIAS = 3.0
+# Upper limit of the adaptive repair budget, as a multiple of ``repair_budget``
+MAX_BUDGET_FACTOR = 16
+
+
+class _Repair:
+    """Branch-and-bound DFS over a subset of groups with the rest fixed."""
+
+    def __init__(
+        self,
+        scheduler: LargeNeighbourhoodSearchScheduler,
+        view: OptionTable,
+        bound: CompletionBound,
+        scorer: IncrementalScorer,
+        best_cost: float,
+        budget: int,
+    ) -> None:
+        self.scheduler = scheduler
+        self.view = view
+        self.bound = bound
+        self.scorer = scorer
+        self.best_cost = best_cost
+        self.best_path: Optional[Tuple[int, ...]] = None
+        self.path: List[int] = []
+        self.budget = budget
+        self.nodes = 0
+        self.exhausted = False
+
+    def search(self, depth: int, ects: int, occupied: int, conflicts: int) -> None:
+        if self.nodes >= self.budget:
+            self.exhausted = True
+            return
+        self.nodes += 1
+
+        view = self.view
+        if depth == len(view.group_keys):
+            if self.scorer.violates_strict_free_days() or ects < self.scheduler.min_ects:
+                return
+            cost = self.scorer.cost()
+            if cost < self.best_cost:
+                self.best_cost = cost
+                self.best_path = tuple(self.path)
+            return
+
+        group = view.group_keys[depth]
+        children = []
+        for index, option in enumerate(view.options[group]):
+            child_ects, child_occupied, child_conflicts = ects, occupied, conflicts
+            if option is not None:
+                child_ects += option.ects
+                child_conflicts |= (occupied & option.mask) | option.overlap_mask
+                child_occupied |= option.mask
+                if not self.scheduler._is_admissible_state(
+                    child_conflicts.bit_count(), child_ects, False
+                ):
+                    continue
+            child_bound = self.bound.lower_bound(
+                depth + 1, child_ects, child_occupied, child_conflicts
+            )
+            if child_bound < self.best_cost:
+                children.append(
+                    (child_bound, index, option, child_ects, child_occupied, child_conflicts)
+                )
+
+        children.sort(key=lambda child: child[:2])
+        for child_bound, index, option, child_ects, child_occupied, child_conflicts in children:
+            if child_bound >= self.best_cost or self.exhausted:
+                break
+            self.path.append(index)
+            self.scorer.add(option)
+            self.search(depth + 1, child_ects, child_occupied, child_conflicts)
+            self.scorer.remove(option)
+            self.path.pop()
+
+
+class _Relatedness:
+    """Slot competition and shared days between groups."""
+
+    def __init__(self, table: OptionTable) -> None:
+        day_bits: Dict[str, int] = {}
+        self.slot_days: List[Tuple[int, int]] = []
+        for (day, _), bit in table.slot_bits.items():
+            day_bit = day_bits.setdefault(day, 1 << len(day_bits))
+            self.slot_days.append((1 << bit, day_bit))
+        self.reach: Dict[str, int] = {}
+        for group in table.group_keys:
+            mask = 0
+            for option in table.options[group]:
+                if option is not None:
+                    mask |= option.mask
+            self.reach[group] = mask
+
+    def days(self, slot_mask: int) -> int:
+        days = 0
+        for slot_bit, day_bit in self.slot_days:
+            if slot_mask & slot_bit:
+                days |= day_bit
+        return days
+
+    def score(self, seed: str, group: str, current: Dict[str, int], days: Dict[str, int]) -> int:
+        score = 0
+        # Options of one group could take the slots the other currently uses
+        if self.reach[seed] & current[group] or self.reach[group] & current[seed]:
+            score += 2
+        return score + (days[seed] & days[group]).bit_count()
+
+
+@register_scheduler
+class LargeNeighbourhoodSearchScheduler(BaseScheduler):
+    """Destroy/repair search that re-optimises related groups together."""
+
+    metadata = AlgorithmMetadata(
+        name="LNS",
+        category="local-search",
+        complexity="O(iterations * repair_budget)",
+        description="Large neighbourhood search with exact DFS repair",
+        optimal=False,
+        supports_preferences=True,
+        is_optimizer=True,
+    )
+
+    def __init__(
+        self,
+        max_results: int = 5,
+        max_ects: int = 31,
+        allow_conflicts: bool = False,
+        max_conflicts: int = 1,
+        scheduler_prefs: Optional[SchedulerPrefs] = None,
+        timeout_seconds: int = 120,
+        max_iterations: int = 200,
+        neighbourhood_size: int = 3,
+        repair_budget: int = 5_000,
+        stall_limit: int = 20,
+        seed: Optional[int] = None,
+        min_ects: int = 0,
+    ) -> None:
+        super().__init__(
+            max_results=max_results,
+            max_ects=max_ects,
+            min_ects=min_ects,
+            allow_conflicts=allow_conflicts,
+            max_conflicts=max_conflicts,
+            scheduler_prefs=scheduler_prefs,
+            timeout_seconds=timeout_seconds,
+            seed=seed,
+        )
+        self.max_iterations = max(1, max_iterations)
+        self.neighbourhood_size = max(1, neighbourhood_size)
+        self.repair_budget = max(1, repair_budget)
+        self.stall_limit = max(1, stall_limit)
+
+    def _run_algorithm(self, search: PreparedSearch) -> List[Schedule]:
+        table = OptionTable(search)
+        groups = table.group_keys
+        stats = self._last_run_stats
+        stats.update({"iterations": 0, "improvements": 0, "repairs_exhausted": 0})
+        start = time.time()
+
+        # Start from the best warm-start incumbent, else a budgeted repair of every group
+        warm = [table.assignment_for(schedule) for schedule in search.warm_start]
+        if warm:
+            assignment = warm[0]
+            cost = self._cost(table, assignment)
+        else:
+            repair = self._repair(table, search, {}, groups, math.inf, self.repair_budget * 4)
+            if repair.best_path is None:
+                return []
+            assignment = dict(zip(groups, repair.best_path))
+            cost = repair.best_cost
+        elites: Dict[Tuple[int, ...], float] = {
+            tuple(assignment[group] for group in groups): cost
+        }
+
+        relatedness = _Relatedness(table)
+        size = min(self.neighbourhood_size, len(groups))
+        budget = self.repair_budget
+        stall = 0
+        for _ in range(self.max_iterations):
+            if time.time() - start >= self.timeout_seconds:
+                stats["timeout_reached"] = True
+                break
+            stats["iterations"] += 1
+
+            freed = self._destroy(table, relatedness, assignment, size)
+            fixed = {group: index for group, index in assignment.items() if group not in freed}
+            repair = self._repair(table, search, fixed, freed, cost, budget)
+
+            if repair.best_path is not None:
+                assignment.update(zip(freed, repair.best_path))
+                cost = repair.best_cost
+                elites[tuple(assignment[group] for group in groups)] = cost
+                stats["improvements"] += 1
+                stall = 0
+                budget = self.repair_budget
+            else:
+                stall += 1
+                if stall >= self.stall_limit:
+                    stall = 0
+                    budget = min(budget * 2, self.repair_budget * MAX_BUDGET_FACTOR)
+
+            if repair.exhausted:
+                stats["repairs_exhausted"] += 1
+                size = max(1, size - 1)
+            elif len(freed) == len(groups):
+                # An exhaustive repair of every group proves the incumbent optimal
+                stats["proven_optimal"] = True
+                break
+            elif repair.nodes * 4 <= budget:
+                size = min(len(groups), size + 1)
+
+        stats["neighbourhood_size"] = size
+        stats["best_cost"] = cost
+        best = heapq.nsmallest(self.max_results, elites.items(), key=lambda item: item[1])
+        return [table.to_schedule(dict(zip(groups, vector))) for vector, _ in best]
+
+    def _cost(self, table: OptionTable, assignment: Assignment) -> float:
+        scorer = IncrementalScorer(self.scheduler_prefs)
+        for group, index in assignment.items():
+            scorer.add(table.get(group, index))
+        return scorer.cost()
+
+    def _repair(
+        self,
+        table: OptionTable,
+        search: PreparedSearch,
+        fixed: Assignment,
+        freed: List[str],
+        best_cost: float,
+        budget: int,
+    ) -> _Repair:
+        """Re-solve ``freed`` exactly with ``fixed`` kept, looking for cost below ``best_cost``."""
+        scorer = IncrementalScorer(self.scheduler_prefs)
+        ects = occupied = conflicts = 0
+        for group, index in fixed.items():
+            option = table.get(group, index)
+            scorer.add(option)
+            if option is not None:
+                ects += option.ects
+                conflicts |= (occupied & option.mask) | option.overlap_mask
+                occupied |= option.mask
+
+        view = table.restricted(freed)
+        # ``ects`` already includes the fixed groups, so the bounds only cover ``freed``
+        ects_bounds = EctsBounds(
+            view.group_keys, search.group_options, search.mandatory_codes,
+            self.min_ects, self.max_ects,
+        )
+        bound = CompletionBound(
+            view, self.scheduler_prefs, search.mandatory_codes,
+            self.max_ects, self.allow_conflicts, ects_bounds,
+        )
+        repair = _Repair(self, view, bound, scorer, best_cost, budget)
+        repair.search(0, ects, occupied, conflicts)
+        self._last_run_stats["nodes_explored"] += repair.nodes
+        return repair
+
+    def _destroy(
+        self, table: OptionTable, relatedness: _Relatedness, assignment: Assignment, size: int
+    ) -> List[str]:
+        """Seed group plus ``size - 1`` groups drawn with a bias towards related ones."""
+        groups = table.group_keys
+        current = {}
+        for group in groups:
+            option = table.get(group, assignment[group])
+            current[group] = option.mask if option is not None else 0
+        days = {group: relatedness.days(mask) for group, mask in current.items()}
+
+        seed = self._rng.choice(groups)
+        candidates = sorted(
+            (group for group in groups if group != seed),
+            key=lambda group: relatedness.score(seed, group, current, days),
+            reverse=True,
+        )
+        freed = {seed}
+        while candidates and len(freed) < size:
+            pick = int(len(candidates) * self._rng.random() ** RELATEDNESS_BIAS)
+            freed.add(candidates.pop(pick))
+        # Keep search order so the repair sees mandatory groups first
+        return [group for group in groups if group in freed]
+
+
+__all__ = ["LargeNeighbourhoodSearchScheduler"]
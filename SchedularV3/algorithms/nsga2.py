@@ -0,0 +1,401 @@
+"""NSGA-II multi-objective scheduler.
+
+Instead of folding objectives into a weighted sum, every schedule is scored
+on a vector of objectives (all minimised, see ``OBJECTIVES``) and the
+population evolves towards the Pareto front:
+
+- individuals are rows of an option-index array, recombined with uniform
+  crossover and per-gene mutation;
+- hard-constraint violations (ECTS over the limit, too many conflicts,
+  classes on strict free days) use Deb's constrained domination: feasible
+  individuals precede infeasible ones, which are ranked by violation;
+- non-dominated sorting builds the pairwise domination matrix with numpy
+  broadcasting and peels fronts by domination counts, and crowding distance
+  is computed per front with column-wise sorts.
+
+The run returns up to ``max_results`` distinct schedules from the first
+front, extremes first; ``last_pareto_front`` keeps the objective values of
+every front member so callers can browse trade-offs without re-solving.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from core.models import Schedule
+    from utils.schedule_metrics import SchedulerPrefs
+
+# Runtime imports
+try:
+    from core.models import Schedule
+except ImportError as e:
+    raise ImportError(f"Required module core.models not found: {e}")
+
+try:
+    from utils.schedule_metrics import SchedulerPrefs
+except ImportError as e:
+    raise ImportError(f"Required module utils.schedule_metrics not found: {e}")
+
+from . import register_scheduler
+from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
+from .genetic_algorithm import SEEDING_STATE_BUDGET
+from .incremental import ALL_DAYS, OptionTable
+from .solution_space import SolutionSpace, StateBudgetExceeded
+
+
+# Objective vector layout; every objective is minimised
+OBJECTIVES = ("free_day_violations", "gaps", "days_used", "ects_shortfall", "conflicts")
+
+
+def non_dominated_sort(objectives: np.ndarray) -> List[np.ndarray]:
+    """
+    Split rows of an ``(n, m)`` objective matrix into Pareto fronts.
+
+    Returns:
+        Index arrays, best front first
+    """
+    if len(objectives) == 0:
+        return []
+    left = objectives[:, None, :]
+    right = objectives[None, :, :]
+    # dominates[i, j]: row i is no worse everywhere and better somewhere than row j
+    dominates = np.all(left <= right, axis=2) & np.any(left < right, axis=2)
+    counts = dominates.sum(axis=0)
+    remaining = np.ones(len(objectives), dtype=bool)
+
+    fronts = []
+    while remaining.any():
+        front = np.flatnonzero(remaining & (counts == 0))
+        fronts.append(front)
+        remaining[front] = False
+        counts = counts - dominates[front].sum(axis=0)
+    return fronts
+
+
+def crowding_distance(objectives: np.ndarray) -> np.ndarray:
+    """Crowding distance of every row of one front (boundary rows get ``inf``)."""
+    rows, columns = objectives.shape
+    distance = np.zeros(rows)
+    if rows <= 2:
+        distance[:] = np.inf
+        return distance
+
+    order = np.argsort(objectives, axis=0, kind="stable")
+    ordered = np.take_along_axis(objectives, order, axis=0)
+    spread = ordered[-1] - ordered[0]
+    spread[spread == 0] = 1.0
+    contribution = (ordered[2:] - ordered[:-2]) / spread
+
+    for column in range(columns):
+        distance[order[1:-1, column]] += contribution[:, column]
+        distance[order[[0, -1], column]] = np.inf
+    return distance
+
+
+@register_scheduler
+class NSGA2Scheduler(BaseScheduler):
+    """Evolves a Pareto front over free days, gaps, compression, ECTS and conflicts."""
+
+    metadata = AlgorithmMetadata(
+        name="NSGA-II",
+        category="evolutionary",
+        complexity="O(generations * population^2)",
+        description="Multi-objective genetic algorithm returning a Pareto front",
+        optimal=False,
+        supports_preferences=True,
+        is_optimizer=True,
+    )
+
+    def __init__(
+        self,
+        max_results: int = 20,
+        max_ects: int = 31,
+        allow_conflicts: bool = False,
+        max_conflicts: int = 1,
+        scheduler_prefs: Optional[SchedulerPrefs] = None,
+        timeout_seconds: int = 120,
+        population_size: int = 40,
+        generations: int = 60,
+        crossover_rate: float = 0.9,
+        mutation_rate: Optional[float] = None,
+        seed: Optional[int] = None,
+        min_ects: int = 0,
+    ) -> None:
+        super().__init__(
+            max_results=max_results,
+            max_ects=max_ects,
+            min_ects=min_ects,
+            allow_conflicts=allow_conflicts,
+            max_conflicts=max_conflicts,
+            scheduler_prefs=scheduler_prefs,
+            timeout_seconds=timeout_seconds,
+            seed=seed,
+        )
+        self.population_size = max(4, population_size)
+        self.generations = max(1, generations)
+        self.crossover_rate = crossover_rate
+        # ``None`` means one mutated gene per individual on average
+        self.mutation_rate = mutation_rate
+        self._last_front: List[Dict[str, Any]] = []
+
+    @property
+    def last_pareto_front(self) -> List[Dict[str, Any]]:
+        """Front of the last run as ``{"schedule": ..., "objectives": {...}}`` entries."""
+        return list(self._last_front)
+
+    def _run_algorithm(self, search: PreparedSearch) -> List[Schedule]:
+        table = OptionTable(search)
+        keys = [key for key in table.group_keys if table.options[key]]
+        self._last_front = []
+        self._last_run_stats.update({"generations": 0, "front_size": 0})
+        if not keys:
+            return []
+
+        evaluator = _ObjectiveEvaluator(self, table, keys)
+        rng = self._numpy_rng()
+        counts = np.array([len(table.options[key]) for key in keys], dtype=np.int64)
+        mutation_rate = self.mutation_rate if self.mutation_rate is not None else 1 / len(keys)
+
+        population = self._initial_population(search, table, keys, rng, counts)
+        objectives, violations = evaluator.evaluate(population)
+        ranks, crowding = self._rank(objectives, violations)
+
+        start = time.time()
+        for _ in range(self.generations):
+            if time.time() - start >= self.timeout_seconds:
+                self._last_run_stats["timeout_reached"] = True
+                break
+            self._last_run_stats["generations"] += 1
+            parents = self._tournament(rng, ranks, crowding)
+            offspring = self._vary(rng, population[parents], counts, mutation_rate)
+            child_objectives, child_violations = evaluator.evaluate(offspring)
+
+            merged = np.vstack([population, offspring])
+            merged_objectives = np.vstack([objectives, child_objectives])
+            merged_violations = np.concatenate([violations, child_violations])
+            survivors = self._survivors(merged_objectives, merged_violations)
+
+            population = merged[survivors]
+            objectives = merged_objectives[survivors]
+            violations = merged_violations[survivors]
+            ranks, crowding = self._rank(objectives, violations)
+
+        self._last_run_stats["cache_hits"] = evaluator.cache_hits
+        return self._front_schedules(table, keys, population, objectives, violations)
+
+    def _initial_population(
+        self,
+        search: PreparedSearch,
+        table: OptionTable,
+        keys: List[str],
+        rng: np.random.Generator,
+        counts: np.ndarray,
+    ) -> np.ndarray:
+        """Uniform valid samples where countable, topped up with random rows."""
+        try:
+            space = SolutionSpace.from_search(self, search, max_states=SEEDING_STATE_BUDGET)
+            samples = space.sample_many(self.population_size, self._rng)
+        except StateBudgetExceeded:
+            samples = []
+
+        # Warm-start incumbents first, then uniform samples
+        warm = [table.assignment_for(schedule) for schedule in search.warm_start]
+        rows = [[assignment[key] for key in keys] for assignment in warm + samples]
+        rows = rows[: self.population_size]
+        population = np.floor(
+            rng.random((self.population_size - len(rows), len(keys))) * counts
+        ).astype(np.int64)
+        if rows:
+            population = np.vstack([np.array(rows, dtype=np.int64), population])
+        return population
+
+    def _rank(
+        self, objectives: np.ndarray, violations: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Front index and crowding distance of every individual."""
+        ranks = np.empty(len(objectives), dtype=np.int64)
+        crowding = np.empty(len(objectives))
+        for rank, front in enumerate(self._fronts(objectives, violations)):
+            ranks[front] = rank
+            crowding[front] = crowding_distance(objectives[front])
+        return ranks, crowding
+
+    @staticmethod
+    def _fronts(objectives: np.ndarray, violations: np.ndarray) -> List[np.ndarray]:
+        """Constrained domination: feasible fronts, then infeasible rows by violation."""
+        feasible = np.flatnonzero(violations == 0)
+        fronts = [feasible[front] for front in non_dominated_sort(objectives[feasible])]
+        infeasible = np.flatnonzero(violations > 0)
+        for level in np.unique(violations[infeasible]):
+            fronts.append(infeasible[violations[infeasible] == level])
+        return fronts
+
+    def _survivors(self, objectives: np.ndarray, violations: np.ndarray) -> np.ndarray:
+        """Elitist truncation: whole fronts, the last one by crowding distance."""
+        chosen: List[np.ndarray] = []
+        size = 0
+        for front in self._fronts(objectives, violations):
+            if size + len(front) <= self.population_size:
+                chosen.append(front)
+                size += len(front)
+                continue
+            distance = crowding_distance(objectives[front])
+            chosen.append(front[np.argsort(-distance, kind="stable")[: self.population_size - size]])
+            break
+        return np.concatenate(chosen)
+
+    def _tournament(
+        self, rng: np.random.Generator, ranks: np.ndarray, crowding: np.ndarray
+    ) -> np.ndarray:
+        """Binary tournaments on (rank, -crowding), one winner per offspring."""
+        first = rng.integers(0, len(ranks), self.population_size)
+        second = rng.integers(0, len(ranks), self.population_size)
+        first_wins = (ranks[first] < ranks[second]) | (
+            (ranks[first] == ranks[second]) & (crowding[first] >= crowding[second])
+        )
+        return np.where(first_wins, first, second)
+
+    def _vary(
+        self,
+        rng: np.random.Generator,
+        parents: np.ndarray,
+        counts: np.ndarray,
+        mutation_rate: float,
+    ) -> np.ndarray:
+        """Uniform crossover of consecutive parent pairs, then per-gene mutation."""
+        mates = np.roll(parents, 1, axis=0)
+        crossing = rng.random(len(parents)) < self.crossover_rate
+        swap = (rng.random(parents.shape) < 0.5) & crossing[:, None]
+        children = np.where(swap, mates, parents)
+
+        mutate = rng.random(children.shape) < mutation_rate
+        redraw = np.floor(rng.random(children.shape) * counts).astype(np.int64)
+        return np.where(mutate, redraw, children)
+
+    def _front_schedules(
+        self,
+        table: OptionTable,
+        keys: List[str],
+        population: np.ndarray,
+        objectives: np.ndarray,
+        violations: np.ndarray,
+    ) -> List[Schedule]:
+        feasible = np.flatnonzero(violations == 0)
+        if len(feasible) == 0:
+            return []
+        front = feasible[non_dominated_sort(objectives[feasible])[0]]
+        _, first = np.unique(population[front], axis=0, return_index=True)
+        front = front[np.sort(first)]
+        # Extremes and sparse regions first, so truncation keeps the spread
+        front = front[np.argsort(-crowding_distance(objectives[front]), kind="stable")]
+
+        schedules = []
+        for index in front:
+            if len(schedules) >= self.max_results:
+                break
+            schedule = table.to_schedule(dict(zip(keys, population[index].tolist())))
+            if not self._is_valid_final_schedule(schedule):
+                continue
+            schedules.append(schedule)
+            self._last_front.append(
+                {
+                    "schedule": schedule,
+                    "objectives": dict(zip(OBJECTIVES, objectives[index].tolist())),
+                }
+            )
+        self._last_run_stats["front_size"] = len(front)
+        return schedules
+
+
+class _ObjectiveEvaluator:
+    """Decodes option-index rows into objective vectors, caching by row."""
+
+    def __init__(self, scheduler: NSGA2Scheduler, table: OptionTable, keys: List[str]) -> None:
+        self.scheduler = scheduler
+        self.options = [table.options[key] for key in keys]
+        self.cache: Dict[bytes, Tuple[Tuple[float, ...], float]] = {}
+        self.cache_hits = 0
+
+        self.day_masks: Dict[str, int] = {}
+        self.day_periods: Dict[str, List[Tuple[int, int]]] = {}
+        for (day, period), bit in sorted(table.slot_bits.items()):
+            self.day_masks[day] = self.day_masks.get(day, 0) | (1 << bit)
+            self.day_periods.setdefault(day, []).append((period, 1 << bit))
+        self._gap_cache: Dict[Tuple[str, int], int] = {}
+
+        prefs = scheduler.scheduler_prefs
+        desired = list(prefs.desired_free_days or []) if prefs else []
+        self.desired_masks = [self.day_masks.get(day, 0) for day in desired]
+        self.strict = bool(prefs and prefs.strict_free_days and desired)
+        # ``meets_free_day_constraint`` rejects every schedule for unknown days
+        self.reject_all = self.strict and any(day not in ALL_DAYS for day in desired)
+        self.conflict_limit = scheduler.max_conflicts if scheduler.allow_conflicts else 0
+
+    def evaluate(self, population: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        objectives = np.empty((len(population), len(OBJECTIVES)))
+        violations = np.empty(len(population))
+        for row, vector in enumerate(population):
+            key = vector.tobytes()
+            cached = self.cache.get(key)
+            if cached is None:
+                cached = self.cache[key] = self._decode(vector)
+                self.scheduler._last_run_stats["nodes_explored"] += 1
+            else:
+                self.cache_hits += 1
+            objectives[row], violations[row] = cached
+        return objectives, violations
+
+    def _decode(self, vector: np.ndarray) -> Tuple[Tuple[float, ...], float]:
+        ects = occupied = conflicts = 0
+        for options, index in zip(self.options, vector.tolist()):
+            option = options[index]
+            if option is not None:
+                ects += option.ects
+                conflicts |= (occupied & option.mask) | option.overlap_mask
+                occupied |= option.mask
+
+        gaps = days_used = 0
+        for day, mask in self.day_masks.items():
+            if occupied & mask:
+                days_used += 1
+                gaps += self._day_gaps(day, occupied & mask)
+        busy_desired = sum(1 for mask in self.desired_masks if occupied & mask)
+        conflict_count = conflicts.bit_count()
+
+        violation = max(0, ects - self.scheduler.max_ects)
+        violation += max(0, conflict_count - self.conflict_limit)
+        if self.strict:
+            violation += busy_desired + self.reject_all
+        if not occupied:
+            violation += 1
+
+        objectives = (
+            float(busy_desired),
+            float(gaps),
+            float(days_used),
+            float(max(0, self.scheduler.max_ects - ects)),
+            float(conflict_count),
+        )
+        return objectives, float(violation)
+
+    def _day_gaps(self, day: str, day_bits: int) -> int:
+        key = (day, day_bits)
+        gaps = self._gap_cache.get(key)
+        if gaps is None:
+            gaps = 0
+            if day in ALL_DAYS:
+                previous = None
+                for period, bit in self.day_periods[day]:
+                    if day_bits & bit:
+                        if previous is not None and period - previous > 1:
+                            gaps += 1
+                        previous = period
+            self._gap_cache[key] = gaps
+        return gaps
+
+
+__all__ = ["NSGA2Scheduler", "OBJECTIVES", "crowding_distance", "non_dominated_sort"]
@@ -1,17 +1,25 @@
-"""Parallel execution helpers for schedulers."""
+"""Parallel execution helpers for schedulers.
+
+``run_algorithms_parallel`` races several algorithms on one selection;
+``run_variants_parallel`` solves many selections ("what if I drop X or add
+Y") of one catalog with one algorithm, building the section combinations of
+every group once and solving each distinct variant once.
+"""
 
 from __future__ import annotations
 
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from typing import TYPE_CHECKING, Dict, Iterable, Optional, Sequence, Tuple, Type, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import (
+    TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Type, Union,
+)
 
 if TYPE_CHECKING:
-    from core.models import CourseGroup, Schedule
+    from core.models import Course, CourseGroup, Schedule
     from utils.schedule_metrics import SchedulerPrefs
 
 # Runtime imports
 try:
-    from core.models import CourseGroup, Schedule
+    from core.models import Course, CourseGroup, Schedule
 except ImportError as e:
     raise ImportError(f"Required module core.models not found: {e}")
 
@@ -25,6 +33,12 @@ from .base_scheduler import BaseScheduler
 
 
 AlgorithmSpec = Union[str, Type[BaseScheduler]]
+# (mandatory codes, optional codes) of one selection
+Variant = Tuple[Iterable[str], Optional[Iterable[str]]]
+
+# Per-process variant context installed by the pool initializer so that the
+# catalog is pickled once per worker instead of once per variant.
+_WORKER_CONTEXT: Dict[str, object] = {}
 
 
 def _execute_algorithm(
@@ -92,14 +106,15 @@ def run_algorithms_parallel(
         **shared_kwargs: Additional arguments passed to schedulers
 
     Returns:
-        Dictionary mapping algorithm names to (scheduler, best_schedule) tuples
+        Dictionary mapping algorithm names to (scheduler, best_schedule) tuples;
+        identical best schedules are the same object
     """
     optional_set = set(optional_codes or [])
     mandatory_set = set(mandatory_codes)
     futures = {}
 
     # Choose executor based on use_multiprocessing flag
-    executor_class = ProcessPoolExecutor if use_multiprocessing else __import__('concurrent.futures').futures.ThreadPoolExecutor
+    executor_class = ProcessPoolExecutor if use_multiprocessing else ThreadPoolExecutor
 
     with executor_class(max_workers=max_workers) as executor:
         for spec in algorithms:
@@ -147,9 +162,145 @@ def run_algorithms_parallel(
 
             results[name] = (scheduler, best_schedule)
 
+    # Algorithms that found the same schedule share one object, so callers
+    # can compare, score and render it once
+    shared: Dict[int, Schedule] = {}
+    for name, (scheduler, best_schedule) in results.items():
+        if best_schedule is not None:
+            best_schedule = shared.setdefault(best_schedule.identity, best_schedule)
+            results[name] = (scheduler, best_schedule)
+
     return results
 
 
+def _execute_variant(
+    scheduler_cls: Type[BaseScheduler],
+    course_groups: Dict[str, CourseGroup],
+    valid_selections: Dict[str, List[List[Course]]],
+    mandatory_codes: FrozenSet[str],
+    optional_codes: FrozenSet[str],
+    prefs: Optional[SchedulerPrefs],
+    shared_kwargs: dict,
+) -> Tuple[BaseScheduler, List[Schedule]]:
+    """Solve one selection variant; picklable for ProcessPoolExecutor."""
+    scheduler = scheduler_cls(scheduler_prefs=prefs, **shared_kwargs)
+    try:
+        schedules = scheduler.generate_schedules(
+            course_groups,
+            set(mandatory_codes),
+            set(optional_codes),
+            valid_selections=valid_selections,
+        )
+    except Exception:  # pragma: no cover - defensive guard
+        schedules = []
+    return scheduler, schedules
+
+
+def _init_variant_worker(
+    scheduler_cls: Type[BaseScheduler],
+    course_groups: Dict[str, CourseGroup],
+    prefs: Optional[SchedulerPrefs],
+    shared_kwargs: dict,
+) -> None:
+    _WORKER_CONTEXT["scheduler_cls"] = scheduler_cls
+    _WORKER_CONTEXT["course_groups"] = course_groups
+    _WORKER_CONTEXT["valid_selections"] = scheduler_cls.build_valid_selections(course_groups)
+    _WORKER_CONTEXT["prefs"] = prefs
+    _WORKER_CONTEXT["shared_kwargs"] = shared_kwargs
+
+
+def _worker_variant(
+    mandatory_codes: FrozenSet[str], optional_codes: FrozenSet[str]
+) -> Tuple[BaseScheduler, List[Schedule]]:
+    """Pool entry point; solves one variant using the installed worker context."""
+    return _execute_variant(
+        _WORKER_CONTEXT["scheduler_cls"],  # type: ignore[arg-type]
+        _WORKER_CONTEXT["course_groups"],  # type: ignore[arg-type]
+        _WORKER_CONTEXT["valid_selections"],  # type: ignore[arg-type]
+        mandatory_codes,
+        optional_codes,
+        _WORKER_CONTEXT["prefs"],  # type: ignore[arg-type]
+        _WORKER_CONTEXT["shared_kwargs"],  # type: ignore[arg-type]
+    )
+
+
+def run_variants_parallel(
+    algorithm: AlgorithmSpec,
+    course_groups: Dict[str, CourseGroup],
+    variants: Sequence[Variant],
+    prefs: Optional[SchedulerPrefs] = None,
+    max_workers: int = 4,
+    use_multiprocessing: bool = True,
+    **shared_kwargs,
+) -> List[Tuple[BaseScheduler, List[Schedule]]]:
+    """
+    Solve several (mandatory, optional) selections of one catalog concurrently.
+
+    The section combinations of every group are built once per worker: with
+    threads they are built here and shared, with processes each worker
+    receives the catalog once through the pool initializer and builds them
+    itself, so nothing but the selection codes is pickled per variant. Each
+    variant prepares its own search. Variants that only differ in order or in
+    optional codes that are also mandatory are solved once. Infeasible
+    variants return in milliseconds through the scheduler's feasibility
+    pre-check. With threads, the variants share the process-wide course IDs
+    behind ``Schedule.identity``, which are assigned under a lock.
+
+    Args:
+        algorithm: Algorithm specification (name or class)
+        course_groups: Course groups shared by all variants
+        variants: (mandatory codes, optional codes) per variant
+        prefs: Scheduler preferences
+        max_workers: Maximum number of parallel workers
+        use_multiprocessing: If True, uses ProcessPoolExecutor for true parallelism.
+                           If False, uses ThreadPoolExecutor (for debugging).
+        **shared_kwargs: Additional arguments passed to the schedulers
+
+    Returns:
+        (scheduler, schedules) per variant, in the order of ``variants``
+    """
+    scheduler_cls = _resolve(algorithm)
+
+    keys: List[Tuple[FrozenSet[str], FrozenSet[str]]] = []
+    for mandatory_codes, optional_codes in variants:
+        mandatory = frozenset(mandatory_codes)
+        keys.append((mandatory, frozenset(optional_codes or ()) - mandatory))
+    distinct = list(dict.fromkeys(keys))
+
+    solved: Dict[Tuple[FrozenSet[str], FrozenSet[str]], Tuple[BaseScheduler, List[Schedule]]] = {}
+    if use_multiprocessing:
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_variant_worker,
+            initargs=(scheduler_cls, course_groups, prefs, shared_kwargs),
+        )
+    else:
+        valid_selections = scheduler_cls.build_valid_selections(course_groups)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    with executor:
+        futures = {}
+        for mandatory, optional in distinct:
+            if use_multiprocessing:
+                future = executor.submit(_worker_variant, mandatory, optional)
+            else:
+                future = executor.submit(
+                    _execute_variant,
+                    scheduler_cls,
+                    course_groups,
+                    valid_selections,
+                    mandatory,
+                    optional,
+                    prefs,
+                    shared_kwargs,
+                )
+            futures[future] = (mandatory, optional)
+        for future in as_completed(futures):
+            solved[futures[future]] = future.result()
+
+    return [solved[key] for key in keys]
+
+
 def _resolve(spec: AlgorithmSpec) -> Type[BaseScheduler]:
     if isinstance(spec, str):
         cls = get_registered_scheduler(spec)
@@ -159,4 +310,4 @@ def _resolve(spec: AlgorithmSpec) -> Type[BaseScheduler]:
     return spec
 
 
-__all__ = ["run_algorithms_parallel"]
+__all__ = ["run_algorithms_parallel", "run_variants_parallel"]
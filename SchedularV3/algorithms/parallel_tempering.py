@@ -0,0 +1,393 @@
+"""Parallel tempering (replica exchange) simulated annealing scheduler.
+
+Several annealing chains ("replicas") run at fixed temperatures spread along a
+geometric ladder. Each replica performs the same single-group moves as
+``AnnealingOptimizer`` for a short epoch, after which neighbouring replicas
+may swap states according to the Metropolis exchange criterion. Hot replicas
+explore freely while cold replicas refine the best states they receive.
+
+Replicas advance independently within an epoch, so epochs are fanned out over
+a process pool and search quality scales with the number of available cores.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+import logging
+import math
+import os
+import random
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+if TYPE_CHECKING:
+    from core.models import Course, Schedule
+    from utils.schedule_metrics import SchedulerPrefs
+
+# Runtime imports
+try:
+    from core.models import Course, Schedule
+except ImportError as e:
+    raise ImportError(f"Required module core.models not found: {e}")
+
+try:
+    from utils.schedule_metrics import SchedulerPrefs
+except ImportError as e:
+    raise ImportError(f"Required module utils.schedule_metrics not found: {e}")
+
+from . import register_scheduler
+from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
+from .simulated_annealing import AnnealingOptimizer
+
+logger = logging.getLogger(__name__)
+
+GroupOptions = Dict[str, List[Optional[List[Course]]]]
+
+
+@dataclass
+class ReplicaState:
+    """Current and best-seen state of a single tempering replica."""
+
+    courses: List[Course]
+    fitness: float
+    best_courses: List[Course]
+    best_fitness: float
+
+
+# Per-process search context installed by the pool initializer so that the
+# course catalogue is pickled once per worker instead of once per epoch.
+_WORKER_CONTEXT: Dict[str, object] = {}
+
+
+def _init_worker(
+    optimizer: AnnealingOptimizer,
+    group_keys: List[str],
+    group_options: GroupOptions,
+) -> None:
+    _WORKER_CONTEXT["optimizer"] = optimizer
+    _WORKER_CONTEXT["group_keys"] = group_keys
+    _WORKER_CONTEXT["group_options"] = group_options
+
+
+def _worker_epoch(
+    state: ReplicaState, temperature: float, steps: int, seed: int
+) -> ReplicaState:
+    """Pool entry point; runs one epoch using the installed worker context."""
+    return anneal_replica(
+        _WORKER_CONTEXT["optimizer"],  # type: ignore[arg-type]
+        _WORKER_CONTEXT["group_keys"],  # type: ignore[arg-type]
+        _WORKER_CONTEXT["group_options"],  # type: ignore[arg-type]
+        state,
+        temperature,
+        steps,
+        seed,
+    )
+
+
+def anneal_replica(
+    optimizer: AnnealingOptimizer,
+    group_keys: List[str],
+    group_options: GroupOptions,
+    state: ReplicaState,
+    temperature: float,
+    steps: int,
+    seed: int,
+) -> ReplicaState:
+    """
+    Advance one replica for ``steps`` annealing moves at a fixed temperature.
+
+    Args:
+        optimizer: Optimizer providing the fitness function and move step
+        group_keys: List of course group keys (main codes)
+        group_options: Dictionary mapping group keys to possible selections
+        state: Replica state to advance
+        temperature: Constant temperature used for the whole epoch
+        steps: Number of moves to attempt
+        seed: Seed for the move generator of this epoch
+
+    Returns:
+        Updated replica state
+    """
+    optimizer.rng = random.Random(seed)
+    current, current_fitness = state.courses, state.fitness
+    best, best_fitness = state.best_courses, state.best_fitness
+
+    def fitness(sched: List[Course], total: int) -> float:
+        return optimizer._calculate_fitness(sched, total)
+
+    for _ in range(steps):
+        current, current_fitness, best, best_fitness, _ = optimizer._annealing_step(
+            current, current_fitness, best, best_fitness,
+            group_keys, group_options, fitness, temperature,
+        )
+
+    return ReplicaState(current, current_fitness, best, best_fitness)
+
+
+class ParallelTemperingOptimizer:
+    """
+    Replica exchange Monte Carlo built on top of ``AnnealingOptimizer`` moves.
+
+    The optimizer keeps ``replicas`` chains on a geometric temperature ladder
+    between ``t_max`` and ``t_min``. After every epoch of ``swap_interval``
+    moves, adjacent replicas (alternating even/odd pairs) exchange states with
+    probability ``min(1, exp((E_i - E_j) * (1/T_i - 1/T_j)))``.
+    """
+
+    def __init__(
+        self,
+        replicas: int = 4,
+        t_min: float = 1.0,
+        t_max: float = 100.0,
+        swap_interval: int = 25,
+        epochs: int = 20,
+        max_ects: int = 31,
+        scheduler_prefs: Optional[SchedulerPrefs] = None,
+        max_workers: Optional[int] = None,
+        use_multiprocessing: bool = True,
+        timeout_seconds: float = 120.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the tempering optimizer.
+
+        Args:
+            replicas: Number of parallel chains
+            t_min: Temperature of the coldest replica
+            t_max: Temperature of the hottest replica
+            swap_interval: Annealing moves per replica between exchange attempts
+            epochs: Number of exchange rounds
+            max_ects: Maximum ECTS credits allowed
+            scheduler_prefs: Advanced scheduler preferences
+            max_workers: Worker processes (defaults to min(replicas, CPU count))
+            use_multiprocessing: Run replicas in a process pool when True
+            timeout_seconds: Wall-clock budget for the whole run
+            seed: Seed for epoch seeds and exchanges (None for fresh entropy)
+        """
+        self.replicas = max(2, replicas)
+        self.t_min = max(1e-3, t_min)
+        self.t_max = max(self.t_min, t_max)
+        self.swap_interval = max(1, swap_interval)
+        self.epochs = max(1, epochs)
+        self.max_workers = max_workers or min(self.replicas, os.cpu_count() or 1)
+        self.use_multiprocessing = use_multiprocessing
+        self.timeout_seconds = timeout_seconds
+        self.annealer = AnnealingOptimizer(max_ects=max_ects, scheduler_prefs=scheduler_prefs)
+        self.rng = random.Random(seed)
+        self.stats: Dict[str, float] = {}
+
+    def temperature_ladder(self) -> List[float]:
+        """Return replica temperatures from coldest to hottest."""
+        ratio = self.t_max / self.t_min
+        steps = self.replicas - 1
+        return [self.t_min * ratio ** (index / steps) for index in range(self.replicas)]
+
+    def optimize(
+        self,
+        schedule: Schedule,
+        group_keys: List[str],
+        group_options: GroupOptions,
+    ) -> List[Schedule]:
+        """
+        Run replica exchange starting every chain from ``schedule``.
+
+        Args:
+            schedule: Initial schedule shared by all replicas
+            group_keys: List of course group keys (main codes)
+            group_options: Dictionary mapping group keys to possible selections
+
+        Returns:
+            Best schedule of every replica, best first
+        """
+        temperatures = self.temperature_ladder()
+        courses = schedule.courses.copy()
+        fitness = self.annealer._calculate_fitness(courses, sum(c.ects for c in courses))
+        states = [
+            ReplicaState(courses.copy(), fitness, courses.copy(), fitness)
+            for _ in temperatures
+        ]
+
+        self.stats = {"epochs": 0, "swap_attempts": 0, "swaps_accepted": 0}
+        if not group_keys:
+            return [Schedule(courses)]
+
+        start = time.time()
+        executor = self._create_executor(group_keys, group_options)
+        try:
+            for epoch in range(self.epochs):
+                if time.time() - start >= self.timeout_seconds:
+                    self.stats["timeout_reached"] = True
+                    break
+
+                seeds = [self.rng.randrange(2**31) for _ in states]
+                states = self._run_epoch(
+                    executor, states, temperatures, seeds, group_keys, group_options
+                )
+                self._exchange(states, temperatures, parity=epoch % 2)
+                self.stats["epochs"] += 1
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        ranked = sorted(states, key=lambda state: state.best_fitness)
+        return [Schedule(state.best_courses) for state in ranked]
+
+    def _create_executor(
+        self, group_keys: List[str], group_options: GroupOptions
+    ) -> Optional[Executor]:
+        if not self.use_multiprocessing or self.max_workers <= 1:
+            return None
+        try:
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.annealer, group_keys, group_options),
+            )
+        except (OSError, ValueError) as exc:  # pragma: no cover - platform dependent
+            logger.warning("Falling back to serial tempering: %s", exc)
+            return None
+
+    def _run_epoch(
+        self,
+        executor: Optional[Executor],
+        states: List[ReplicaState],
+        temperatures: List[float],
+        seeds: List[int],
+        group_keys: List[str],
+        group_options: GroupOptions,
+    ) -> List[ReplicaState]:
+        if executor is None:
+            return [
+                anneal_replica(
+                    self.annealer, group_keys, group_options,
+                    state, temperature, self.swap_interval, seed,
+                )
+                for state, temperature, seed in zip(states, temperatures, seeds)
+            ]
+
+        futures = [
+            executor.submit(_worker_epoch, state, temperature, self.swap_interval, seed)
+            for state, temperature, seed in zip(states, temperatures, seeds)
+        ]
+        return [future.result() for future in futures]
+
+    def _exchange(
+        self, states: List[ReplicaState], temperatures: List[float], parity: int
+    ) -> None:
+        """Attempt Metropolis swaps between adjacent replicas in place."""
+        for index in range(parity, len(states) - 1, 2):
+            self.stats["swap_attempts"] += 1
+            cold, hot = states[index], states[index + 1]
+            delta = (cold.fitness - hot.fitness) * (
+                1.0 / temperatures[index] - 1.0 / temperatures[index + 1]
+            )
+            if delta >= 0 or self.rng.random() < math.exp(delta):
+                cold.courses, hot.courses = hot.courses, cold.courses
+                cold.fitness, hot.fitness = hot.fitness, cold.fitness
+                self.stats["swaps_accepted"] += 1
+
+
+@register_scheduler
+class ParallelTemperingScheduler(BaseScheduler):
+    """Replica exchange annealing spread across worker processes."""
+
+    metadata = AlgorithmMetadata(
+        name="ParallelTempering",
+        category="local-search",
+        complexity="O(replicas * epochs * swap_interval)",
+        description="Parallel tempering (replica exchange) simulated annealing",
+        optimal=False,
+        supports_preferences=True,
+        supports_parallel=True,
+        is_optimizer=True,
+    )
+
+    def __init__(
+        self,
+        max_results: int = 5,
+        max_ects: int = 31,
+        allow_conflicts: bool = False,
+        max_conflicts: int = 1,
+        scheduler_prefs: Optional[SchedulerPrefs] = None,
+        timeout_seconds: int = 180,
+        replicas: int = 4,
+        t_min: float = 1.0,
+        t_max: float = 100.0,
+        swap_interval: int = 25,
+        epochs: int = 20,
+        max_workers: Optional[int] = None,
+        use_multiprocessing: bool = True,
+        seed: Optional[int] = None,
+        min_ects: int = 0,
+    ) -> None:
+        super().__init__(
+            max_results=max_results,
+            max_ects=max_ects,
+            min_ects=min_ects,
+            allow_conflicts=allow_conflicts,
+            max_conflicts=max_conflicts,
+            scheduler_prefs=scheduler_prefs,
+            timeout_seconds=timeout_seconds,
+            seed=seed,
+        )
+        self.replicas = replicas
+        self.t_min = t_min
+        self.t_max = t_max
+        self.swap_interval = swap_interval
+        self.epochs = epochs
+        self.max_workers = max_workers
+        self.use_multiprocessing = use_multiprocessing
+
+    def _run_algorithm(self, search: PreparedSearch) -> List[Schedule]:
+        initial_schedule = self._initial_schedule(search)
+        if initial_schedule is None:
+            return []
+
+        optimizer = ParallelTemperingOptimizer(
+            replicas=self.replicas,
+            t_min=self.t_min,
+            t_max=self.t_max,
+            swap_interval=self.swap_interval,
+            epochs=self.epochs,
+            max_ects=self.max_ects,
+            scheduler_prefs=self.scheduler_prefs,
+            max_workers=self.max_workers,
+            use_multiprocessing=self.use_multiprocessing,
+            timeout_seconds=self.timeout_seconds,
+            seed=self._spawn_seeds(1)[0],
+        )
+        candidates = optimizer.optimize(initial_schedule, search.group_keys, search.group_options)
+        self._last_run_stats.update(optimizer.stats)
+        self._last_run_stats["nodes_explored"] = (
+            optimizer.stats.get("epochs", 0) * optimizer.replicas * optimizer.swap_interval
+        )
+
+        results: List[Schedule] = []
+        seen: Set[frozenset] = set()
+        for schedule in candidates + [initial_schedule]:
+            signature = frozenset(course.code for course in schedule.courses)
+            if signature in seen or not self._is_valid_final_schedule(schedule):
+                continue
+            seen.add(signature)
+            results.append(schedule)
+        return results
+
+    def _initial_schedule(self, search: PreparedSearch) -> Optional[Schedule]:
+        courses: List[Course] = []
+        for group_key in search.group_keys:
+            for option in search.group_options.get(group_key, []):
+                if option is None:
+                    continue
+                if self._is_valid_partial_selection(courses + option):
+                    courses.extend(option)
+                    break
+
+        if not courses:
+            return None
+
+        schedule = Schedule(courses)
+        return schedule if self._is_valid_final_schedule(schedule) else None
+
+
+__all__ = ["ParallelTemperingOptimizer", "ParallelTemperingScheduler", "ReplicaState"]
@@ -1,10 +1,18 @@
-"""Particle swarm optimisation for schedule generation."""
+"""Particle swarm optimisation for schedule generation.
+
+The swarm is held as an integer array of shape ``(swarm_size, groups)`` where
+each entry is an option index into ``OptionTable``. Position updates are
+vectorized with numpy, and every iteration decodes and scores each distinct
+position once; scores are cached by position vector because particles keep
+landing on the same combinations as the swarm converges.
+"""
 
 from __future__ import annotations
 
-import random
 from typing import TYPE_CHECKING, Dict, List, Optional
 
+import numpy as np
+
 if TYPE_CHECKING:
     from core.models import Course, Schedule
     from utils.schedule_metrics import SchedulerPrefs
@@ -16,22 +24,13 @@ except ImportError as e:
     raise ImportError(f"Required module core.models not found: {e}")
 
 try:
-    from utils.schedule_metrics import SchedulerPrefs, score_schedule
+    from utils.schedule_metrics import SchedulerPrefs
 except ImportError as e:
     raise ImportError(f"Required module utils.schedule_metrics not found: {e}")
 
 from . import register_scheduler
 from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
-from .heuristics import estimate_conflict_penalty
-
-
-class Particle:
-    """Represents a single particle in the PSO swarm."""
-
-    def __init__(self, position: Dict[str, int]):
-        self.position = position
-        self.best_position = position.copy()
-        self.best_cost = float("inf")
+from .incremental import IncrementalScorer, OptionTable
 
 
 @register_scheduler
@@ -62,14 +61,18 @@ class ParticleSwarmScheduler(BaseScheduler):
         inertia: float = 0.4,
         social: float = 0.4,
         cognitive: float = 0.4,
+        seed: Optional[int] = None,
+        min_ects: int = 0,
     ) -> None:
         super().__init__(
             max_results=max_results,
             max_ects=max_ects,
+            min_ects=min_ects,
             allow_conflicts=allow_conflicts,
             max_conflicts=max_conflicts,
             scheduler_prefs=scheduler_prefs,
             timeout_seconds=timeout_seconds,
+            seed=seed,
         )
         self.swarm_size = max(5, swarm_size)
         self.iterations = max(10, iterations)
@@ -78,131 +81,141 @@ class ParticleSwarmScheduler(BaseScheduler):
         self.cognitive = cognitive
 
     def _run_algorithm(self, search: PreparedSearch) -> List[Schedule]:
-        options_map: Dict[str, List[Optional[List[Course]]]] = {
-            key: search.group_options.get(key, []) for key in search.group_keys
-        }
-
-        index_map: Dict[str, List[Optional[List[Course]]]] = {
-            key: options for key, options in options_map.items() if options
-        }
-
-        if not index_map:
+        table = OptionTable(search)
+        keys = [key for key in table.group_keys if table.options[key]]
+        if not keys:
             return []
 
-        particles = [self._create_particle(index_map, search) for _ in range(self.swarm_size)]
-        global_best_position = particles[0].position.copy()
-        global_best_cost = float("inf")
-        global_best_schedule: Optional[Schedule] = None
+        rng = self._numpy_rng()
+        # Mandatory groups never have a ``None`` option, so every index is admissible
+        counts = np.array([len(table.options[key]) for key in keys], dtype=np.int64)
 
-        for _ in range(self.iterations):
-            self._evaluate_particles(particles, index_map, global_best_position)
-            global_best_position, global_best_cost, global_best_schedule = self._update_global_best(
-                particles, global_best_position, global_best_cost, global_best_schedule, index_map
-            )
-            self._update_particles(particles, index_map, global_best_position)
+        positions = self._random_positions(rng, counts, self.swarm_size)
+        best_positions = positions.copy()
+        best_costs = np.full(self.swarm_size, np.inf)
+        global_best_position = positions[0].copy()
+        global_best_cost = np.inf
 
-        return [global_best_schedule] if global_best_schedule else []
+        cache: Dict[bytes, float] = {}
+        self._last_run_stats["cache_hits"] = 0
 
-    def _evaluate_particles(
-        self,
-        particles: List[Particle],
-        index_map: Dict[str, List[Optional[List[Course]]]],
-        global_best_position: Dict[str, int],
-    ) -> None:
-        """Evaluate all particles and update their best positions."""
-        for particle in particles:
-            schedule = self._decode(particle.position, index_map)
-            if schedule is None:
-                continue
-
-            cost = self._fitness(schedule)
-            self._last_run_stats["nodes_explored"] += 1
+        for _ in range(self.iterations):
+            costs = self._evaluate_positions(positions, table, keys, search, cache)
 
-            if cost < particle.best_cost and self._is_valid_final_schedule(schedule):
-                particle.best_cost = cost
-                particle.best_position = particle.position.copy()
+            improved = costs < best_costs
+            best_costs[improved] = costs[improved]
+            best_positions[improved] = positions[improved]
 
-    def _update_global_best(
-        self,
-        particles: List[Particle],
-        global_best_position: Dict[str, int],
-        global_best_cost: float,
-        global_best_schedule: Optional[Schedule],
-        index_map: Dict[str, List[Optional[List[Course]]]],
-    ) -> tuple:
-        """Update global best position and schedule."""
-        for particle in particles:
-            schedule = self._decode(particle.position, index_map)
-            if schedule is None:
-                continue
+            leader = int(np.argmin(best_costs))
+            if best_costs[leader] < global_best_cost:
+                global_best_cost = float(best_costs[leader])
+                global_best_position = best_positions[leader].copy()
 
-            cost = self._fitness(schedule)
-            if cost < global_best_cost and self._is_valid_final_schedule(schedule):
-                global_best_cost = cost
-                global_best_position = particle.position.copy()
-                global_best_schedule = schedule
+            positions = self._update_positions(
+                rng, positions, best_positions, global_best_position, counts
+            )
 
-        return global_best_position, global_best_cost, global_best_schedule
+        if not np.isfinite(global_best_cost):
+            return []
+        self._last_run_stats["best_cost"] = global_best_cost
+        return [table.to_schedule(dict(zip(keys, global_best_position.tolist())))]
 
-    def _update_particles(
-        self,
-        particles: List[Particle],
-        index_map: Dict[str, List[Optional[List[Course]]]],
-        global_best_position: Dict[str, int],
-    ) -> None:
-        """Update particle velocities and positions."""
-        for particle in particles:
-            for key, options in index_map.items():
-                if not options:
-                    continue
-
-                rand = random.random()
-                if rand < self.cognitive and key in particle.best_position:
-                    particle.position[key] = particle.best_position[key]
-                elif rand < self.cognitive + self.social and key in global_best_position:
-                    particle.position[key] = global_best_position[key]
-                elif rand > self.inertia:
-                    particle.position[key] = random.randrange(len(options))
-
-    def _create_particle(
+    def _evaluate_positions(
         self,
-        index_map: Dict[str, List[Optional[List[Course]]]],
+        positions: np.ndarray,
+        table: OptionTable,
+        keys: List[str],
         search: PreparedSearch,
-    ) -> Particle:
-        position: Dict[str, int] = {}
-        for key, options in index_map.items():
-            if key in search.mandatory_codes:
-                valid_indices = [idx for idx, opt in enumerate(options) if opt is not None]
-                position[key] = random.choice(valid_indices or [0])
+        cache: Dict[bytes, float],
+    ) -> np.ndarray:
+        """
+        Score every particle, decoding each distinct position at most once.
+
+        Infeasible positions score ``inf`` so they never become a best position.
+        """
+        unique, inverse = np.unique(positions, axis=0, return_inverse=True)
+        unique_costs = np.empty(len(unique))
+        for row, position in enumerate(unique):
+            signature = position.tobytes()
+            cost = cache.get(signature)
+            if cost is None:
+                cost = self._decode_cost(position, table, keys, search)
+                cache[signature] = cost
+                self._last_run_stats["nodes_explored"] += 1
             else:
-                position[key] = random.randrange(len(options))
-        return Particle(position)
+                self._last_run_stats["cache_hits"] += 1
+            unique_costs[row] = cost
+        return unique_costs[inverse.reshape(-1)]
 
-    def _decode(
+    def _decode_cost(
         self,
-        position: Dict[str, int],
-        index_map: Dict[str, List[Optional[List[Course]]]],
-    ) -> Optional[Schedule]:
-        courses: List[Course] = []
-        for key, index in position.items():
-            options = index_map.get(key)
-            if not options:
+        position: np.ndarray,
+        table: OptionTable,
+        keys: List[str],
+        search: PreparedSearch,
+    ) -> float:
+        """Cost of a position vector, or ``inf`` if it violates a hard constraint."""
+        # Cheap ECTS / occupancy-mask pass first; most random positions fail here
+        options = []
+        occupied = ects = 0
+        for key, index in zip(keys, position.tolist()):
+            option = table.get(key, index)
+            if option is None:
+                if key in search.mandatory_codes:
+                    return np.inf
                 continue
-            index = max(0, min(index, len(options) - 1))
-            option = options[index]
-            if option:
-                tentative = courses + option
-                if not self._is_valid_partial_selection(tentative):
-                    return None
-                courses.extend(option)
-        if not courses:
-            return None
-        return Schedule(courses)
-
-    def _fitness(self, schedule: Schedule) -> float:
-        if self.scheduler_prefs:
-            return -score_schedule(schedule, self.scheduler_prefs)
-        return estimate_conflict_penalty(schedule)
+            ects += option.ects
+            if ects > self.max_ects:
+                return np.inf
+            if not self.allow_conflicts and option.mask & occupied:
+                return np.inf
+            occupied |= option.mask
+            options.append(option)
+
+        if not options:
+            return np.inf
+
+        scorer = IncrementalScorer(self.scheduler_prefs)
+        for option in options:
+            scorer.add(option)
+        if not self._is_admissible_state(
+            scorer.conflicts, scorer.total_ects, scorer.violates_strict_free_days(), complete=True
+        ):
+            return np.inf
+        return scorer.cost()
+
+    def _random_positions(
+        self, rng: np.random.Generator, counts: np.ndarray, rows: int
+    ) -> np.ndarray:
+        """Draw uniform option indices in ``[0, counts)`` for every group."""
+        return np.floor(rng.random((rows, len(counts))) * counts).astype(np.int64)
+
+    def _update_positions(
+        self,
+        rng: np.random.Generator,
+        positions: np.ndarray,
+        best_positions: np.ndarray,
+        global_best_position: np.ndarray,
+        counts: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Discrete velocity update applied to the whole swarm at once.
+
+        Each coordinate copies the personal best with probability ``cognitive``,
+        otherwise the global best with probability ``social``, otherwise keeps
+        its value (inertia) or jumps to a random option.
+        """
+        draw = rng.random(positions.shape)
+        cognitive = draw < self.cognitive
+        social = ~cognitive & (draw < self.cognitive + self.social)
+        jump = ~cognitive & ~social & (draw > self.inertia)
+
+        updated = np.where(cognitive, best_positions, positions)
+        updated = np.where(social, global_best_position, updated)
+        if jump.any():
+            random_positions = self._random_positions(rng, counts, len(positions))
+            updated = np.where(jump, random_positions, updated)
+        return updated
 
 
 __all__ = ["ParticleSwarmScheduler"]
@@ -6,6 +6,7 @@ course schedules by minimizing conflicts and maximizing credits.
 """
 import random
 import math
+import time
 from typing import List, Dict, Optional
 from core.models import Course, Schedule
 from utils.schedule_metrics import (
@@ -31,7 +32,8 @@ class AnnealingOptimizer:
                  max_ects: int = 31,
                  scheduler_prefs: Optional[SchedulerPrefs] = None,
                  enable_reheating: bool = True,
-                 stagnation_threshold: int = 50):
+                 stagnation_threshold: int = 50,
+                 seed: Optional[int] = None):
         """
         Initialize the annealing optimizer.
 
@@ -43,6 +45,7 @@ class AnnealingOptimizer:
             scheduler_prefs: Advanced scheduler preferences
             enable_reheating: Enable reheating when stuck
             stagnation_threshold: Number of iterations without improvement before reheating
+            seed: Seed of the private move generator (``rng``); None for fresh entropy
         """
         self.temp0 = temp0
         self.alpha = alpha
@@ -51,11 +54,13 @@ class AnnealingOptimizer:
         self.scheduler_prefs = scheduler_prefs or SchedulerPrefs()
         self.enable_reheating = enable_reheating
         self.stagnation_threshold = stagnation_threshold
+        self.rng = random.Random(seed)
 
     def optimize(self,
                  schedule: Schedule,
                  group_keys: List[str],
-                 group_options: Dict[str, List[Optional[List[Course]]]]) -> Schedule:
+                 group_options: Dict[str, List[Optional[List[Course]]]],
+                 time_budget: Optional[float] = None) -> Schedule:
         """
         Optimize a schedule using simulated annealing.
 
@@ -63,11 +68,14 @@ class AnnealingOptimizer:
             schedule: Initial schedule to optimize
             group_keys: List of course group keys (main codes)
             group_options: Dictionary mapping group keys to lists of possible course selections
+            time_budget: Optional wall-clock limit in seconds; the best schedule
+                found so far is returned when it runs out
 
         Returns:
             Optimized schedule
         """
         current_schedule = schedule.courses.copy()
+        deadline = time.time() + time_budget if time_budget is not None else None
 
         def fitness(sched: List[Course], total: int) -> float:
             """
@@ -92,6 +100,8 @@ class AnnealingOptimizer:
         for _ in range(self.iterations):
             if not group_keys:
                 break
+            if deadline is not None and time.time() >= deadline:
+                break
 
             current_schedule, current_fitness, best_schedule, best_fitness, improved = self._annealing_step(
                 current_schedule, current_fitness, best_schedule, best_fitness,
@@ -179,10 +189,7 @@ class AnnealingOptimizer:
             Tuple of (current_schedule, current_fitness, best_schedule, best_fitness, improved)
             where improved is True if best_fitness was improved
         """
-        import random
-        import math
-
-        group = random.choice(group_keys)
+        group = self.rng.choice(group_keys)
         valid_options = group_options.get(group, [])
 
         if len(valid_options) <= 1:
@@ -194,7 +201,7 @@ class AnnealingOptimizer:
         if not non_none_options:
             return current_schedule, current_fitness, best_schedule, best_fitness, False
 
-        new_option = random.choice(non_none_options)
+        new_option = self.rng.choice(non_none_options)
         new_schedule.extend(new_option)
 
         new_total = sum(c.ects for c in new_schedule)
@@ -203,7 +210,7 @@ class AnnealingOptimizer:
         delta = new_fitness - current_fitness
         improved = False
 
-        if delta < 0 or random.random() < math.exp(-delta / temperature):
+        if delta < 0 or self.rng.random() < math.exp(-delta / temperature):
             current_schedule = new_schedule
             current_fitness = new_fitness
 
@@ -437,7 +444,7 @@ class AnnealingOptimizer:
             temperature: float,
     ) -> tuple:
         """Perform one multi-objective annealing step."""
-        group = random.choice(group_keys)
+        group = self.rng.choice(group_keys)
         valid_options = group_options.get(group, [])
 
         if len(valid_options) <= 1:
@@ -449,13 +456,13 @@ class AnnealingOptimizer:
         if not non_none_options:
             return current_schedule, current_fitness, best_schedule, best_fitness
 
-        new_option = random.choice(non_none_options)
+        new_option = self.rng.choice(non_none_options)
         new_schedule.extend(new_option)
 
         new_fitness = fitness_fn(new_schedule)
 
         delta = new_fitness - current_fitness
-        if delta < 0 or random.random() < math.exp(-delta / temperature):
+        if delta < 0 or self.rng.random() < math.exp(-delta / temperature):
             current_schedule = new_schedule
             current_fitness = new_fitness
 
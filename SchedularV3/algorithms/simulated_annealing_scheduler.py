@@ -46,20 +46,28 @@ class SimulatedAnnealingScheduler(BaseScheduler):
         timeout_seconds: int = 180,
         iterations: int = 500,
         annealing_iterations: Optional[int] = None,  # Eski parametre için backward compatibility
+        temperature: float = 100.0,
+        cooling_rate: float = 0.95,
+        seed: Optional[int] = None,
+        min_ects: int = 0,
     ) -> None:
         super().__init__(
             max_results=max_results,
             max_ects=max_ects,
+            min_ects=min_ects,
             allow_conflicts=allow_conflicts,
             max_conflicts=max_conflicts,
             scheduler_prefs=scheduler_prefs,
             timeout_seconds=timeout_seconds,
+            seed=seed,
         )
         # annealing_iterations parametresi verilmişse onu kullan
         if annealing_iterations is not None:
             self.annealing_iterations = annealing_iterations
         else:
             self.annealing_iterations = iterations
+        self.temperature = temperature
+        self.cooling_rate = cooling_rate
 
     def _run_algorithm(self, search: PreparedSearch) -> List[Schedule]:
         initial_schedule = self._initial_schedule(search)
@@ -67,9 +75,12 @@ class SimulatedAnnealingScheduler(BaseScheduler):
             return []
 
         optimizer = AnnealingOptimizer(
+            temp0=self.temperature,
+            alpha=self.cooling_rate,
             iterations=self.annealing_iterations,
             max_ects=self.max_ects,
             scheduler_prefs=self.scheduler_prefs,
+            seed=self._spawn_seeds(1)[0],
         )
 
         optimized = optimizer.optimize(initial_schedule, search.group_keys, search.group_options)
@@ -0,0 +1,179 @@
+"""Exact counting and uniform sampling of valid schedules.
+
+Groups are processed in search order and the number of valid completions of
+a partial selection only depends on ``(depth, occupied slots, conflict
+slots, ECTS)``. Memoising that count gives the size of the whole solution
+space without enumerating it, and walking the same table top-down with
+probabilities proportional to the child counts draws valid schedules
+uniformly at random.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .base_scheduler import BaseScheduler, PreparedSearch
+
+from .incremental import ALL_DAYS, Assignment, EncodedOption, OptionTable
+
+
+# (depth, occupied mask, conflict mask, ects)
+StateKey = Tuple[int, int, int, int]
+
+
+class StateBudgetExceeded(RuntimeError):
+    """Raised when the memo table would grow beyond ``max_states``."""
+
+
+class SolutionSpace:
+    """Memoised count of the valid completions of every reachable state."""
+
+    def __init__(
+        self,
+        table: OptionTable,
+        max_ects: int,
+        allow_conflicts: bool = False,
+        max_conflicts: int = 1,
+        forbidden_mask: int = 0,
+        max_states: int = 2_000_000,
+        min_ects: int = 0,
+    ) -> None:
+        self.table = table
+        self.min_ects = min_ects
+        self.max_ects = max_ects
+        self.max_conflicts = max_conflicts if allow_conflicts else 0
+        self.forbidden_mask = forbidden_mask
+        self.max_states = max_states
+        self._options = [table.options[group] for group in table.group_keys]
+        self._memo: Dict[StateKey, int] = {}
+
+    @classmethod
+    def from_search(
+        cls, scheduler: BaseScheduler, search: PreparedSearch, max_states: int = 2_000_000
+    ) -> SolutionSpace:
+        """Build the space for ``search`` under the hard constraints of ``scheduler``."""
+        table = OptionTable(search)
+        forbidden_mask = 0
+        prefs = scheduler.scheduler_prefs
+        if prefs and prefs.strict_free_days and prefs.desired_free_days:
+            if any(day not in ALL_DAYS for day in prefs.desired_free_days):
+                # ``meets_free_day_constraint`` rejects every schedule
+                forbidden_mask = -1
+            else:
+                days = set(prefs.desired_free_days)
+                for (day, _), bit in table.slot_bits.items():
+                    if day in days:
+                        forbidden_mask |= 1 << bit
+        return cls(
+            table,
+            max_ects=scheduler.max_ects,
+            min_ects=scheduler.min_ects,
+            allow_conflicts=scheduler.allow_conflicts,
+            max_conflicts=scheduler.max_conflicts,
+            forbidden_mask=forbidden_mask,
+            max_states=max_states,
+        )
+
+    @property
+    def states(self) -> int:
+        return len(self._memo)
+
+    def count(self) -> int:
+        """
+        Number of valid schedules.
+
+        Raises:
+            StateBudgetExceeded: If counting needs more than ``max_states`` states
+        """
+        total = self._count(0, 0, 0, 0)
+        # The empty selection satisfies the constraints but is not a schedule
+        return total - 1 if self._counts_empty() else total
+
+    def sample(self, rng: Optional[random.Random] = None) -> Optional[Assignment]:
+        """Draw one valid assignment uniformly at random (None if there is none)."""
+        rng = rng or random
+        if self.count() == 0:
+            return None
+
+        skip_empty = self._counts_empty()
+        while True:
+            assignment: Assignment = {}
+            depth = ects = occupied = conflicts = 0
+            for group, options in zip(self.table.group_keys, self._options):
+                children = []
+                for index, option in enumerate(options):
+                    child = self._child(option, ects, occupied, conflicts)
+                    if child is not None:
+                        weight = self._count(depth + 1, *child)
+                        if weight:
+                            children.append((weight, index, child))
+                pick = rng.randrange(sum(weight for weight, _, _ in children))
+                for weight, index, child in children:
+                    if pick < weight:
+                        break
+                    pick -= weight
+                assignment[group] = index
+                ects, occupied, conflicts = child
+                depth += 1
+            # Rejecting the empty selection keeps the draw uniform over the rest
+            if not skip_empty or any(
+                self.table.get(group, index) is not None for group, index in assignment.items()
+            ):
+                return assignment
+
+    def sample_many(self, count: int, rng: Optional[random.Random] = None) -> List[Assignment]:
+        """Independent uniform draws (fewer if the space is empty)."""
+        samples = []
+        for _ in range(count):
+            assignment = self.sample(rng)
+            if assignment is None:
+                break
+            samples.append(assignment)
+        return samples
+
+    def _counts_empty(self) -> bool:
+        """Whether the empty selection is among the counted completions."""
+        return self.min_ects <= 0 and all(None in options for options in self._options)
+
+    def _child(
+        self, option: Optional[EncodedOption], ects: int, occupied: int, conflicts: int
+    ) -> Optional[Tuple[int, int, int]]:
+        """State after adding ``option`` or None if it breaks a hard constraint."""
+        if option is None:
+            return ects, occupied, conflicts
+        if option.mask & self.forbidden_mask:
+            return None
+        ects += option.ects
+        if ects > self.max_ects:
+            return None
+        conflicts |= (occupied & option.mask) | option.overlap_mask
+        if conflicts.bit_count() > self.max_conflicts:
+            return None
+        return ects, occupied | option.mask, conflicts
+
+    def _count(self, depth: int, ects: int, occupied: int, conflicts: int) -> int:
+        if depth == len(self._options):
+            return 1 if ects >= self.min_ects else 0
+
+        key = (depth, occupied, conflicts, ects)
+        total = self._memo.get(key)
+        if total is not None:
+            return total
+
+        if len(self._memo) >= self.max_states:
+            raise StateBudgetExceeded(
+                f"Counting needs more than {self.max_states} memoised states"
+            )
+
+        total = 0
+        for option in self._options[depth]:
+            child = self._child(option, ects, occupied, conflicts)
+            if child is not None:
+                total += self._count(depth + 1, *child)
+        self._memo[key] = total
+        return total
+
+
+__all__ = ["SolutionSpace", "StateBudgetExceeded"]
@@ -0,0 +1,179 @@
+"""Symmetry detection for prepared searches.
+
+Two kinds of symmetry make exhaustive searches revisit equivalent schedules:
+
+- sections: options of one group that meet at exactly the same times with
+  the same ECTS (e.g. the same course taught by two teachers) only differ in
+  who teaches them. All but the first are collapsed away;
+- groups: two groups that are both mandatory or both optional and offer the
+  same multiset of option signatures can swap their choices without changing
+  the timetable. Such groups form a chain and searches only accept
+  assignments whose signature ranks are non-decreasing along it
+  (lexicographic ordering constraints), so each timetable is built once.
+
+``SymmetryInfo.canonical_key`` identifies schedules up to both symmetries
+and is used to drop equivalent results before they reach the top-k.
+Algorithms that do not enforce the ordering constraints gather
+``SymmetryInfo.multiplicity`` times more candidates (capped by
+``SYMMETRY_POOL_CAP``) so that deduplication still leaves ``max_results``.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from core.models import Course, Schedule
+
+# Runtime imports
+try:
+    from core.models import Course, Schedule
+except ImportError as e:
+    raise ImportError(f"Required module core.models not found: {e}")
+
+
+# Largest candidate pool multiplier used to absorb symmetric duplicates
+SYMMETRY_POOL_CAP = 24
+
+# (total ECTS, sorted meeting slots); None for skipping an optional group
+Signature = Optional[Tuple[int, Tuple[Tuple[str, int], ...]]]
+
+
+def option_signature(option: Optional[Iterable[Course]]) -> Signature:
+    """Timetable footprint of an option, ignoring teachers and section codes."""
+    if option is None:
+        return None
+    courses = list(option)
+    slots = tuple(sorted(slot for course in courses for slot in course.schedule))
+    return sum(course.ects for course in courses), slots
+
+
+def _sort_key(signature: Signature) -> tuple:
+    return (0,) if signature is None else (1, signature)
+
+
+class SymmetryInfo:
+    """Interchangeable group chains and the signature rank of every option."""
+
+    def __init__(self) -> None:
+        # group -> previous / next group of its chain (search order)
+        self.predecessors: Dict[str, str] = {}
+        self.successors: Dict[str, str] = {}
+        # group -> signature rank of each option index, shared within a chain
+        self.ranks: Dict[str, List[int]] = {}
+        # group -> chain identifier used by ``canonical_key``
+        self.chain_of: Dict[str, str] = {}
+
+    @property
+    def chains(self) -> int:
+        return len(set(self.chain_of.values()))
+
+    @property
+    def multiplicity(self) -> int:
+        """Most assignments one timetable can have (orderings of every chain)."""
+        lengths: Dict[str, int] = {}
+        for chain in self.chain_of.values():
+            lengths[chain] = lengths.get(chain, 0) + 1
+        return math.prod(math.factorial(length) for length in lengths.values())
+
+    def rank(self, group: str, index: int) -> int:
+        return self.ranks[group][index]
+
+    def allows(self, group: str, index: int, assignment: Mapping[str, int]) -> bool:
+        """Whether ``group = index`` keeps ranks non-decreasing w.r.t. assigned neighbours."""
+        return self.violated_by(group, index, assignment) is None
+
+    def violated_by(
+        self, group: str, index: int, assignment: Mapping[str, int]
+    ) -> Optional[str]:
+        """Assigned chain neighbour that rules out ``group = index``, if any."""
+        ranks = self.ranks.get(group)
+        if ranks is None:
+            return None
+        rank = ranks[index]
+        previous = self.predecessors.get(group)
+        if previous in assignment and self.ranks[previous][assignment[previous]] > rank:
+            return previous
+        following = self.successors.get(group)
+        if following in assignment and rank > self.ranks[following][assignment[following]]:
+            return following
+        return None
+
+    def canonical_key(self, schedule: Schedule) -> Tuple:
+        """Identity of ``schedule`` up to section and group symmetry."""
+        by_group: Dict[str, List[Course]] = {}
+        for course in schedule.courses:
+            by_group.setdefault(course.main_code, []).append(course)
+        return tuple(sorted(
+            (self.chain_of.get(group, group), option_signature(courses))
+            for group, courses in by_group.items()
+        ))
+
+
+def collapse_sections(
+    group_keys: Iterable[str],
+    group_options: Dict[str, List[Optional[List[Course]]]],
+    valid_selections: Dict[str, List[List[Course]]],
+) -> int:
+    """
+    Drop options whose signature repeats an earlier option of the same group.
+
+    ``group_options`` and ``valid_selections`` of ``group_keys`` are replaced
+    by the collapsed lists. Returns the number of options removed.
+    """
+    collapsed = 0
+    for group in group_keys:
+        kept: List[Optional[List[Course]]] = []
+        seen: Set[Signature] = set()
+        for option in group_options.get(group, []):
+            signature = option_signature(option)
+            if signature in seen:
+                collapsed += 1
+                continue
+            seen.add(signature)
+            kept.append(option)
+        group_options[group] = kept
+        valid_selections[group] = [option for option in kept if option is not None]
+    return collapsed
+
+
+def detect_symmetries(
+    group_keys: List[str],
+    group_options: Dict[str, List[Optional[List[Course]]]],
+    mandatory_codes: Set[str],
+) -> SymmetryInfo:
+    """Chain interchangeable groups of collapsed options, in ``group_keys`` order."""
+    info = SymmetryInfo()
+    signatures = {
+        group: [option_signature(option) for option in group_options.get(group, [])]
+        for group in group_keys
+    }
+
+    classes: Dict[Tuple, List[str]] = {}
+    for group in group_keys:
+        if len(signatures[group]) < 2:
+            continue
+        key = (group in mandatory_codes, tuple(sorted(signatures[group], key=_sort_key)))
+        classes.setdefault(key, []).append(group)
+
+    for (_, ordered), chain in classes.items():
+        if len(chain) < 2:
+            continue
+        position = {signature: rank for rank, signature in enumerate(ordered)}
+        for previous, following in zip(chain, chain[1:]):
+            info.predecessors[following] = previous
+            info.successors[previous] = following
+        for group in chain:
+            info.ranks[group] = [position[signature] for signature in signatures[group]]
+            info.chain_of[group] = chain[0]
+    return info
+
+
+__all__ = [
+    "SYMMETRY_POOL_CAP",
+    "SymmetryInfo",
+    "collapse_sections",
+    "detect_symmetries",
+    "option_signature",
+]
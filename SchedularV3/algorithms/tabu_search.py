@@ -1,8 +1,18 @@
-"""Tabu search scheduler implementation."""
+"""Tabu search scheduler implementation.
+
+The search state is one option index per group. A move replaces the option of
+a single group; moves are scored incrementally through ``IncrementalScorer``
+instead of rebuilding a ``Schedule`` for every neighbour.
+
+Tabu memory is attribute based: after leaving option ``a`` of group ``g`` the
+attribute ``(g, a)`` stays tabu until a given iteration, stored in a dict so
+membership is O(1). A tabu move is still allowed when it would improve on the
+best cost found so far (aspiration by objective).
+"""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
     from core.models import Course, Schedule
@@ -15,13 +25,16 @@ except ImportError as e:
     raise ImportError(f"Required module core.models not found: {e}")
 
 try:
-    from utils.schedule_metrics import SchedulerPrefs, score_schedule
+    from utils.schedule_metrics import SchedulerPrefs
 except ImportError as e:
     raise ImportError(f"Required module utils.schedule_metrics not found: {e}")
 
 from . import register_scheduler
 from .base_scheduler import AlgorithmMetadata, BaseScheduler, PreparedSearch
-from .heuristics import estimate_conflict_penalty
+from .incremental import Assignment, IncrementalScorer, OptionTable
+
+
+Move = Tuple[str, int]
 
 
 @register_scheduler
@@ -48,10 +61,12 @@ class TabuSearchScheduler(BaseScheduler):
         timeout_seconds: int = 180,
         max_iterations: int = 100,
         tabu_tenure: int = 10,
+        min_ects: int = 0,
     ) -> None:
         super().__init__(
             max_results=max_results,
             max_ects=max_ects,
+            min_ects=min_ects,
             allow_conflicts=allow_conflicts,
             max_conflicts=max_conflicts,
             scheduler_prefs=scheduler_prefs,
@@ -60,104 +75,108 @@ class TabuSearchScheduler(BaseScheduler):
         self.max_iterations = max_iterations
         self.tabu_tenure = max(3, tabu_tenure)
 
-    def _run_algorithm(self, search):
-        initial_courses = self._build_initial_solution(search)
-
-        if not initial_courses:
-            return []
-
-        current_schedule = Schedule(initial_courses)
-        if not self._is_valid_final_schedule(current_schedule):
+    def _run_algorithm(self, search: PreparedSearch) -> List[Schedule]:
+        table = OptionTable(search)
+        assignment = self._build_initial_solution(table)
+        if not assignment:
             return []
 
-        best_schedule = current_schedule
-        best_cost = self._cost(best_schedule)
+        scorer = IncrementalScorer(self.scheduler_prefs)
+        for group, index in assignment.items():
+            scorer.add(table.get(group, index))
 
-        tabu_list = []
+        if not self._is_valid_final_schedule(table.to_schedule(assignment)):
+            return []
 
-        for _ in range(self.max_iterations):
-            best_candidate, best_candidate_cost = self._find_best_neighbor(
-                search, current_schedule, tabu_list
-            )
+        best_assignment = dict(assignment)
+        best_cost = scorer.cost()
+        tabu_until: Dict[Move, int] = {}
 
-            if best_candidate is None:
+        for iteration in range(self.max_iterations):
+            move = self._find_best_move(table, assignment, scorer, tabu_until, iteration, best_cost)
+            if move is None:
                 break
 
-            current_schedule = best_candidate
-            signature = tuple(sorted(course.code for course in current_schedule.courses))
-            tabu_list.append(signature)
-            if len(tabu_list) > self.tabu_tenure:
-                tabu_list.pop(0)
+            group, index, cost = move
+            previous = assignment[group]
+            scorer.swap(table.get(group, previous), table.get(group, index))
+            assignment[group] = index
+            tabu_until[(group, previous)] = iteration + self.tabu_tenure
 
-            if best_candidate_cost < best_cost:
-                best_schedule = current_schedule
-                best_cost = best_candidate_cost
+            if cost < best_cost:
+                best_assignment = dict(assignment)
+                best_cost = cost
 
-        return [best_schedule]
+        self._last_run_stats["best_cost"] = best_cost
+        return [table.to_schedule(best_assignment)]
 
-    def _build_initial_solution(self, search):
+    def _build_initial_solution(self, table: OptionTable) -> Assignment:
         """Build initial feasible solution greedily."""
-        initial_courses = []
-        for group_key in search.group_keys:
-            options = search.group_options.get(group_key, [])
+        assignment: Assignment = {}
+        courses: List[Course] = []
+        for group in table.group_keys:
+            options = table.options[group]
             for option in options:
                 if option is None:
                     continue
-                tentative = initial_courses + option
+                tentative = courses + list(option.courses)
                 if self._is_valid_partial_selection(tentative):
-                    initial_courses.extend(option)
+                    courses = tentative
+                    assignment[group] = option.index
                     break
-        return initial_courses
-
-    def _find_best_neighbor(self, search, current_schedule, tabu_list):
-        """Find best neighbor not in tabu list."""
-        best_candidate = None
-        best_candidate_cost = float("inf")
+            else:
+                # Optional groups start out unselected (their ``None`` option)
+                if None in options:
+                    assignment[group] = options.index(None)
+        return assignment
 
-        for group_key in search.group_keys:
-            options = search.group_options.get(group_key, [])
-            for option in options:
-                if option is None:
+    def _find_best_move(
+        self,
+        table: OptionTable,
+        assignment: Assignment,
+        scorer: IncrementalScorer,
+        tabu_until: Dict[Move, int],
+        iteration: int,
+        best_cost: float,
+    ) -> Optional[Tuple[str, int, float]]:
+        """Return the best admissible ``(group, option index, cost)`` move."""
+        group_masks = {}
+        for group, index in assignment.items():
+            option = table.get(group, index)
+            group_masks[group] = option.mask if option is not None else 0
+
+        best_move: Optional[Tuple[str, int, float]] = None
+        for group, current_index in assignment.items():
+            current = table.get(group, current_index)
+            others_mask = 0
+            for other, mask in group_masks.items():
+                if other != group:
+                    others_mask |= mask
+
+            for option in table.options[group]:
+                if option is None or option.index == current_index:
                     continue
 
-                candidate, cost = self._check_option(
-                    current_schedule, group_key, option, tabu_list
-                )
-
-                if candidate and cost < best_candidate_cost:
-                    best_candidate = candidate
-                    best_candidate_cost = cost
-
-        return best_candidate, best_candidate_cost
-
-    def _check_option(self, current_schedule, group_key, option, tabu_list):
-        """Check if an option is valid and return candidate schedule and cost."""
-        filtered = [
-            course
-            for course in current_schedule.courses
-            if course.main_code != group_key
-        ]
-        tentative_courses = filtered + option
+                if not self.allow_conflicts and option.mask & others_mask:
+                    self._last_run_stats["branches_pruned"] += 1
+                    continue
 
-        if not self._is_valid_partial_selection(tentative_courses):
-            self._last_run_stats["branches_pruned"] += 1
-            return None, float("inf")
+                cost, conflicts, ects, free_day_violation = scorer.evaluate_swap(current, option)
+                self._last_run_stats["nodes_explored"] += 1
+                if not self._is_admissible_state(
+                    conflicts, ects, free_day_violation, complete=True
+                ):
+                    self._last_run_stats["branches_pruned"] += 1
+                    continue
 
-        tentative_schedule = Schedule(tentative_courses)
-        signature = tuple(sorted(course.code for course in tentative_schedule.courses))
-        if signature in tabu_list:
-            return None, float("inf")
+                is_tabu = tabu_until.get((group, option.index), -1) >= iteration
+                if is_tabu and cost >= best_cost:
+                    continue
 
-        cost = self._cost(tentative_schedule)
-        self._last_run_stats["nodes_explored"] += 1
+                if best_move is None or cost < best_move[2]:
+                    best_move = (group, option.index, cost)
 
-        if self._is_valid_final_schedule(tentative_schedule):
-            return tentative_schedule, cost
+        return best_move
 
-        return None, float("inf")
 
-    def _cost(self, schedule):
-        if self.scheduler_prefs and score_schedule:
-            return -score_schedule(schedule, self.scheduler_prefs)
-        return estimate_conflict_penalty(schedule)
 __all__ = ["TabuSearchScheduler"]
@@ -0,0 +1,355 @@
+"""Hyperparameter tuning of metaheuristics against a wall-clock budget.
+
+``tune_algorithm`` races candidate parameter sets of one optimizer with
+successive halving: every candidate is run on a few (selection, seed) pairs
+of a corpus through ``AlgorithmBenchmark``, the best ``1/eta`` survive and
+are run on ``eta`` times as many pairs, until one is left. A run only counts
+if it returns a schedule within ``BUDGET_SLACK`` times the budget; candidates
+are ranked by such failures first and by mean best score second.
+
+``tune_corpus`` tunes per ``size_bucket`` of the selections and stores the
+winners in ``TuningProfiles``, which ``tuned_parameters`` reads back so
+schedulers built for a bucket start from its tuned profile.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    from core.models import CourseGroup
+    from utils.schedule_metrics import SchedulerPrefs
+
+# Runtime imports
+try:
+    from utils.schedule_metrics import SchedulerPrefs
+except ImportError as e:
+    raise ImportError(f"Required module utils.schedule_metrics not found: {e}")
+
+from . import get_registered_scheduler
+from .algorithm_selector import estimate_selection
+from .benchmark import AlgorithmBenchmark
+
+
+# Candidate values per tunable constructor parameter, keyed by algorithm name
+TUNING_SPACES: Dict[str, Dict[str, Tuple[Any, ...]]] = {
+    "Genetic": {
+        "population_size": (10, 20, 40, 60),
+        "generations": (15, 30, 60),
+        "crossover_rate": (0.6, 0.7, 0.8, 0.9),
+        "mutation_rate": (0.05, 0.1, 0.2, 0.3),
+    },
+    "TabuSearch": {
+        "max_iterations": (50, 100, 200),
+        "tabu_tenure": (3, 5, 10, 20),
+    },
+    "SimulatedAnnealing": {
+        "iterations": (250, 500, 1000, 2000),
+        "temperature": (10.0, 50.0, 100.0, 200.0),
+        "cooling_rate": (0.9, 0.95, 0.98, 0.99),
+    },
+    "PSO": {
+        "swarm_size": (10, 15, 30),
+        "iterations": (15, 25, 50),
+        "inertia": (0.2, 0.4, 0.6),
+        "social": (0.2, 0.4, 0.6),
+        "cognitive": (0.2, 0.4, 0.6),
+    },
+    "HybridGA+SA": {
+        "population_size": (20, 30, 50),
+        "generations": (25, 50, 100),
+        "annealing_iterations": (10, 20, 50),
+    },
+    "HillClimbing": {
+        "max_iterations": (15, 30, 60),
+        "restarts": (1, 2, 4),
+    },
+    "LNS": {
+        "max_iterations": (100, 200, 400),
+        "neighbourhood_size": (2, 3, 4, 5),
+        "stall_limit": (10, 20, 40),
+    },
+    "NSGA-II": {
+        "population_size": (20, 40, 80),
+        "generations": (30, 60, 120),
+        "crossover_rate": (0.7, 0.8, 0.9, 1.0),
+    },
+    "ParallelTempering": {
+        "replicas": (2, 4, 8),
+        "t_max": (25.0, 50.0, 100.0, 200.0),
+        "swap_interval": (10, 25, 50),
+        "epochs": (10, 20, 40),
+    },
+}
+# Runs may overshoot the budget by this factor before they count as failed
+BUDGET_SLACK = 1.25
+
+
+@dataclass
+class TuningInstance:
+    """A recorded course selection to tune on."""
+
+    course_groups: Dict[str, CourseGroup]
+    mandatory_codes: Set[str]
+    optional_codes: Set[str] = field(default_factory=set)
+    prefs: Optional[SchedulerPrefs] = None
+    max_ects: int = 31
+
+
+@dataclass
+class TuningResult:
+    """Winner of a successive-halving race."""
+
+    algorithm: str
+    params: Dict[str, Any]
+    # Mean best score of the winner's successful runs on its last rung
+    score: float
+    failures: int
+    runs: int
+    # Benchmark runs spent on all candidates
+    evaluations: int
+    seconds: float
+
+
+class TuningProfiles:
+    """
+    Tuned parameters per algorithm and size bucket.
+
+    Entries are kept as
+    ``{algorithm: {bucket: {"params", "score", "budget_seconds", "instances"}}}``
+    and persisted as JSON when a ``path`` is given.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._entries: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if self.path is not None and self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                if isinstance(loaded, dict):
+                    self._entries = loaded
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def get(self, algorithm: str, bucket: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(algorithm, {}).get(bucket)
+        return dict(entry) if entry else None
+
+    def params_for(self, algorithm: str, bucket: str) -> Dict[str, Any]:
+        """Tuned constructor kwargs, or an empty dict if the bucket is untuned."""
+        entry = self.get(algorithm, bucket)
+        return dict(entry["params"]) if entry else {}
+
+    def record(
+        self,
+        result: TuningResult,
+        bucket: str,
+        budget_seconds: float,
+        instances: int,
+    ) -> None:
+        self._entries.setdefault(result.algorithm, {})[bucket] = {
+            "params": dict(result.params),
+            "score": result.score,
+            "budget_seconds": budget_seconds,
+            "instances": instances,
+        }
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, indent=2)
+
+
+def tuned_parameters(
+    profiles: Optional[TuningProfiles], algorithm: str, bucket: Optional[str]
+) -> Dict[str, Any]:
+    """Profile of ``algorithm`` for ``bucket``, filtered to its tuning space."""
+    if profiles is None or bucket is None:
+        return {}
+    space = TUNING_SPACES.get(algorithm, {})
+    return {
+        name: value
+        for name, value in profiles.params_for(algorithm, bucket).items()
+        if name in space
+    }
+
+
+def sample_candidates(algorithm: str, count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """The untuned defaults plus up to ``count - 1`` distinct random grid points."""
+    space = TUNING_SPACES.get(algorithm)
+    if not space:
+        raise ValueError(f"No tuning space for algorithm: {algorithm}")
+    rng = random.Random(seed)
+    grid_size = math.prod(len(values) for values in space.values())
+    candidates: List[Dict[str, Any]] = [{}]
+    seen: Set[Tuple] = set()
+    while len(candidates) < min(count, grid_size + 1):
+        params = {name: rng.choice(values) for name, values in space.items()}
+        key = tuple(params.values())
+        if key not in seen:
+            seen.add(key)
+            candidates.append(params)
+    return candidates
+
+
+def tune_algorithm(
+    algorithm: str,
+    corpus: Sequence[TuningInstance],
+    budget_seconds: float,
+    candidates: int = 16,
+    seeds: Sequence[int] = (0, 1),
+    eta: int = 2,
+    min_runs: int = 1,
+    fixed_params: Optional[Dict[str, Any]] = None,
+    tuning_seed: int = 0,
+) -> TuningResult:
+    """
+    Race parameter sets of ``algorithm`` with successive halving.
+
+    Args:
+        algorithm: Registered name of an algorithm with a ``TUNING_SPACES`` entry
+        corpus: Selections to run on
+        budget_seconds: Wall-clock budget of a single run
+        candidates: Parameter sets entering the first rung (defaults included)
+        seeds: Scheduler seeds; every (selection, seed) pair is one run
+        eta: Survivors of a rung are the best ``1/eta``; rungs grow by ``eta``
+        min_runs: Runs per candidate on the first rung
+        fixed_params: Constructor kwargs shared by all candidates
+        tuning_seed: Seed of candidate sampling and run order
+
+    Returns:
+        The winning parameter set with its rung statistics
+    """
+    if not corpus:
+        raise ValueError("Tuning needs at least one selection")
+    scheduler_cls = get_registered_scheduler(algorithm)
+    if scheduler_cls is None:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    eta = max(2, eta)
+    start = time.perf_counter()
+
+    units = [(instance, seed) for instance in corpus for seed in seeds]
+    random.Random(tuning_seed).shuffle(units)
+    pool = sample_candidates(algorithm, candidates, seed=tuning_seed)
+    # candidate index -> (score or None on failure) of each unit run so far
+    outcomes: Dict[int, List[Optional[float]]] = {index: [] for index in range(len(pool))}
+    alive = list(range(len(pool)))
+    evaluations = 0
+    rung_size = max(1, min_runs)
+
+    while True:
+        rung_size = min(rung_size, len(units))
+        for index in alive:
+            for instance, seed in units[len(outcomes[index]):rung_size]:
+                outcomes[index].append(
+                    _run_unit(algorithm, instance, seed, budget_seconds, pool[index], fixed_params)
+                )
+                evaluations += 1
+        alive.sort(key=lambda index: _rank(outcomes[index]), reverse=True)
+        if len(alive) == 1 or rung_size == len(units):
+            break
+        alive = alive[: max(1, len(alive) // eta)]
+        rung_size *= eta
+
+    winner = alive[0]
+    scores = [score for score in outcomes[winner] if score is not None]
+    return TuningResult(
+        algorithm=algorithm,
+        params=dict(pool[winner]),
+        score=sum(scores) / len(scores) if scores else -math.inf,
+        failures=len(outcomes[winner]) - len(scores),
+        runs=len(outcomes[winner]),
+        evaluations=evaluations,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def tune_corpus(
+    algorithms: Sequence[str],
+    corpus: Sequence[TuningInstance],
+    budget_seconds: float,
+    profiles: TuningProfiles,
+    **tune_kwargs: Any,
+) -> Dict[str, Dict[str, TuningResult]]:
+    """
+    Tune every algorithm separately on each size bucket of ``corpus``.
+
+    Winners are recorded in ``profiles`` and saved. Returns
+    ``{algorithm: {bucket: result}}``.
+    """
+    buckets: Dict[str, List[TuningInstance]] = {}
+    for instance in corpus:
+        bucket = instance_bucket(instance)
+        if bucket is not None:
+            buckets.setdefault(bucket, []).append(instance)
+
+    results: Dict[str, Dict[str, TuningResult]] = {}
+    for algorithm in algorithms:
+        for bucket, instances in buckets.items():
+            result = tune_algorithm(algorithm, instances, budget_seconds, **tune_kwargs)
+            profiles.record(result, bucket, budget_seconds, len(instances))
+            results.setdefault(algorithm, {})[bucket] = result
+    profiles.save()
+    return results
+
+
+def instance_bucket(instance: TuningInstance) -> Optional[str]:
+    """Size bucket of a selection; None if it admits no options."""
+    from .dfs_scheduler import DFSScheduler
+
+    sizing = DFSScheduler(max_ects=instance.max_ects, scheduler_prefs=instance.prefs)
+    estimate = estimate_selection(
+        sizing, instance.course_groups, set(instance.mandatory_codes), set(instance.optional_codes)
+    )
+    return estimate.bucket if estimate is not None else None
+
+
+def _run_unit(
+    algorithm: str,
+    instance: TuningInstance,
+    seed: int,
+    budget_seconds: float,
+    params: Dict[str, Any],
+    fixed_params: Optional[Dict[str, Any]],
+) -> Optional[float]:
+    """Best score of one budgeted run, or None if it found nothing or overran."""
+    prefs = instance.prefs or SchedulerPrefs()
+    benchmark = AlgorithmBenchmark(
+        instance.course_groups, instance.mandatory_codes, instance.optional_codes, prefs
+    )
+    kwargs = dict(fixed_params or {}, **params)
+    kwargs.update(max_ects=instance.max_ects, timeout_seconds=budget_seconds)
+    summary = benchmark.run([algorithm], per_algorithm_kwargs={algorithm: kwargs}, seeds=[seed])
+    run = summary[algorithm]
+    if not run["results"] or run["duration"] > budget_seconds * BUDGET_SLACK:
+        return None
+    return run["best_score"]
+
+
+def _rank(outcomes: List[Optional[float]]) -> Tuple[int, float]:
+    scores = [score for score in outcomes if score is not None]
+    mean = sum(scores) / len(scores) if scores else -math.inf
+    return -(len(outcomes) - len(scores)), mean
+
+
+__all__ = [
+    "BUDGET_SLACK",
+    "TUNING_SPACES",
+    "TuningInstance",
+    "TuningProfiles",
+    "TuningResult",
+    "instance_bucket",
+    "sample_candidates",
+    "tune_algorithm",
+    "tune_corpus",
+    "tuned_parameters",
+]
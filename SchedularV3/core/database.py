@@ -7,11 +7,12 @@ Enhanced from V2 with better error handling and type hints.
 import sqlite3
 import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 from pathlib import Path
 from datetime import datetime
 
 from .models import Course, Schedule, Program, Transcript, Grade
+from .schedule_codec import CatalogMismatchError, EncodedSchedules, ScheduleCodec
 from config.settings import DATABASE_PATH
 
 # Set up logging
@@ -101,6 +102,18 @@ class Database:
             )
             ''')
 
+            # Create result sets table (compact ``ScheduleCodec`` payloads)
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS result_sets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                catalog_version TEXT NOT NULL,
+                schedule_count INTEGER NOT NULL,
+                payload BLOB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+
             # Create programs table
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS programs (
@@ -471,6 +484,110 @@ class Database:
             logger.error(f"Error retrieving schedules: {e}")
             raise
 
+    def save_result_set(self, schedules: Iterable[Schedule], codec: ScheduleCodec, name: str = "") -> int:
+        """
+        Save a whole result list as one compact encoded payload.
+
+        Args:
+            schedules: Schedules (or an ``EncodedSchedules`` list) to save
+            codec: Codec of the catalog the schedules were built from
+            name: Optional name for the result set
+
+        Returns:
+            ID of the saved result set record
+
+        Raises:
+            CatalogMismatchError: If ``schedules`` is an ``EncodedSchedules``
+                list encoded against another catalog than ``codec``
+        """
+        if isinstance(schedules, EncodedSchedules) and schedules.codec.version != codec.version:
+            # The stored catalog version must describe the payload header
+            raise CatalogMismatchError(
+                f"Schedules were encoded for catalog {schedules.codec.version_hex}, "
+                f"not {codec.version_hex}"
+            )
+
+        if not self.conn:
+            self.connect()
+
+        try:
+            cursor = self.conn.cursor()
+
+            if not name:
+                name = f"Results {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+
+            if isinstance(schedules, EncodedSchedules):
+                payload, count = schedules.to_bytes(), len(schedules)
+            else:
+                schedules = list(schedules)
+                payload, count = codec.encode_many(schedules), len(schedules)
+
+            cursor.execute('''
+            INSERT INTO result_sets
+            (name, catalog_version, schedule_count, payload)
+            VALUES (?, ?, ?, ?)
+            ''', (name, codec.version_hex, count, payload))
+
+            self.conn.commit()
+            result_set_id = cursor.lastrowid
+            logger.info(f"Saved result set '{name}' with {count} schedules (ID: {result_set_id})")
+            return result_set_id
+        except sqlite3.Error as e:
+            if self.conn:
+                self.conn.rollback()
+            logger.error(f"Error saving result set {name}: {e}")
+            raise
+
+    def get_result_set(self, result_set_id: int, codec: ScheduleCodec) -> Optional[EncodedSchedules]:
+        """
+        Retrieve a result set, still encoded; schedules decode on access.
+
+        Args:
+            result_set_id: ID of the result set to retrieve
+            codec: Codec of the current catalog
+
+        Returns:
+            The encoded schedules or None if not found
+
+        Raises:
+            CatalogMismatchError: If the set was saved against another catalog
+        """
+        if not self.conn:
+            self.connect()
+
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT payload FROM result_sets WHERE id = ?', (result_set_id,))
+
+            row = cursor.fetchone()
+            if not row:
+                return None
+            return EncodedSchedules.from_bytes(codec, bytes(row["payload"]))
+        except sqlite3.Error as e:
+            logger.error(f"Error retrieving result set {result_set_id}: {e}")
+            raise
+
+    def get_all_result_sets(self) -> List[tuple]:
+        """
+        Get all result sets (without their payloads).
+
+        Returns:
+            List of tuples (id, name, catalog_version, schedule_count, created_at)
+        """
+        if not self.conn:
+            self.connect()
+
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                'SELECT id, name, catalog_version, schedule_count, created_at '
+                'FROM result_sets ORDER BY created_at DESC, id DESC'
+            )
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error retrieving result sets: {e}")
+            raise
+
     def save_program(self, program: Program) -> int:
         """
         Save a program to the database.
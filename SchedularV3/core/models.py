@@ -8,9 +8,10 @@ Enhanced from V2 with additional features:
 - Enhanced conflict detection
 """
 from dataclasses import dataclass, field
-from typing import List, Dict, Set, Tuple, Optional, Literal, Any
+from typing import List, Dict, Iterable, Set, Tuple, Optional, Literal, Any
 from collections import defaultdict
 import logging
+import threading
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -146,6 +147,23 @@ class Course:
         return self.code == other.code
 
 
+# Process-wide course IDs keyed by everything that makes two sections the same
+# course; a section whose data changed (e.g. a reloaded catalog) gets a new ID
+_COURSE_IDS: Dict[Tuple, int] = {}
+# Schedules are scored from worker threads; two new courses must never share an ID
+_COURSE_IDS_LOCK = threading.Lock()
+
+
+def course_id(course: Course) -> int:
+    """Return the process-wide integer ID of a course (its bit in ``Schedule.identity``)."""
+    key = (course.code, course.main_code, course.ects, course.course_type, repr(course.schedule))
+    cid = _COURSE_IDS.get(key)
+    if cid is None:
+        with _COURSE_IDS_LOCK:
+            cid = _COURSE_IDS.setdefault(key, len(_COURSE_IDS))
+    return cid
+
+
 @dataclass
 class Schedule:
     """
@@ -155,6 +173,44 @@ class Schedule:
         courses: List of Course objects in this schedule
     """
     courses: List[Course] = field(default_factory=list)
+    # Cached ``identity`` and the course objects it was computed for
+    _identity: Optional[Tuple[Tuple[Course, ...], int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def identity(self) -> int:
+        """
+        Canonical, hashable identity: a bitset of the schedule's course IDs.
+
+        Independent of course order, so schedules holding the same sections
+        share it. Cached against the exact course objects, so editing or
+        replacing ``courses`` recomputes it; editing a course's own fields in
+        place requires ``invalidate_identity``.
+        """
+        courses = self.courses
+        cached = self._identity
+        if (
+            cached is not None
+            and len(cached[0]) == len(courses)
+            and all(old is new for old, new in zip(cached[0], courses))
+        ):
+            return cached[1]
+        bits = 0
+        for course in courses:
+            bits |= 1 << course_id(course)
+        self._identity = (tuple(courses), bits)
+        return bits
+
+    def invalidate_identity(self) -> None:
+        """Drop the cached ``identity`` after editing a course's fields in place."""
+        self._identity = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Course IDs are per process; never ship a cached identity
+        state = dict(self.__dict__)
+        state["_identity"] = None
+        return state
 
     @property
     def total_credits(self) -> int:
@@ -196,6 +252,7 @@ class Schedule:
     def add_course(self, course: Course) -> None:
         """Add a course to the schedule."""
         self.courses.append(course)
+        self._identity = None
 
     def remove_course(self, course_code: str) -> bool:
         """
@@ -210,6 +267,7 @@ class Schedule:
         for i, course in enumerate(self.courses):
             if course.code == course_code:
                 self.courses.pop(i)
+                self._identity = None
                 return True
         return False
 
@@ -288,6 +346,18 @@ class Schedule:
         return f"Schedule({len(self.courses)} courses, {self.total_credits} ECTS, {self.conflict_count} conflicts)"
 
 
+def unique_schedules(schedules: Iterable[Schedule]) -> List[Schedule]:
+    """Keep the first schedule of every ``identity``, in input order."""
+    seen = set()
+    unique = []
+    for schedule in schedules:
+        identity = schedule.identity
+        if identity not in seen:
+            seen.add(identity)
+            unique.append(schedule)
+    return unique
+
+
 @dataclass
 class CourseGroup:
     """
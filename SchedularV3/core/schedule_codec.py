@@ -0,0 +1,249 @@
+"""
+Compact schedule encoding for SchedularV3.
+
+A schedule is stored as the catalog version it was built from plus the
+sorted integer IDs of its courses, delta-encoded as LEB128 varints. IDs are
+positions in the code-sorted course list of the catalog, so a typical
+schedule of 10-20 sections takes a few dozen bytes instead of a JSON list
+of full course dictionaries. Decoding is a table lookup per course.
+
+Layout of ``encode`` / ``encode_many`` payloads:
+
+    format byte | 8-byte catalog version | per schedule: varint count, varint deltas
+
+``encode_text`` wraps a single payload in unpadded URL-safe base64 for share
+links and JSON fields.
+"""
+import base64
+import hashlib
+import json
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union, overload
+
+from .models import Course, CourseGroup, Schedule
+
+# Bumped whenever the payload layout changes
+FORMAT_VERSION = 1
+VERSION_BYTES = 8
+
+
+class CatalogMismatchError(ValueError):
+    """Raised when a payload was encoded against a different catalog."""
+
+
+def _write_varint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated schedule payload")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class ScheduleCodec:
+    """
+    Encoder/decoder of schedules against one course catalog.
+
+    Attributes:
+        courses: Catalog courses in ID order (sorted by code)
+        version: Fingerprint of the catalog; payloads only decode under the
+            same version
+    """
+
+    def __init__(self, courses: Iterable[Course]):
+        """
+        Build the ID table of a catalog.
+
+        Args:
+            courses: All courses of the catalog; duplicate codes are kept once
+        """
+        by_code: Dict[str, Course] = {}
+        for course in courses:
+            by_code.setdefault(course.code, course)
+        self.courses: List[Course] = [by_code[code] for code in sorted(by_code)]
+        self._ids: Dict[str, int] = {course.code: index for index, course in enumerate(self.courses)}
+        self.version = self._fingerprint(self.courses)
+
+    @classmethod
+    def from_course_groups(cls, course_groups: Dict[str, CourseGroup]) -> 'ScheduleCodec':
+        """Create a codec for the courses of ``course_groups``."""
+        return cls(course for group in course_groups.values() for course in group.courses)
+
+    @property
+    def version_hex(self) -> str:
+        return self.version.hex()
+
+    @staticmethod
+    def _fingerprint(courses: Sequence[Course]) -> bytes:
+        """Hash of everything a decoded schedule depends on."""
+        digest = hashlib.blake2b(digest_size=VERSION_BYTES)
+        for course in courses:
+            record = [course.code, course.main_code, course.ects, course.course_type, course.schedule]
+            digest.update(json.dumps(record, separators=(",", ":"), default=str).encode("utf-8"))
+        return digest.digest()
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+    def course_ids(self, schedule: Schedule) -> List[int]:
+        """Sorted catalog IDs of the courses of ``schedule``."""
+        try:
+            return sorted(self._ids[course.code] for course in schedule.courses)
+        except KeyError as e:
+            raise ValueError(f"Course {e.args[0]} is not in the catalog") from None
+
+    def _header(self) -> bytearray:
+        out = bytearray((FORMAT_VERSION,))
+        out += self.version
+        return out
+
+    def _append(self, schedule: Schedule, out: bytearray) -> None:
+        ids = self.course_ids(schedule)
+        _write_varint(len(ids), out)
+        previous = 0
+        for course_id in ids:
+            _write_varint(course_id - previous, out)
+            previous = course_id
+
+    def encode(self, schedule: Schedule) -> bytes:
+        """Encode one schedule."""
+        out = self._header()
+        self._append(schedule, out)
+        return bytes(out)
+
+    def encode_many(self, schedules: Iterable[Schedule]) -> bytes:
+        """Encode a result list into one payload sharing a single header."""
+        out = self._header()
+        for schedule in schedules:
+            self._append(schedule, out)
+        return bytes(out)
+
+    def encode_text(self, schedule: Schedule) -> str:
+        """Encode one schedule as URL-safe text (share links, JSON fields)."""
+        return base64.urlsafe_b64encode(self.encode(schedule)).rstrip(b"=").decode("ascii")
+
+    # ------------------------------------------------------------------
+    # Decoding
+    # ------------------------------------------------------------------
+    def _check_header(self, data: bytes) -> int:
+        if len(data) < 1 + VERSION_BYTES:
+            raise ValueError("Truncated schedule payload")
+        if data[0] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported schedule payload format {data[0]}")
+        if data[1:1 + VERSION_BYTES] != self.version:
+            raise CatalogMismatchError(
+                f"Payload was encoded for catalog {data[1:1 + VERSION_BYTES].hex()}, "
+                f"not {self.version_hex}"
+            )
+        return 1 + VERSION_BYTES
+
+    def _read(self, data: bytes, pos: int) -> Tuple[Schedule, int]:
+        count, pos = _read_varint(data, pos)
+        courses = self.courses
+        selected: List[Course] = []
+        course_id = 0
+        for _ in range(count):
+            delta, pos = _read_varint(data, pos)
+            course_id += delta
+            if course_id >= len(courses):
+                raise ValueError(f"Course ID {course_id} is not in the catalog")
+            selected.append(courses[course_id])
+        return Schedule(selected), pos
+
+    def decode(self, data: bytes) -> Schedule:
+        """Decode one schedule; courses come back in code order."""
+        schedule, pos = self._read(data, self._check_header(data))
+        if pos != len(data):
+            raise ValueError("Trailing bytes after schedule payload")
+        return schedule
+
+    def iter_decode(self, data: bytes) -> Iterator[Schedule]:
+        """Lazily decode an ``encode_many`` payload."""
+        pos = self._check_header(data)
+        while pos < len(data):
+            schedule, pos = self._read(data, pos)
+            yield schedule
+
+    def decode_many(self, data: bytes) -> List[Schedule]:
+        """Decode an ``encode_many`` payload."""
+        return list(self.iter_decode(data))
+
+    def decode_text(self, text: str) -> Schedule:
+        """Decode the output of ``encode_text``."""
+        padded = text + "=" * (-len(text) % 4)
+        try:
+            data = base64.urlsafe_b64decode(padded.encode("ascii"))
+        except (ValueError, UnicodeEncodeError) as e:
+            raise ValueError(f"Invalid schedule text: {e}") from None
+        return self.decode(data)
+
+
+class EncodedSchedules(Sequence[Schedule]):
+    """
+    Append-only list of schedules held in encoded form.
+
+    Each result costs a short ``bytes`` record (header-less ``encode_many``
+    entry) instead of a ``Schedule`` with its course list; items are decoded
+    on access.
+    """
+
+    def __init__(self, codec: ScheduleCodec, schedules: Iterable[Schedule] = ()):
+        self.codec = codec
+        self._records: List[bytes] = []
+        for schedule in schedules:
+            self.append(schedule)
+
+    def append(self, schedule: Schedule) -> None:
+        record = bytearray()
+        self.codec._append(schedule, record)
+        self._records.append(bytes(record))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @overload
+    def __getitem__(self, index: int) -> Schedule: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Schedule]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Schedule, List[Schedule]]:
+        if isinstance(index, slice):
+            return [self.codec._read(record, 0)[0] for record in self._records[index]]
+        return self.codec._read(self._records[index], 0)[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the encoded records in bytes."""
+        return sum(len(record) for record in self._records)
+
+    def to_bytes(self) -> bytes:
+        """All schedules as one ``encode_many`` payload."""
+        return bytes(self.codec._header() + b"".join(self._records))
+
+    @classmethod
+    def from_bytes(cls, codec: ScheduleCodec, data: bytes) -> 'EncodedSchedules':
+        """Split an ``encode_many`` payload into records without decoding it."""
+        encoded = cls(codec)
+        pos = codec._check_header(data)
+        while pos < len(data):
+            start = pos
+            count, pos = _read_varint(data, pos)
+            for _ in range(count):
+                _, pos = _read_varint(data, pos)
+            encoded._records.append(bytes(data[start:pos]))
+        return encoded
+
+
+__all__ = ["CatalogMismatchError", "EncodedSchedules", "FORMAT_VERSION", "ScheduleCodec"]
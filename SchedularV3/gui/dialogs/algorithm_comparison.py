@@ -117,7 +117,9 @@ class AlgorithmComparisonDialog(QDialog):
         group = QGroupBox("📅 Best Schedules Comparison")
         layout = QHBoxLayout(group)
 
-        # Create a grid for each algorithm's best schedule
+        # Create a grid for each distinct best schedule; algorithms that found
+        # the same one point at the first grid instead of repeating it
+        rendered: Dict[int, str] = {}
         for algorithm, schedules in self.algorithm_results.items():
             if not schedules:
                 continue
@@ -145,6 +147,14 @@ class AlgorithmComparisonDialog(QDialog):
             stats_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             algo_layout.addWidget(stats_label)
 
+            first = rendered.setdefault(best_schedule.identity, algorithm)
+            if first != algorithm:
+                same_label = QLabel(f"Same schedule as <b>{first}</b>")
+                same_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+                algo_layout.addWidget(same_label, stretch=1)
+                layout.addWidget(algo_widget)
+                continue
+
             # Schedule grid
             scroll = QScrollArea()
             grid = ScheduleGrid()
@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import logging
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, cast
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QAction, QIcon
 from PyQt6.QtWidgets import (
+    QInputDialog,
     QMainWindow,
     QMessageBox,
     QTabWidget,
@@ -20,13 +22,29 @@ from PyQt6.QtWidgets import (
 )
 
 from algorithms import get_registered_scheduler
+from algorithms.algorithm_selector import (
+    RuntimeHistory,
+    auto_select_scheduler,
+    estimate_selection,
+)
+from algorithms.tuning import TuningProfiles, tuned_parameters
+from config.settings import RESOURCES_DIR
+from core.database import Database
 from core.excel_loader import process_excel
 from core.models import Course, CourseGroup, build_course_groups
-from utils.schedule_metrics import SchedulerPrefs
+from core.schedule_codec import CatalogMismatchError, ScheduleCodec
+from utils.schedule_metrics import SchedulerPrefs, score_schedule
 
 
 logger = logging.getLogger(__name__)
 
+# Measured runtimes used by quick-schedule auto-selection
+RUNTIME_HISTORY_PATH = RESOURCES_DIR / "algorithm_runtime_history.json"
+# Parameters tuned per algorithm and size bucket (see algorithms.tuning)
+TUNING_PROFILES_PATH = RESOURCES_DIR / "algorithm_tuning_profiles.json"
+# Response time the quick-schedule (Lucky) path aims for
+QUICK_SCHEDULE_LATENCY_SECONDS = 5.0
+
 
 class MainWindow(QMainWindow):
     """Main application window with 4-tab interface."""
@@ -127,10 +145,16 @@ class MainWindow(QMainWindow):
 
         save_action = QAction("&Save Schedule...", self)
         save_action.setShortcut("Ctrl+S")
-        save_action.setStatusTip("Save current schedule")
+        save_action.setStatusTip("Save the schedules on display")
         save_action.triggered.connect(self._on_save_schedule)
         file_menu.addAction(save_action)
 
+        load_action = QAction("&Load Saved Schedules...", self)
+        load_action.setShortcut("Ctrl+L")
+        load_action.setStatusTip("Show a saved result set for the loaded catalog")
+        load_action.triggered.connect(self._on_load_saved_schedules)
+        file_menu.addAction(load_action)
+
         file_menu.addSeparator()
 
         export_menu = cast(QMenu, file_menu.addMenu("📤 Export"))
@@ -393,8 +417,71 @@ class MainWindow(QMainWindow):
         self.data_tab.browse_button.click()
 
     def _on_save_schedule(self) -> None:
-        """Handle save schedule action."""
-        self._status_bar().showMessage("Save schedule - To be implemented")
+        """Save the schedules on display as one compact result set."""
+        schedules = self.viewer_tab.get_schedules()
+        if not schedules or not self._course_groups:
+            self._status_bar().showMessage("No schedules to save")
+            return
+
+        name, accepted = QInputDialog.getText(self, "Save Schedules", "Name:")
+        if not accepted:
+            return
+
+        codec = ScheduleCodec.from_course_groups(self._course_groups)
+        try:
+            with Database() as db:
+                db.initialize()
+                db.save_result_set(schedules, codec, name=name.strip())
+        except Exception as exc:
+            logger.exception("Failed to save schedules")
+            self._show_error("Save Failed", str(exc))
+            return
+        self._status_bar().showMessage(f"Saved {len(schedules)} schedules")
+
+    def _on_load_saved_schedules(self) -> None:
+        """Show a result set saved against the loaded catalog."""
+        if not self._course_groups:
+            QMessageBox.warning(
+                self,
+                "No Course Data",
+                "Please load the Excel course data the schedules were saved with.",
+            )
+            return
+
+        codec = ScheduleCodec.from_course_groups(self._course_groups)
+        try:
+            with Database() as db:
+                db.initialize()
+                result_sets = [
+                    row for row in db.get_all_result_sets()
+                    if row["catalog_version"] == codec.version_hex
+                ]
+                if not result_sets:
+                    self._status_bar().showMessage("No saved schedules for this course data")
+                    return
+                labels = [
+                    f"{row['name']} ({row['schedule_count']} schedules)" for row in result_sets
+                ]
+                label, accepted = QInputDialog.getItem(
+                    self, "Load Saved Schedules", "Result set:", labels, 0, False
+                )
+                if not accepted:
+                    return
+                row = result_sets[labels.index(label)]
+                encoded = db.get_result_set(row["id"], codec)
+        except CatalogMismatchError as exc:
+            self._show_error("Load Failed", str(exc))
+            return
+        except Exception as exc:
+            logger.exception("Failed to load saved schedules")
+            self._show_error("Load Failed", str(exc))
+            return
+
+        if encoded is None:
+            return
+        self.viewer_tab.set_schedules(list(encoded), algorithm=f"Saved: {row['name']}")
+        self.tab_widget.setCurrentWidget(self.viewer_tab)
+        self._status_bar().showMessage(f"Loaded {len(encoded)} saved schedules")
 
     def _on_export(self, format: str) -> None:
         """Handle export action."""
@@ -446,7 +533,9 @@ class MainWindow(QMainWindow):
 
         params = dict(self._algorithm_params)
         max_ects = int(params.pop("max_ects", 31))
+        min_ects = int(params.pop("min_ects", 0))
         allow_conflicts = bool(params.pop("allow_conflicts", False))
+        diverse_results = bool(params.pop("diverse_results", False))
 
         # Remove UI-only parameters that schedulers don't expect
         params.pop("lifestyle_mode", None)
@@ -456,6 +545,7 @@ class MainWindow(QMainWindow):
         try:
             scheduler = scheduler_cls(
                 max_ects=max_ects,
+                min_ects=min_ects,
                 allow_conflicts=allow_conflicts,
                 scheduler_prefs=self._scheduler_prefs,
                 **params,
@@ -465,17 +555,33 @@ class MainWindow(QMainWindow):
             self._show_error("Algorithm Error", str(exc))
             return
 
+        # Size the selection before the run so the scheduler's own stats stay intact
+        estimate = estimate_selection(scheduler, self._course_groups, mandatory_codes, optional_codes)
+
+        # Re-solve around pinned sections, seeded with the schedules on display
+        scheduler.warm_start(self.viewer_tab.get_pinned_courses(), self.viewer_tab.get_schedules())
+        if diverse_results:
+            # Results that differ in more than a single lab section
+            scheduler.diversify_results()
+
         try:
+            start = time.perf_counter()
             schedules = scheduler.generate_schedules(
                 self._course_groups,
                 mandatory_codes,
                 optional_codes,
             )
+            seconds = time.perf_counter() - start
         except Exception as exc:  # pragma: no cover - defensive guard
             logger.exception("Scheduler execution failed")
             self._show_error("Generation Failed", str(exc))
             return
 
+        # Measured runs feed the size-aware auto-selection of the Lucky path
+        if estimate is not None:
+            history = RuntimeHistory(RUNTIME_HISTORY_PATH)
+            self._record_runtime(history, scheduler, estimate.bucket, schedules, seconds)
+
         stats = scheduler.get_search_statistics()
 
         if not schedules:
@@ -556,20 +662,49 @@ class MainWindow(QMainWindow):
 
         self._status_bar().showMessage("🍀 Şansını deniyorum... Program oluşturuluyor...")
 
+        scheduler_kwargs = {
+            "max_ects": config["max_ects"],
+            "min_ects": config.get("min_ects", 0),
+            "max_results": config["max_results"],
+            "allow_conflicts": False,
+            "scheduler_prefs": config.get("scheduler_prefs"),
+        }
+        params = dict(config.get("params", {}))
+
         try:
-            scheduler = scheduler_cls(
-                max_ects=config["max_ects"],
-                max_results=config["max_results"],
-                allow_conflicts=False,
-                scheduler_prefs=config.get("scheduler_prefs"),
-                **config.get("params", {}),
+            # Swap the configured algorithm for one sized to the actual selection
+            history = RuntimeHistory(RUNTIME_HISTORY_PATH)
+            selection = auto_select_scheduler(
+                scheduler_cls(**scheduler_kwargs),
+                self._course_groups,
+                mandatory_codes,
+                optional_codes,
+                latency_target=QUICK_SCHEDULE_LATENCY_SECONDS,
+                history=history,
             )
-
+            if selection is not None and selection.scheduler_cls is not scheduler_cls:
+                scheduler_cls = selection.scheduler_cls
+                algorithm_name = scheduler_cls.metadata.name
+                params = {"timeout_seconds": params.get("timeout_seconds", 120)}
+            if selection is not None:
+                params.update(tuned_parameters(
+                    TuningProfiles(TUNING_PROFILES_PATH), algorithm_name, selection.estimate.bucket
+                ))
+
+            scheduler = scheduler_cls(**scheduler_kwargs, **params)
+            if self._algorithm_params.get("diverse_results", False):
+                scheduler.diversify_results()
+
+            start = time.perf_counter()
             schedules = scheduler.generate_schedules(
                 self._course_groups,
                 mandatory_codes,
                 optional_codes,
             )
+            seconds = time.perf_counter() - start
+            if selection is not None:
+                bucket = selection.estimate.bucket
+                self._record_runtime(history, scheduler, bucket, schedules, seconds)
         except Exception as exc:
             logger.exception("Quick schedule generation failed")
             self._show_error("Hızlı Program Hatası", str(exc))
@@ -592,6 +727,30 @@ class MainWindow(QMainWindow):
             f"🍀 Şanslısın! {len(schedules)} program bulundu. En iyisi seçildi."
         )
 
+    @staticmethod
+    def _record_runtime(
+        history: RuntimeHistory,
+        scheduler: Any,
+        bucket: str,
+        schedules: List[Any],
+        seconds: float,
+    ) -> None:
+        """Add a finished run to the persisted runtime history."""
+        best_score = None
+        if schedules:
+            best_score = score_schedule(schedules[0], scheduler.scheduler_prefs)
+        history.record(
+            scheduler.metadata.name,
+            bucket,
+            seconds,
+            best_score=best_score,
+            timed_out=bool(scheduler.last_run_stats.get("timeout_reached")),
+        )
+        try:
+            history.save()
+        except OSError:
+            logger.warning("Could not save runtime history to %s", history.path)
+
     def _on_compare_algorithms(self) -> None:
         """Handle compare algorithms action."""
         self._status_bar().showMessage("Compare algorithms - To be implemented")
@@ -609,9 +768,9 @@ class MainWindow(QMainWindow):
             "<p>Advanced Course Schedule Generator</p>"
             "<p>Version 3.0.0</p>"
             "<p>Featuring 15+ scheduling algorithms with intelligent optimization</p>"
-            "<p><b>Algorithms:</b> DFS, BFS, IDDFS, A*, Greedy, Dijkstra, "
-            "Simulated Annealing, Hill Climbing, Tabu Search, Genetic, PSO, "
-            "Hybrid GA+SA, Constraint Programming</p>",
+            "<p><b>Algorithms:</b> DFS, BFS, IDDFS, A*, Greedy, Dijkstra, Beam Search, "
+            "Simulated Annealing, Hill Climbing, Tabu Search, Genetic, NSGA-II, PSO, "
+            "Hybrid GA+SA, Large Neighbourhood Search, Constraint Programming</p>",
         )
 
     def _on_documentation(self) -> None:
@@ -722,6 +722,10 @@ class ScheduleViewerTab(QWidget):
             "(Full implementation requires access to course groups)"
         )
 
+    def get_schedules(self) -> List[Schedule]:
+        """Get the schedules currently shown in the viewer."""
+        return list(self._schedules)
+
     def get_pinned_courses(self) -> set:
         """Get the set of pinned course codes."""
         return getattr(self, '_pinned_courses', set()).copy()
@@ -69,15 +69,18 @@ class AlgorithmSelector(QWidget):
         },
         "BFS": {
             "max_results": (1, 50, 10, "Maximum schedules to generate"),
+            "max_frontier": (1000, 2000000, 250000, "Frontier states before beam mode"),
             "timeout_seconds": (30, 300, 180, "Timeout in seconds"),
         },
         "IDDFS": {
             "max_results": (1, 50, 10, "Maximum schedules to generate"),
             "depth_increment": (1, 10, 1, "Depth increment per iteration"),
+            "table_size": (1000, 2000000, 200000, "Transposition table entries"),
             "timeout_seconds": (30, 400, 240, "Timeout in seconds"),
         },
         "A*": {
             "max_results": (1, 50, 10, "Maximum schedules to generate"),
+            "max_open_nodes": (1000, 2000000, 500000, "Open states before IDA* fallback"),
             "timeout_seconds": (30, 300, 180, "Timeout in seconds"),
         },
         "Greedy": {
@@ -88,14 +91,28 @@ class AlgorithmSelector(QWidget):
             "max_results": (1, 20, 5, "Maximum schedules to generate"),
             "timeout_seconds": (30, 300, 180, "Timeout in seconds"),
         },
+        "BeamSearch": {
+            "max_results": (1, 20, 5, "Maximum schedules to generate"),
+            "beam_width": (1, 1024, 64, "Partial schedules kept per level"),
+            "diversity_weight": (0.0, 20.0, 2.0, "Penalty for shared sections", True),
+            "timeout_seconds": (10, 120, 60, "Timeout in seconds"),
+        },
         "SimulatedAnnealing": {
             "max_results": (1, 5, 1, "Maximum schedules to generate"),
             "annealing_iterations": (50, 1000, 400, "Annealing iterations"),
             "timeout_seconds": (30, 300, 180, "Timeout in seconds"),
         },
+        "ParallelTempering": {
+            "max_results": (1, 10, 5, "Maximum schedules to generate"),
+            "replicas": (2, 16, 4, "Number of replicas"),
+            "epochs": (5, 200, 20, "Exchange rounds"),
+            "swap_interval": (5, 200, 25, "Moves between exchanges"),
+            "timeout_seconds": (30, 300, 180, "Timeout in seconds"),
+        },
         "HillClimbing": {
             "max_results": (1, 5, 1, "Maximum schedules to generate"),
             "max_iterations": (10, 100, 30, "Maximum iterations"),
+            "restarts": (1, 64, 1, "Randomized restarts (1 = single climb)"),
             "timeout_seconds": (30, 200, 120, "Timeout in seconds"),
         },
         "TabuSearch": {
@@ -112,6 +129,13 @@ class AlgorithmSelector(QWidget):
             "mutation_rate": (0.0, 1.0, 0.2, "Mutation rate", True),
             "timeout_seconds": (30, 300, 180, "Timeout in seconds"),
         },
+        "NSGA-II": {
+            "max_results": (1, 50, 20, "Maximum Pareto-optimal schedules"),
+            "population_size": (8, 200, 40, "Population size"),
+            "generations": (5, 500, 60, "Number of generations"),
+            "crossover_rate": (0.0, 1.0, 0.9, "Crossover rate", True),
+            "timeout_seconds": (30, 300, 120, "Timeout in seconds"),
+        },
         "PSO": {
             "max_results": (1, 5, 1, "Maximum schedules to generate"),
             "swarm_size": (5, 50, 15, "Swarm size"),
@@ -128,9 +152,17 @@ class AlgorithmSelector(QWidget):
             "annealing_iterations": (50, 500, 300, "SA iterations"),
             "timeout_seconds": (60, 400, 240, "Timeout in seconds"),
         },
+        "LNS": {
+            "max_results": (1, 10, 5, "Maximum schedules to generate"),
+            "max_iterations": (10, 2000, 200, "Destroy/repair iterations"),
+            "neighbourhood_size": (1, 20, 3, "Initial groups freed per iteration"),
+            "repair_budget": (100, 100000, 5000, "DFS nodes per repair"),
+            "timeout_seconds": (10, 300, 120, "Timeout in seconds"),
+        },
         "ConstraintProgramming": {
             "max_results": (1, 50, 10, "Maximum schedules to generate"),
             "timeout_seconds": (60, 600, 300, "Timeout in seconds"),
+            "max_nogoods": (0, 500000, 50000, "Maximum learned nogoods"),
         },
     }
 
@@ -261,6 +293,16 @@ class AlgorithmSelector(QWidget):
         
         common_layout.addWidget(self._create_labeled_row("Max ECTS:", self.max_ects_spin))
         
+        self.min_ects_spin = NoScrollSpinBox()
+        self.min_ects_spin.setRange(0, 50)
+        self.min_ects_spin.setValue(0)
+        self.min_ects_spin.setSuffix(" ECTS")
+        self.min_ects_spin.setMinimumHeight(36)
+        self.min_ects_spin.setToolTip("Minimum ECTS a schedule must reach (0 = no minimum)")
+        self.min_ects_spin.valueChanged.connect(self._emit_parameters)
+        
+        common_layout.addWidget(self._create_labeled_row("Min ECTS:", self.min_ects_spin))
+        
         self.max_conflicts_spin = NoScrollSpinBox()
         self.max_conflicts_spin.setRange(0, 10)
         self.max_conflicts_spin.setValue(1)
@@ -271,6 +313,14 @@ class AlgorithmSelector(QWidget):
         
         common_layout.addWidget(self._create_labeled_row("Max Conflicts:", self.max_conflicts_spin))
         
+        self.diverse_checkbox = QCheckBox("🔀 Diverse Results")
+        self.diverse_checkbox.setMinimumHeight(32)
+        self.diverse_checkbox.setToolTip(
+            "Prefer schedules that differ in more than one section (slower: searches a larger pool)"
+        )
+        self.diverse_checkbox.stateChanged.connect(self._emit_parameters)
+        common_layout.addWidget(self.diverse_checkbox)
+        
         main_layout.addWidget(common_card)
         
         # Add stretch at bottom
@@ -304,8 +354,11 @@ class AlgorithmSelector(QWidget):
                 ("TabuSearch", "Tabu search metaheuristic"),
                 ("IDDFS", "Iterative deepening DFS"),
                 ("Dijkstra", "Dijkstra's algorithm"),
+                ("BeamSearch", "Beam search with bounded width"),
+                ("NSGA-II", "Multi-objective Pareto front"),
                 ("PSO", "Particle swarm optimization"),
                 ("HybridGA+SA", "Hybrid genetic + simulated annealing"),
+                ("LNS", "Large neighbourhood search"),
                 ("ConstraintProgramming", "Constraint programming solver"),
             ]
 
@@ -402,8 +455,10 @@ class AlgorithmSelector(QWidget):
         """Emit current parameter configuration."""
         params = {
             "max_ects": self.max_ects_spin.value(),
+            "min_ects": self.min_ects_spin.value(),
             "allow_conflicts": self.max_conflicts_spin.value() > 0,
             "max_conflicts": self.max_conflicts_spin.value(),
+            "diverse_results": self.diverse_checkbox.isChecked(),
             "lifestyle_mode": self.lifestyle_combo.currentData(),
             "morning_person": self.morning_checkbox.isChecked(),
             "free_day_preference": self.free_day_combo.currentData(),
@@ -10,7 +10,7 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
-from core.models import Schedule
+from core.models import Schedule, unique_schedules
 
 
 def export_to_excel(
@@ -21,7 +21,7 @@ def export_to_excel(
     Export schedules to a multi-sheet Excel file.
 
     Args:
-        schedules: List of Schedule objects to export
+        schedules: List of Schedule objects to export; repeats are written once
         output_path: Path to save the Excel file
 
     Each schedule gets its own sheet with:
@@ -31,6 +31,7 @@ def export_to_excel(
     """
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    schedules = unique_schedules(schedules)
 
     # Create workbook
     wb = Workbook()
@@ -14,6 +14,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING, List, Optional, Tuple
 
+from core.models import unique_schedules
+
 if TYPE_CHECKING:
     from core.models import Course, Schedule
 
@@ -265,7 +267,7 @@ def export_schedules_to_ics(
     Export multiple schedules to separate ICS files.
 
     Args:
-        schedules: List of Schedule objects
+        schedules: List of Schedule objects; repeats are exported once
         output_dir: Directory where ICS files will be saved
         base_name: Base name for the files (will be numbered)
         semester_start: Start date of the semester
@@ -278,7 +280,7 @@ def export_schedules_to_ics(
     output_dir.mkdir(parents=True, exist_ok=True)
 
     created_files = []
-    for i, schedule in enumerate(schedules, start=1):
+    for i, schedule in enumerate(unique_schedules(schedules), start=1):
         file_name = f"{base_name}_{i}.ics"
         file_path = output_dir / file_name
         calendar_name = f"Schedule Option {i}"
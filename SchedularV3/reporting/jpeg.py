@@ -9,7 +9,7 @@ from PyQt6.QtCore import QSize
 from PyQt6.QtGui import QImage, QPainter
 from PyQt6.QtWidgets import QWidget
 
-from core.models import Schedule
+from core.models import Schedule, unique_schedules
 from gui.widgets import ScheduleGrid
 
 
@@ -23,7 +23,7 @@ def save_schedules_as_jpegs(
     Save schedules as JPEG images.
 
     Args:
-        schedules: List of Schedule objects to export
+        schedules: List of Schedule objects to export; repeats are saved once
         output_dir: Directory to save JPEG files
         prefix: Filename prefix for images
         size: Optional size for rendered images (default: 1200x800)
@@ -39,7 +39,7 @@ def save_schedules_as_jpegs(
 
     created_files = []
 
-    for idx, schedule in enumerate(schedules, 1):
+    for idx, schedule in enumerate(unique_schedules(schedules), 1):
         # Create grid widget
         grid = ScheduleGrid()
         grid.set_schedule(schedule)
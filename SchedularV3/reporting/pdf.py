@@ -19,7 +19,7 @@ from reportlab.platypus import (
     PageBreak,
 )
 
-from core.models import Schedule
+from core.models import Schedule, unique_schedules
 
 
 def save_schedules_as_pdf(
@@ -31,12 +31,13 @@ def save_schedules_as_pdf(
     Save schedules as a PDF report.
 
     Args:
-        schedules: List of Schedule objects to export
+        schedules: List of Schedule objects to export; repeats are written once
         output_path: Path to save the PDF file
         title: Title of the PDF document
     """
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    schedules = unique_schedules(schedules)
 
     # Create PDF document
     doc = SimpleDocTemplate(
@@ -1,10 +1,16 @@
 """
 Unit tests for core data models.
 
-Tests Course, Schedule, CourseGroup, and Program dataclasses.
+Tests Course, Schedule, CourseGroup, and Program dataclasses and the compact
+schedule encoding.
 """
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
-from core.models import Course, Schedule, CourseGroup, Program
+from core.database import Database
+from core.models import Course, Schedule, CourseGroup, Program, course_id, unique_schedules
+from core.schedule_codec import CatalogMismatchError, EncodedSchedules, ScheduleCodec
 
 
 class TestCourse:
@@ -273,6 +279,42 @@ class TestSchedule:
         assert stats["conflict_count"] == 0
         assert stats["has_conflicts"] is False
 
+    def test_schedule_identity(self, sample_courses):
+        """Test that identity ignores course order and follows edits."""
+        schedule = Schedule(courses=list(sample_courses))
+        reordered = Schedule(courses=list(reversed(sample_courses)))
+        assert schedule.identity == reordered.identity
+
+        full = schedule.identity
+        schedule.remove_course("PHYS101-01")
+        assert schedule.identity != full
+        schedule.add_course(sample_courses[2])
+        assert schedule.identity == full
+
+        # A section with the same code but other times is a different schedule
+        moved = Course("PHYS101-01", "PHYS101", "Physics I", 6, "Zorunlu", {"Cuma": ["15:00-16:50"]})
+        assert Schedule(sample_courses[:2] + [moved]).identity != full
+        swapped = Schedule(courses=list(sample_courses))
+        assert swapped.identity == full
+        swapped.courses[2] = moved
+        assert swapped.identity != full
+
+        copy = pickle.loads(pickle.dumps(schedule))
+        assert copy._identity is None
+        assert copy.identity == full
+        assert unique_schedules([schedule, reordered, copy, Schedule()]) == [schedule, Schedule()]
+
+    def test_course_ids_are_unique_across_threads(self):
+        """Test that concurrent first lookups never hand out the same ID."""
+        courses = [
+            Course(f"THR{index}-01", f"THR{index}", "Threaded", 5, "lecture", [("Monday", index)])
+            for index in range(400)
+        ]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            ids = list(executor.map(course_id, courses))
+        assert len(set(ids)) == len(courses)
+        assert ids == [course_id(course) for course in courses]
+
 
 class TestCourseGroup:
     """Test cases for CourseGroup dataclass."""
@@ -444,3 +486,104 @@ class TestProgram:
         assert stats["total_schedules"] == 1
         assert stats["name"] == "Test Program"
         assert "metadata" in stats
+
+
+class TestScheduleCodec:
+    """Test cases for the compact schedule encoding."""
+
+    @pytest.fixture
+    def course_groups(self):
+        """Create a catalog of 150 groups with a lecture and a lab each."""
+        groups = {}
+        for index in range(150):
+            main_code = f"C{index:03d}"
+            groups[main_code] = CourseGroup(main_code=main_code, courses=[
+                Course(f"{main_code}.1", main_code, f"Course {index}", 6, "lecture",
+                       [("Monday", index % 10 + 1)]),
+                Course(f"{main_code}-L.1", main_code, f"Course {index} Lab", 0, "lab",
+                       [("Friday", index % 10 + 1)]),
+            ])
+        return groups
+
+    def _schedule(self, course_groups, codes):
+        return Schedule([course for code in codes for course in course_groups[code].courses])
+
+    def test_round_trip(self, course_groups):
+        """Test that decoding restores the courses (in code order)."""
+        codec = ScheduleCodec.from_course_groups(course_groups)
+        schedule = self._schedule(course_groups, ["C149", "C000", "C075"])
+
+        payload = codec.encode(schedule)
+        decoded = codec.decode(payload)
+
+        assert [c.code for c in decoded.courses] == sorted(c.code for c in schedule.courses)
+        assert decoded.courses[0] is course_groups["C000"].courses[1]
+        # Header, count and six deltas, two of them over 127
+        assert len(payload) == 9 + 1 + 8
+        assert codec.decode_text(codec.encode_text(schedule)).get_course_codes() == \
+            schedule.get_course_codes()
+
+    def test_many_and_lazy_list(self, course_groups):
+        """Test batch payloads and the lazily decoded result list."""
+        codec = ScheduleCodec.from_course_groups(course_groups)
+        schedules = [
+            self._schedule(course_groups, [f"C{index:03d}", f"C{index + 1:03d}"])
+            for index in range(0, 100, 2)
+        ] + [Schedule()]
+
+        payload = codec.encode_many(schedules)
+        assert [s.get_course_codes() for s in codec.decode_many(payload)] == \
+            [s.get_course_codes() for s in schedules]
+
+        encoded = EncodedSchedules.from_bytes(codec, payload)
+        assert len(encoded) == len(schedules)
+        assert encoded[7].get_course_codes() == schedules[7].get_course_codes()
+        assert [s.get_course_codes() for s in encoded[-2:]] == \
+            [s.get_course_codes() for s in schedules[-2:]]
+        assert encoded.to_bytes() == payload
+        assert encoded.nbytes == len(payload) - 9
+
+    def test_catalog_mismatch_and_bad_payloads(self, course_groups):
+        """Test that payloads only decode against their own catalog."""
+        codec = ScheduleCodec.from_course_groups(course_groups)
+        payload = codec.encode(self._schedule(course_groups, ["C001"]))
+
+        course_groups["C001"].courses[0].schedule = [("Tuesday", 3)]
+        changed = ScheduleCodec.from_course_groups(course_groups)
+        assert changed.version != codec.version
+        with pytest.raises(CatalogMismatchError):
+            changed.decode(payload)
+        with pytest.raises(ValueError):
+            codec.decode(payload[:-1])
+        with pytest.raises(ValueError):
+            codec.encode(Schedule([Course("X1", "X", "Unknown", 5, "lecture", [])]))
+
+    def test_database_result_set(self, course_groups, tmp_path):
+        """Test storing a result list as one compact blob."""
+        codec = ScheduleCodec.from_course_groups(course_groups)
+        schedules = [self._schedule(course_groups, ["C010", "C020"]), Schedule()]
+
+        with Database(tmp_path / "results.db") as db:
+            db.initialize()
+            result_set_id = db.save_result_set(schedules, codec, name="Fall")
+            loaded = db.get_result_set(result_set_id, codec)
+            assert db.get_result_set(result_set_id + 1, codec) is None
+
+        assert [s.get_course_codes() for s in loaded] == [s.get_course_codes() for s in schedules]
+
+        # An encoded list is only stored under the catalog its payload names
+        other = ScheduleCodec(list(codec.courses)[:-1])
+        with Database(tmp_path / "results.db") as db:
+            db.initialize()
+            with pytest.raises(CatalogMismatchError):
+                db.save_result_set(EncodedSchedules(codec, schedules), other)
+            result_set_id = db.save_result_set(EncodedSchedules(codec, schedules), codec)
+            row = db.conn.execute(
+                "SELECT catalog_version FROM result_sets WHERE id = ?", (result_set_id,)
+            ).fetchone()
+            assert row["catalog_version"] == codec.version_hex
+            listed = db.get_all_result_sets()
+            assert [(r["id"], r["schedule_count"]) for r in listed] == [
+                (result_set_id, 2), (result_set_id - 1, 2)
+            ]
+            assert listed[1]["name"] == "Fall"
@@ -7,8 +7,10 @@ Tests cover:
 - AnnealingOptimizer (simulated annealing optimization)
 - SchedulerPrefs and schedule scoring metrics
 """
+import dataclasses
 import random
 
+import numpy as np
 import pytest
 from core.models import Course, Schedule, CourseGroup
 from algorithms.base_scheduler import BaseScheduler
@@ -16,11 +18,19 @@ from algorithms.constraints import ConstraintUtils
 from algorithms.dfs_scheduler import DFSScheduler
 from algorithms.simulated_annealing import AnnealingOptimizer
 from algorithms.a_star_scheduler import AStarScheduler
-from algorithms.algorithm_selector import select_scheduler
+from algorithms import iter_registered_schedulers
+from algorithms.algorithm_selector import (
+    EXHAUSTIVE_CATEGORIES,
+    RuntimeHistory,
+    auto_select_scheduler,
+    select_scheduler,
+)
 from algorithms.benchmark import AlgorithmBenchmark
+from algorithms.beam_search import LATENCY_TIERS, BeamSearchScheduler
 from algorithms.bfs_scheduler import BFSScheduler
 from algorithms.constraint_programming import ConstraintProgrammingScheduler
-from algorithms.dijkstra_scheduler import DijkstraScheduler
+from algorithms.dijkstra_scheduler import DijkstraScheduler, _PenaltyModel
+from algorithms.diversity import hamming_distance, option_vector
 from algorithms.evaluator import (
     compare_algorithm_outputs,
     evaluate_schedule,
@@ -37,16 +47,30 @@ from algorithms.heuristics import (
     rank_options_by_score,
 )
 from algorithms.iddfs_scheduler import IDDFSScheduler
-from algorithms.parallel_executor import run_algorithms_parallel
+from algorithms.lns_scheduler import LargeNeighbourhoodSearchScheduler
+from algorithms.nsga2 import OBJECTIVES, NSGA2Scheduler, non_dominated_sort
+from algorithms.incremental import IncrementalScorer, OptionTable
+from algorithms.parallel_executor import run_algorithms_parallel, run_variants_parallel
+from algorithms.parallel_tempering import ParallelTemperingScheduler
 from algorithms.particle_swarm import ParticleSwarmScheduler
 from algorithms.simulated_annealing_scheduler import SimulatedAnnealingScheduler
 from algorithms.tabu_search import TabuSearchScheduler
+from algorithms.tuning import (
+    TUNING_SPACES,
+    TuningInstance,
+    TuningProfiles,
+    TuningResult,
+    tune_algorithm,
+    tune_corpus,
+    tuned_parameters,
+)
 from utils.schedule_metrics import (
     SchedulerPrefs, compute_schedule_stats, score_schedule,
     meets_weekly_hours_constraint, meets_daily_hours_constraint,
     meets_free_day_constraint, analyze_schedule_efficiency,
     compare_schedules
 )
+from utils.result_cache import ResultCache, identity_owners
 
 
 @pytest.fixture
@@ -561,17 +585,422 @@ class TestAdditionalSchedulers:
         scheduler = BFSScheduler(max_results=2, max_ects=30)
         schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
         assert schedules
+        assert scheduler.last_run_stats["peak_frontier"] >= 1
+        assert not scheduler.last_run_stats["beam_mode"]
+
+    def test_bfs_scheduler_frontier_cap(self, course_groups):
+        scheduler = BFSScheduler(max_results=2, max_ects=30, max_frontier=1)
+        schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
+        assert schedules
+        assert scheduler.last_run_stats["beam_mode"]
+        assert scheduler.last_run_stats["peak_frontier"] == 1
+
+    def test_bfs_frontier_carries_partial_cost(self, course_groups, monkeypatch):
+        mandatory = {"COMP1007", "COMP1111"}
+        optional = {"MATH1101", "PHYS1101"}
+        scheduler = BFSScheduler(max_results=5, max_ects=40, max_frontier=2)
+        table = OptionTable(scheduler._prepare_search_space(course_groups, mandatory, optional))
+        truncate = BFSScheduler._truncate_frontier
+        seen = []
+
+        def checked(self, frontier):
+            for indices, _, _, _, cost in frontier:
+                scorer = IncrementalScorer(self.scheduler_prefs)
+                for group, index in zip(table.group_keys, indices):
+                    scorer.add(table.get(group, index))
+                assert cost == pytest.approx(scorer.cost())
+            seen.append(len(frontier))
+            return truncate(self, frontier)
+
+        monkeypatch.setattr(BFSScheduler, "_truncate_frontier", checked)
+        assert scheduler.generate_schedules(course_groups, mandatory, optional)
+        assert seen
 
     def test_iddfs_scheduler(self, course_groups):
         scheduler = IDDFSScheduler(max_results=2, max_ects=30, depth_increment=1)
         schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
         assert schedules
 
+    def test_iddfs_transposition_table(self, course_groups):
+        mandatory = {"COMP1007", "COMP1111"}
+        optional = set(course_groups) - mandatory
+        exhaustive = DFSScheduler(max_results=100, max_ects=40)
+        every = exhaustive.generate_schedules(course_groups, mandatory, optional)
+        best = sorted(score_schedule(s, exhaustive.scheduler_prefs) for s in every)[::-1][:3]
+
+        scheduler = IDDFSScheduler(max_results=3, max_ects=40, depth_increment=2)
+        schedules = scheduler.generate_schedules(course_groups, mandatory, optional)
+        scores = [score_schedule(s, scheduler.scheduler_prefs) for s in schedules]
+        assert scores == pytest.approx(best)
+        stats = scheduler.last_run_stats
+        assert stats["table_hits"] > 0
+        assert 0 < stats["table_entries"] <= scheduler.table_size
+
     def test_a_star_scheduler(self, course_groups):
         scheduler = AStarScheduler(max_results=2, max_ects=30)
         schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
         assert schedules
 
+    def test_a_star_returns_best_scores(self, course_groups):
+        mandatory = {"COMP1007", "COMP1111"}
+        optional = set(course_groups) - mandatory
+        exhaustive = DFSScheduler(max_results=100, max_ects=40)
+        every = exhaustive.generate_schedules(course_groups, mandatory, optional)
+        best = sorted(score_schedule(s, exhaustive.scheduler_prefs) for s in every)[::-1][:3]
+
+        for max_open_nodes in (500_000, 1):
+            scheduler = AStarScheduler(max_results=3, max_ects=40, max_open_nodes=max_open_nodes)
+            schedules = scheduler.generate_schedules(course_groups, mandatory, optional)
+            scores = [score_schedule(s, scheduler.scheduler_prefs) for s in schedules]
+            assert scores == pytest.approx(best)
+        assert scheduler.last_run_stats["memory_fallback"]
+
+    def test_beam_search_scheduler(self, course_groups):
+        mandatory = {"COMP1007", "COMP1111"}
+        optional = set(course_groups) - mandatory
+        exhaustive = DFSScheduler(max_results=100, max_ects=40)
+        every = exhaustive.generate_schedules(course_groups, mandatory, optional)
+        best = max(score_schedule(s, exhaustive.scheduler_prefs) for s in every)
+
+        scheduler = BeamSearchScheduler(max_results=3, max_ects=40, beam_width=16)
+        schedules = scheduler.generate_schedules(course_groups, mandatory, optional)
+        assert schedules
+        assert score_schedule(schedules[0], scheduler.scheduler_prefs) == pytest.approx(best)
+        assert scheduler.last_run_stats["peak_candidates"] > 0
+
+    def test_beam_search_latency_tiers(self):
+        assert BeamSearchScheduler(latency_tier="fast").beam_width == LATENCY_TIERS["fast"]
+        with pytest.raises(ValueError):
+            BeamSearchScheduler(latency_tier="sometime")
+
+    def test_lns_scheduler(self, course_groups):
+        mandatory = {"COMP1007", "COMP1111"}
+        optional = set(course_groups) - mandatory
+        exhaustive = DFSScheduler(max_results=100, max_ects=40)
+        every = exhaustive.generate_schedules(course_groups, mandatory, optional)
+        best = max(score_schedule(s, exhaustive.scheduler_prefs) for s in every)
+
+        scheduler = LargeNeighbourhoodSearchScheduler(
+            max_results=2, max_ects=40, neighbourhood_size=1, repair_budget=3, seed=5
+        )
+        schedules = scheduler.generate_schedules(course_groups, mandatory, optional)
+        assert schedules
+        assert score_schedule(schedules[0], scheduler.scheduler_prefs) == pytest.approx(best)
+        stats = scheduler.last_run_stats
+        assert stats["best_cost"] == pytest.approx(-best)
+        assert stats["proven_optimal"]
+
+    def test_nsga2_pareto_front(self, course_groups):
+        mandatory = {"COMP1007", "COMP1111"}
+        optional = set(course_groups) - mandatory
+        scheduler = NSGA2Scheduler(
+            max_results=20, max_ects=40, population_size=16, generations=10, seed=3
+        )
+        schedules = scheduler.generate_schedules(course_groups, mandatory, optional)
+        assert schedules
+        assert all(scheduler._is_valid_final_schedule(s) for s in schedules)
+
+        front = scheduler.last_pareto_front
+        assert front and len(front) <= scheduler.last_run_stats["front_size"]
+        vectors = [[entry["objectives"][name] for name in OBJECTIVES] for entry in front]
+        assert len(non_dominated_sort(np.array(vectors))) == 1
+
+    def test_non_dominated_sort(self):
+        fronts = non_dominated_sort(np.array([[1, 2], [2, 1], [2, 2], [3, 3], [1, 1]]))
+        assert [sorted(front.tolist()) for front in fronts] == [[4], [0, 1], [2], [3]]
+
+    def test_warm_start_pins_and_incumbents(self, course_groups):
+        mandatory = {"COMP1007", "COMP1111"}
+        pins = {"COMP1111-L.2", "MATH1101.1"}
+        scheduler = DFSScheduler(max_results=10, max_ects=40)
+        scheduler.warm_start(pinned_sections=pins)
+        schedules = scheduler.generate_schedules(course_groups, mandatory, {"MATH1101", "PHYS1101"})
+        assert schedules
+        assert all(pins <= {course.code for course in s.courses} for s in schedules)
+        assert scheduler.last_run_stats["pinned_groups"] == 2
+
+        cold = AStarScheduler(max_results=3, max_ects=40)
+        previous = cold.generate_schedules(course_groups, mandatory, {"MATH1101", "PHYS1101"})
+        warm = AStarScheduler(max_results=3, max_ects=40)
+        warm.warm_start(previous_results=previous)
+        again = warm.generate_schedules(course_groups, mandatory, {"MATH1101", "PHYS1101"})
+        assert warm.last_run_stats["warm_start_incumbents"] == len(previous)
+        assert [score_schedule(s, warm.scheduler_prefs) for s in again] == pytest.approx(
+            [score_schedule(s, cold.scheduler_prefs) for s in previous]
+        )
+        assert warm.last_run_stats["nodes_explored"] <= cold.last_run_stats["nodes_explored"]
+
+        # A reloaded catalog moves COMP1111.1; incumbents must use the new times
+        moved = [("Wednesday", 6), ("Wednesday", 7), ("Wednesday", 8)]
+        reloaded = {
+            code: CourseGroup(main_code=code, courses=[
+                dataclasses.replace(course, schedule=moved)
+                if course.code == "COMP1111.1" else dataclasses.replace(course)
+                for course in group.courses
+            ])
+            for code, group in course_groups.items()
+        }
+        current = {id(course) for group in reloaded.values() for course in group.courses}
+        warm = AStarScheduler(max_results=10, max_ects=40)
+        warm.warm_start(previous_results=previous)
+        again = warm.generate_schedules(reloaded, mandatory, {"MATH1101", "PHYS1101"})
+        assert warm.last_run_stats["warm_start_incumbents"] > 0
+        assert all(id(course) in current for s in again for course in s.courses)
+        assert len({s.identity for s in again}) == len(again)
+
+        # Pins of deselected courses are reported, not forced back in
+        scheduler.warm_start(pinned_sections={"COMP1111-L.2", "PHYS1101.1"})
+        schedules = scheduler.generate_schedules(course_groups, mandatory, {"MATH1101"})
+        assert schedules
+        assert all("PHYS1101" not in {c.main_code for c in s.courses} for s in schedules)
+        assert scheduler.last_run_stats["ignored_pins"] == ["PHYS1101.1"]
+        assert scheduler.last_run_stats["pinned_groups"] == 1
+
+        scheduler.warm_start(pinned_sections={"COMP1111-L.1", "COMP1111-L.2"})
+        assert scheduler.generate_schedules(course_groups, mandatory) == []
+        assert scheduler.last_run_stats["unsatisfiable_pins"] == ["COMP1111-L.1", "COMP1111-L.2"]
+
+    def test_symmetry_breaking(self):
+        def lecture(code, slot):
+            main_code = code.split(".")[0]
+            return Course(code=code, main_code=main_code, name=main_code, ects=5,
+                          course_type="lecture", schedule=[slot], teacher=f"T{code}")
+
+        courses = [lecture("CORE.1", ("Monday", 1)), lecture("CORE.2", ("Tuesday", 1))]
+        for elective in ("ELEC1", "ELEC2", "ELEC3"):
+            # Two teachers at the same time plus a different slot
+            courses += [
+                lecture(f"{elective}.1", ("Wednesday", 2)),
+                lecture(f"{elective}.2", ("Wednesday", 2)),
+                lecture(f"{elective}.3", ("Thursday", 3)),
+            ]
+        groups = {}
+        for course in courses:
+            groups.setdefault(course.main_code, CourseGroup(course.main_code)).courses.append(course)
+        electives = {"ELEC1", "ELEC2", "ELEC3"}
+
+        # CORE x {no elective, Wednesday, Thursday, both}
+        for cls in (DFSScheduler, BFSScheduler, ConstraintProgrammingScheduler, AStarScheduler):
+            scheduler = cls(max_results=100, max_ects=40)
+            scheduler.collapse_identical_sections = True
+            schedules = scheduler.generate_schedules(groups, {"CORE"}, electives)
+            assert len(schedules) == 8, cls.__name__
+            stats = scheduler.last_run_stats
+            assert stats["collapsed_sections"] == 3
+            assert stats["symmetric_chains"] == 1
+            if cls is not AStarScheduler:
+                # Ordering constraints leave no equivalent schedules to drop
+                assert stats["canonical_duplicates"] == 0
+
+        # Algorithms without ordering constraints still fill max_results
+        for cls in (AStarScheduler, IDDFSScheduler, DijkstraScheduler, BeamSearchScheduler):
+            scheduler = cls(max_results=8, max_ects=40)
+            scheduler.collapse_identical_sections = True
+            schedules = scheduler.generate_schedules(groups, {"CORE"}, electives)
+            assert len(schedules) == 8, cls.__name__
+            assert scheduler.last_run_stats["symmetry_pool_factor"] == 6
+
+        # A diverse run shares the enlarged pool instead of compounding factors
+        scheduler = AStarScheduler(max_results=2, max_ects=40)
+        scheduler.collapse_identical_sections = True
+        scheduler.diversify_results(pool_factor=4)
+        requested = []
+        run = scheduler._run_algorithm
+        scheduler._run_algorithm = lambda search: requested.append(scheduler.max_results) or run(search)
+        assert len(scheduler.generate_schedules(groups, {"CORE"}, electives)) == 2
+        assert requested == [2 * 6]
+
+        # By default, same-time sections with other teachers stay apart
+        exact = DFSScheduler(max_results=100, max_ects=40)
+        schedules = exact.generate_schedules(groups, {"CORE"}, electives)
+        assert len(schedules) == 2 * 22
+        assert exact.last_run_stats["collapsed_sections"] == 0
+        assert exact.last_run_stats["symmetric_chains"] == 0
+
+        # Counting and sampling always cover the uncollapsed space
+        scheduler = DFSScheduler(max_results=100, max_ects=40)
+        scheduler.collapse_identical_sections = True
+        assert scheduler.count_valid_schedules(groups, {"CORE"}, electives) == 2 * 22
+        samples = scheduler.sample_valid_schedules(
+            groups, {"CORE"}, electives, count=200, rng=random.Random(1)
+        )
+        assert any(f"{e}.2" in {c.code for c in s.courses} for s in samples for e in electives)
+
+    def test_diverse_top_k(self, course_groups):
+        mandatory = {"COMP1007", "COMP1111"}
+        optional = {"MATH1101", "PHYS1101"}
+
+        def min_distance(schedules):
+            vectors = [option_vector(schedule) for schedule in schedules]
+            return min(
+                hamming_distance(a, b) for i, a in enumerate(vectors) for b in vectors[i + 1:]
+            )
+
+        plain = AStarScheduler(max_results=3, max_ects=40)
+        top = plain.generate_schedules(course_groups, mandatory, optional)
+        diverse = AStarScheduler(max_results=3, max_ects=40)
+        diverse.diversify_results(tolerance=1.0)
+        spread = diverse.generate_schedules(course_groups, mandatory, optional)
+
+        assert len(spread) == 3
+        assert score_schedule(spread[0], diverse.scheduler_prefs) == pytest.approx(
+            score_schedule(top[0], plain.scheduler_prefs)
+        )
+        assert min_distance(spread) >= min_distance(top)
+        assert diverse.last_run_stats["diversity_pool"] > 3
+        assert diverse.max_results == 3
+
+    def test_infeasibility_core(self, course_groups, monkeypatch):
+        def group(code, *slots):
+            return CourseGroup(main_code=code, courses=[
+                Course(code=f"{code}.{i}", main_code=code, name=code, ects=3,
+                       course_type="lecture", schedule=[slot])
+                for i, slot in enumerate(slots, 1)
+            ])
+
+        # Three groups competing for the two COMP1007 time slots: every pair fits
+        groups = dict(course_groups)
+        groups["ELEC1"] = group("ELEC1", ("Tuesday", 4), ("Monday", 2))
+        groups["ELEC2"] = group("ELEC2", ("Tuesday", 4), ("Monday", 2))
+        groups["CLASH"] = group("CLASH", ("Tuesday", 7))
+        monkeypatch.setattr(
+            DFSScheduler, "_run_algorithm",
+            lambda self, search: pytest.fail("search ran on an infeasible request"),
+        )
+
+        scheduler = DFSScheduler(max_results=5, max_ects=40)
+        mandatory = {"COMP1007", "COMP1111", "MATH1101", "ELEC1", "ELEC2"}
+        assert scheduler.generate_schedules(groups, mandatory) == []
+        stats = scheduler.last_run_stats
+        assert stats["status"] == "infeasible"
+        assert sorted(stats["infeasible_core"]) == ["COMP1007", "ELEC1", "ELEC2"]
+        assert any("ELEC1" in reason for reason in scheduler.analyze_failure(groups))
+
+        scheduler.generate_schedules(groups, {"COMP1111", "CLASH", "MATH1101"})
+        assert sorted(scheduler.last_run_stats["infeasible_core"]) == ["CLASH", "COMP1111"]
+
+        tight = DFSScheduler(max_ects=10)
+        tight.generate_schedules(groups, {"COMP1007", "COMP1111", "PHYS1101"})
+        assert sorted(tight.last_run_stats["infeasible_core"]) == ["COMP1111", "PHYS1101"]
+        assert "ECTS" in tight.analyze_failure(groups)[0]
+
+        free = DFSScheduler(
+            max_ects=40,
+            scheduler_prefs=SchedulerPrefs(desired_free_days=["Friday"], strict_free_days=True),
+        )
+        free.generate_schedules(groups, {"COMP1007", "PHYS1101"})
+        assert free.last_run_stats["infeasible_core"] == ["PHYS1101"]
+
+    def test_ects_knapsack_bounds(self, course_groups):
+        mandatory = {"COMP1007", "COMP1111"}
+        optional = {"MATH1101", "PHYS1101"}
+
+        def codes(schedules):
+            return {frozenset(course.code for course in s.courses) for s in schedules}
+
+        reference = DFSScheduler(max_results=100, max_ects=17)
+        everything = reference.generate_schedules(course_groups, mandatory, optional)
+        expected = codes(s for s in everything if s.total_credits >= 14)
+        assert expected and expected != codes(everything)
+
+        for scheduler_cls in (
+            DFSScheduler, BFSScheduler, IDDFSScheduler,
+            ConstraintProgrammingScheduler, AStarScheduler,
+        ):
+            scheduler = scheduler_cls(max_results=100, max_ects=17, min_ects=14)
+            schedules = scheduler.generate_schedules(course_groups, mandatory, optional)
+            assert codes(schedules) == expected, scheduler_cls.__name__
+
+        # Too-small leaves must not fill the top-k and prune valid completions
+        iddfs = IDDFSScheduler(max_results=5, max_ects=17, min_ects=12)
+        schedules = iddfs.generate_schedules(course_groups, mandatory, optional)
+        assert len(schedules) == 5
+        assert all(s.total_credits >= 12 for s in schedules)
+
+        # Local searches must not settle on a best schedule below the minimum
+        for scheduler in (
+            TabuSearchScheduler(max_ects=17, min_ects=14),
+            HillClimbingScheduler(max_ects=17, min_ects=14, seed=1),
+            ParticleSwarmScheduler(max_ects=17, min_ects=14, seed=1),
+            LargeNeighbourhoodSearchScheduler(max_ects=17, min_ects=14, seed=1),
+            BeamSearchScheduler(max_ects=17, min_ects=14),
+        ):
+            schedules = scheduler.generate_schedules(course_groups, mandatory, optional)
+            assert schedules, type(scheduler).__name__
+            assert codes(schedules) <= expected, type(scheduler).__name__
+
+        search = reference._prepare_search_space(course_groups, mandatory, optional)
+        bounds = search.ects_bounds
+        # Both mandatory groups still need 9 ECTS before anything is chosen
+        assert bounds.min_needed[0] == 9
+        assert not bounds.allows(0, 9)
+
+        dfs = DFSScheduler(max_results=100, max_ects=9)
+        dfs.generate_schedules(course_groups, mandatory, optional)
+        assert dfs.last_run_stats["pruned_branches"] > 0
+
+        short = DFSScheduler(max_ects=40, min_ects=30)
+        assert short.generate_schedules(course_groups, mandatory, optional) == []
+        assert short.last_run_stats["status"] == "infeasible"
+
+    def test_run_variants_parallel(self, course_groups):
+        variants = [
+            ({"COMP1007", "COMP1111"}, {"MATH1101", "PHYS1101"}),
+            ({"COMP1111", "COMP1007"}, {"MATH1101", "PHYS1101", "COMP1007"}),
+            ({"COMP1007"}, {"PHYS1101"}),
+            ({"COMP1111", "PHYS1101", "MATH1101"}, None),
+        ]
+
+        def codes(schedules):
+            return {frozenset(course.code for course in s.courses) for s in schedules}
+
+        for use_multiprocessing in (False, True):
+            results = run_variants_parallel(
+                "DFS", course_groups, variants, max_workers=2,
+                use_multiprocessing=use_multiprocessing, max_results=20, max_ects=11,
+            )
+            assert len(results) == len(variants)
+            # Variants equal up to order and redundant optional codes are solved once
+            assert results[0][0] is results[1][0]
+            for (mandatory, optional), (scheduler, schedules) in zip(variants, results):
+                alone = DFSScheduler(max_results=20, max_ects=11).generate_schedules(
+                    course_groups, mandatory, optional
+                )
+                assert codes(schedules) == codes(alone)
+            assert results[3][1] == []
+            assert results[3][0].last_run_stats["status"] == "infeasible"
+
+    def test_seeded_runs_are_reproducible(self, course_groups):
+        factories = [
+            lambda seed: GeneticAlgorithmScheduler(
+                max_results=3, population_size=12, generations=8, seed=seed
+            ),
+            lambda seed: ParticleSwarmScheduler(max_results=3, iterations=10, seed=seed),
+            lambda seed: SimulatedAnnealingScheduler(max_results=3, iterations=200, seed=seed),
+            lambda seed: NSGA2Scheduler(population_size=12, generations=6, seed=seed),
+            lambda seed: LargeNeighbourhoodSearchScheduler(max_iterations=20, seed=seed),
+            lambda seed: ParallelTemperingScheduler(
+                epochs=4, swap_interval=10, use_multiprocessing=False, seed=seed
+            ),
+            lambda seed: HillClimbingScheduler(restarts=3, use_multiprocessing=False, seed=seed),
+        ]
+        mandatory = {"COMP1007", "COMP1111"}
+        optional = {"MATH1101", "PHYS1101"}
+
+        def run(scheduler):
+            schedules = scheduler.generate_schedules(course_groups, mandatory, optional)
+            return [[course.code for course in schedule.courses] for schedule in schedules]
+
+        random.seed(1)
+        for factory in factories:
+            scheduler = factory(11)
+            first = run(scheduler)
+            # Global random state and earlier runs of the same instance must not matter
+            random.random()
+            assert run(scheduler) == first
+            assert run(factory(11)) == first
+            assert scheduler.last_run_stats["seed"] == 11
+
     def test_greedy_scheduler(self, course_groups):
         scheduler = GreedyScheduler(max_results=1, max_ects=30)
         schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
@@ -582,6 +1011,31 @@ class TestAdditionalSchedulers:
         schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
         assert schedules
 
+    def test_dijkstra_incremental_cost(self, course_groups):
+        mandatory = {"COMP1007", "COMP1111"}
+        scheduler = DijkstraScheduler(max_results=5, max_ects=40)
+        search = scheduler._prepare_search_space(
+            course_groups, mandatory, set(course_groups) - mandatory
+        )
+        table = OptionTable(search)
+        penalties = _PenaltyModel(table)
+
+        cost, occupied, conflicts, courses = 0, 0, 0, []
+        for group in table.group_keys:
+            for option in table.options[group]:
+                if option is None:
+                    continue
+                new_conflicts = conflicts | (occupied & option.mask) | option.overlap_mask
+                cost += penalties.edge_cost(option, occupied, conflicts, new_conflicts)
+                occupied, conflicts = occupied | option.mask, new_conflicts
+                courses.extend(option.courses)
+                assert cost == estimate_conflict_penalty(Schedule(courses))
+
+        schedules = scheduler.generate_schedules(course_groups, mandatory)
+        assert schedules
+        stats = scheduler.last_run_stats
+        assert 0 < stats["distinct_nodes"] <= stats["nodes_explored"]
+
     def test_simulated_annealing_scheduler(self, course_groups):
         scheduler = SimulatedAnnealingScheduler(annealing_iterations=50)
         schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
@@ -592,26 +1046,115 @@ class TestAdditionalSchedulers:
         schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
         assert schedules
 
+    def test_hill_climbing_multi_start(self, course_groups):
+        scheduler = HillClimbingScheduler(
+            max_results=3, max_iterations=10, restarts=6, use_multiprocessing=False, seed=7
+        )
+        schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
+        stats = scheduler.last_run_stats
+        assert schedules
+        assert stats["restarts"] == 6
+        assert stats["local_optima"] + stats["duplicate_optima"] == 6
+        signatures = {frozenset(c.code for c in schedule.courses) for schedule in schedules}
+        assert len(signatures) == len(schedules)
+        assert stats["best_cost"] == pytest.approx(
+            -score_schedule(schedules[0], scheduler.scheduler_prefs)
+        )
+
+    def test_hill_climbing_multi_start_process_pool(self, course_groups):
+        scheduler = HillClimbingScheduler(max_iterations=5, restarts=4, max_workers=2)
+        schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
+        assert schedules
+        assert scheduler.last_run_stats["restarts"] == 4
+
     def test_tabu_search_scheduler(self, course_groups):
         scheduler = TabuSearchScheduler(max_iterations=10, tabu_tenure=4)
         schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
         assert schedules
+        assert scheduler.last_run_stats["best_cost"] == pytest.approx(
+            -score_schedule(schedules[0], scheduler.scheduler_prefs)
+        )
 
     def test_genetic_algorithm_scheduler(self, course_groups):
-        random.seed(42)
-        scheduler = GeneticAlgorithmScheduler(population_size=8, generations=8)
+        scheduler = GeneticAlgorithmScheduler(population_size=8, generations=8, seed=42)
         schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
         assert schedules
+        assert scheduler.last_run_stats["seeded_population"]
+
+    def test_count_and_sample_valid_schedules(self, course_groups):
+        mandatory = {"COMP1007", "COMP1111"}
+        optional = set(course_groups) - mandatory
+        for allow_conflicts, min_ects in ((False, 0), (True, 0), (False, 14)):
+            scheduler = DFSScheduler(
+                max_results=1000, max_ects=40, allow_conflicts=allow_conflicts, min_ects=min_ects
+            )
+            every = scheduler.generate_schedules(course_groups, mandatory, optional)
+            valid = {frozenset(course.code for course in s.courses) for s in every}
+            assert scheduler.count_valid_schedules(course_groups, mandatory, optional) == len(valid)
+
+            samples = scheduler.sample_valid_schedules(
+                course_groups, mandatory, optional, count=50, rng=random.Random(3)
+            )
+            assert len(samples) == 50
+            assert {frozenset(course.code for course in s.courses) for s in samples} <= valid
+            assert all(s.total_credits >= min_ects for s in samples)
 
     def test_particle_swarm_scheduler(self, course_groups):
-        random.seed(42)
-        scheduler = ParticleSwarmScheduler(swarm_size=8, iterations=12)
+        scheduler = ParticleSwarmScheduler(swarm_size=8, iterations=12, seed=42)
         schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
         assert schedules
+        stats = scheduler.last_run_stats
+        # Each distinct position is decoded once; repeats come from the cache
+        assert stats["nodes_explored"] < 8 * 12
+        assert stats["cache_hits"] > 0
+        assert stats["best_cost"] == pytest.approx(
+            -score_schedule(schedules[0], scheduler.scheduler_prefs)
+        )
 
     def test_hybrid_ga_sa_scheduler(self, course_groups):
-        random.seed(42)
-        scheduler = HybridGASAScheduler(population_size=8, generations=6, annealing_iterations=80)
+        scheduler = HybridGASAScheduler(
+            population_size=8, generations=6, annealing_iterations=80, use_multiprocessing=False,
+            seed=42,
+        )
+        schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
+        assert schedules
+        signatures = {frozenset(c.code for c in schedule.courses) for schedule in schedules}
+        assert len(signatures) == len(schedules)
+
+    def test_hybrid_ga_sa_parallel_refinement(self, course_groups):
+        mandatory = {"COMP1007", "COMP1111"}
+        elites = DFSScheduler(max_results=3).generate_schedules(course_groups, mandatory)
+        scheduler = HybridGASAScheduler(annealing_iterations=40, max_workers=2, seed=42)
+        search = scheduler._prepare_search_space(course_groups, mandatory)
+        optimizer = AnnealingOptimizer(iterations=40, scheduler_prefs=scheduler.scheduler_prefs)
+        refined = scheduler._refine_elites(optimizer, elites, search, remaining=30.0)
+        assert len(refined) == len(elites)
+        assert scheduler.last_run_stats["refinement_workers"] == 2
+        # Three tasks on two workers take two waves
+        assert scheduler.last_run_stats["refinement_budget"] == pytest.approx(15.0)
+
+    def test_hybrid_ga_sa_reserves_refinement_budget(self, course_groups):
+        scheduler = HybridGASAScheduler(
+            timeout_seconds=1, population_size=8, generations=10**6, annealing_iterations=5,
+            use_multiprocessing=False, seed=42,
+        )
+        schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
+        assert schedules
+        stats = scheduler.last_run_stats
+        assert stats["ga_timeout_reached"]
+        # The GA stops at its share, leaving roughly a quarter for refinement
+        assert stats["refinement_budget"] > 0.1
+
+    def test_parallel_tempering_scheduler(self, course_groups):
+        scheduler = ParallelTemperingScheduler(
+            replicas=3, epochs=4, swap_interval=10, use_multiprocessing=False, seed=42
+        )
+        schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
+        assert schedules
+        assert scheduler.last_run_stats["epochs"] == 4
+
+    def test_parallel_tempering_process_pool(self, course_groups):
+        scheduler = ParallelTemperingScheduler(replicas=2, epochs=2, swap_interval=5, max_workers=2)
         schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
         assert schedules
 
@@ -620,6 +1163,45 @@ class TestAdditionalSchedulers:
         schedules = scheduler.generate_schedules(course_groups, {"COMP1007", "COMP1111"})
         assert schedules
 
+    def test_constraint_programming_matches_dfs(self, course_groups):
+        mandatory = {"COMP1007", "COMP1111"}
+        optional = set(course_groups) - mandatory
+        exhaustive = DFSScheduler(max_results=100, max_ects=40)
+        expected = {
+            frozenset(course.code for course in schedule.courses)
+            for schedule in exhaustive.generate_schedules(course_groups, mandatory, optional)
+        }
+
+        scheduler = ConstraintProgrammingScheduler(max_results=100, max_ects=40)
+        schedules = scheduler.generate_schedules(course_groups, mandatory, optional)
+        assert {frozenset(course.code for course in s.courses) for s in schedules} == expected
+
+    def test_constraint_programming_proves_infeasibility(self):
+        groups = {}
+        for index in range(12):
+            code = f"OPT{index:02d}"
+            slot = (("Tuesday", "Wednesday", "Thursday")[index % 3], 1 + index // 3)
+            course = Course(f"{code}.1", code, "Optional", 1, "lecture", [slot])
+            groups[code] = CourseGroup(code, [course])
+        # Every section of the two mandatory courses meets on Monday at period 1
+        for code in ("MANDA", "MANDB"):
+            sections = [
+                Course(f"{code}.{k}", code, "Mandatory", 6, "lecture", [("Monday", 1), ("Monday", 2 + k)])
+                for k in range(6)
+            ]
+            groups[code] = CourseGroup(code, sections)
+
+        mandatory = {"MANDA", "MANDB"}
+        scheduler = ConstraintProgrammingScheduler(max_ects=60, timeout_seconds=60)
+        # Exercise the engine's own proof rather than the pre-check
+        scheduler.check_feasibility = False
+        schedules = scheduler.generate_schedules(groups, mandatory, set(groups) - mandatory)
+        stats = scheduler.last_run_stats
+        assert schedules == []
+        assert stats["proven_infeasible"]
+        assert stats["backjumps"] > 0
+        assert stats["nodes_explored"] < 100
+
 
 class TestHeuristicsAndUtilities:
     """Validate heuristic helpers and utility layers."""
@@ -633,6 +1215,27 @@ class TestHeuristicsAndUtilities:
         assert remaining > 0
         assert 0 <= density <= 1
 
+    def test_incremental_scorer_matches_score_schedule(self, course_groups):
+        prefs = SchedulerPrefs(compress_classes=True, desired_free_days=["Friday"])
+        scheduler = DFSScheduler(max_results=1)
+        search = scheduler._prepare_search_space(course_groups, {"COMP1007", "COMP1111"}, {"PHYS1101"})
+        table = OptionTable(search)
+        scorer = IncrementalScorer(prefs)
+        assignment = {group: len(table.options[group]) - 1 for group in table.group_keys}
+        for group, index in assignment.items():
+            scorer.add(table.get(group, index))
+
+        schedule = table.to_schedule(assignment)
+        assert scorer.cost() == pytest.approx(-score_schedule(schedule, prefs))
+        assert scorer.conflicts == schedule.conflict_count
+
+        old, new = table.get("COMP1007", 1), table.get("COMP1007", 0)
+        cost, _, ects, _ = scorer.evaluate_swap(old, new)
+        assignment["COMP1007"] = 0
+        swapped = table.to_schedule(assignment)
+        assert cost == pytest.approx(-score_schedule(swapped, prefs))
+        assert ects == swapped.total_credits
+
     def test_rank_options_by_score(self, sample_courses):
         base = [sample_courses[0]]
         options = [None, [sample_courses[2]], [sample_courses[5]]]
@@ -652,11 +1255,83 @@ class TestHeuristicsAndUtilities:
         cls = select_scheduler({"optimal": True, "category": "complete-search"})
         assert issubclass(cls, BaseScheduler)
 
+    def test_auto_select_scheduler(self, course_groups, tmp_path):
+        mandatory = {"COMP1007", "COMP1111"}
+        probe = DFSScheduler(max_ects=40)
+        selection = auto_select_scheduler(probe, course_groups, mandatory, {"MATH1101"})
+        assert selection.estimate.exact_count == 8
+        assert selection.estimate.bucket == "tiny"
+        assert selection.meets_target and selection.scheduler_cls.metadata.optimal
+
+        # Measured slow runs of exhaustive searches rule them out for the bucket
+        history = RuntimeHistory(tmp_path / "history.json")
+        for scheduler_cls in iter_registered_schedulers():
+            metadata = scheduler_cls.metadata
+            slow = metadata.optimal or metadata.category in EXHAUSTIVE_CATEGORIES
+            history.record(metadata.name, "tiny", 60.0 if slow else 0.1, best_score=1.0)
+        history.save()
+
+        selection = auto_select_scheduler(
+            probe, course_groups, mandatory, {"MATH1101"},
+            latency_target=1.0, history=RuntimeHistory(tmp_path / "history.json"),
+        )
+        assert selection.measured and selection.predicted_seconds == pytest.approx(0.1)
+        assert not selection.scheduler_cls.metadata.optimal
+
+        # Scores measured on other selections do not decide between algorithms
+        other = next(
+            cls for cls in iter_registered_schedulers()
+            if cls is not selection.scheduler_cls and not cls.metadata.optimal
+            and cls.metadata.category not in EXHAUSTIVE_CATEGORIES
+        )
+        history.record(other.metadata.name, "tiny", 0.1, best_score=1000.0)
+        again = auto_select_scheduler(
+            probe, course_groups, mandatory, {"MATH1101"}, latency_target=1.0, history=history,
+        )
+        assert again.scheduler_cls is selection.scheduler_cls
+
     def test_benchmark(self, course_groups):
         benchmark = AlgorithmBenchmark(course_groups, ["COMP1007", "COMP1111"])
         results = benchmark.run(["DFS", "BFS"], per_algorithm_kwargs={"BFS": {"max_results": 1}})
         assert "DFS" in results and "BFS" in results
 
+    def test_benchmark_seeded_repeats(self, course_groups):
+        benchmark = AlgorithmBenchmark(course_groups, ["COMP1007"], ["MATH1101", "PHYS1101"])
+        kwargs = {"Genetic": {"population_size": 10, "generations": 5}}
+        first = benchmark.run(["Genetic", "DFS"], per_algorithm_kwargs=kwargs, seeds=[0, 1, 2])
+        second = benchmark.run(["Genetic", "DFS"], per_algorithm_kwargs=kwargs, seeds=[0, 1, 2])
+        assert first["Genetic"]["runs"] == 3 and first["DFS"]["runs"] == 3
+        assert first["Genetic"]["best_score"] == second["Genetic"]["best_score"]
+        assert first["Genetic"]["best_score_std"] == second["Genetic"]["best_score_std"]
+        assert first["DFS"]["best_score_std"] == 0.0
+        assert first["DFS"]["duration_ci95"] >= 0.0
+
+    def test_tuning_successive_halving(self, course_groups, tmp_path):
+        corpus = [
+            TuningInstance(course_groups, {"COMP1007", "COMP1111"}, {"MATH1101", "PHYS1101"}),
+            TuningInstance(course_groups, {"COMP1007"}, {"MATH1101", "PHYS1101"}),
+        ]
+        result = tune_algorithm("Genetic", corpus, budget_seconds=2.0, candidates=4, seeds=(0,))
+        # Rung 1: 4 candidates x 1 run; rung 2: 2 survivors topped up to 2 runs
+        assert result.evaluations == 6 and result.runs == 2
+        assert result.failures == 0 and result.score > 0
+        assert set(result.params) <= set(TUNING_SPACES["Genetic"])
+
+        path = tmp_path / "profiles.json"
+        results = tune_corpus(["TabuSearch"], corpus, 2.0, TuningProfiles(path), candidates=2)
+        (bucket,) = results["TabuSearch"]
+        reloaded = TuningProfiles(path)
+        assert reloaded.get("TabuSearch", bucket)["instances"] == 2
+        assert reloaded.params_for("TabuSearch", bucket) == results["TabuSearch"][bucket].params
+
+        reloaded.record(
+            TuningResult("Genetic", {"population_size": 40, "bogus": 1}, 1.0, 0, 1, 1, 0.0),
+            bucket, 2.0, 1,
+        )
+        assert tuned_parameters(reloaded, "Genetic", bucket) == {"population_size": 40}
+        assert tuned_parameters(reloaded, "Genetic", "huge") == {}
+        assert tuned_parameters(None, "Genetic", bucket) == {}
+
     def test_parallel_executor(self, course_groups):
         results = run_algorithms_parallel(
             ["DFS", "BFS"],
@@ -674,6 +1349,32 @@ class TestHeuristicsAndUtilities:
         comparison = compare_algorithm_outputs({"DFS": schedules}, SchedulerPrefs())
         assert comparison["DFS"]["total"] == 1
 
+    def test_result_cache_deduplicates(self, course_groups):
+        prefs = SchedulerPrefs()
+        dfs = list(DFSScheduler(max_results=3).generate_schedules(course_groups, {"COMP1007", "COMP1111"}))
+        rerun = list(DFSScheduler(max_results=3).generate_schedules(course_groups, {"COMP1007", "COMP1111"}))
+        assert [s.identity for s in dfs] == [s.identity for s in rerun]
+        assert rerun[0] is not dfs[0]
+
+        cache = ResultCache()
+        scores = [cache.score(schedule, prefs) for schedule in dfs]
+        assert [cache.score(schedule, prefs) for schedule in rerun] == scores
+        assert (cache.hits, cache.misses, len(cache)) == (3, 3, 3)
+        cache.score(dfs[0], SchedulerPrefs(weight_gaps=prefs.weight_gaps + 1))
+        assert cache.misses == 4
+
+        owners = identity_owners({"DFS": dfs, "Again": rerun[:1]})
+        assert owners[dfs[0].identity] == ["DFS", "Again"]
+        assert owners[dfs[1].identity] == ["DFS"]
+        assert BaseScheduler._merge_warm_start(dfs[:1], rerun) == dfs[:1] + rerun[1:]
+
+        results = run_algorithms_parallel(
+            ["DFS", "BFS"], course_groups, ["COMP1007", "COMP1111"],
+            prefs=prefs, max_results=1, use_multiprocessing=False,
+        )
+        (_, first), (_, second) = results["DFS"], results["BFS"]
+        assert (first is second) == (first.identity == second.identity)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,96 @@
+"""Process-wide deduplication and score cache for schedules.
+
+Several algorithms, warm starts and repeated runs often produce the same
+schedule as distinct ``Schedule`` objects. ``ResultCache`` keys scores by
+``Schedule.identity`` so each distinct schedule is scored once per set of
+preferences; ``core.models.unique_schedules`` and ``identity_owners`` let
+merged result lists keep, render and export one object per schedule.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import fields
+import threading
+from typing import Dict, Hashable, List, Tuple
+
+from core.models import Schedule
+from utils.schedule_metrics import SchedulerPrefs, score_schedule
+
+
+# Scores kept before the least recently used ones are evicted
+SCORE_CACHE_SIZE = 100_000
+
+
+def prefs_key(prefs: SchedulerPrefs) -> Tuple:
+    """Hashable snapshot of every field of ``prefs``."""
+    return tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in (getattr(prefs, item.name) for item in fields(prefs))
+    )
+
+
+def identity_owners(results: Dict[str, List[Schedule]]) -> Dict[int, List[str]]:
+    """Identity -> names of the result lists containing it, in ``results`` order."""
+    owners: Dict[int, List[str]] = {}
+    for name, schedules in results.items():
+        for identity in dict.fromkeys(schedule.identity for schedule in schedules):
+            owners.setdefault(identity, []).append(name)
+    return owners
+
+
+class ResultCache:
+    """LRU cache of preference scores keyed by schedule identity."""
+
+    def __init__(self, max_entries: int = SCORE_CACHE_SIZE) -> None:
+        self.max_entries = max(1, max_entries)
+        self._scores: OrderedDict[Tuple[int, Hashable], float] = OrderedDict()
+        # Threaded algorithm runs share the cache
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def score(self, schedule: Schedule, prefs: SchedulerPrefs) -> float:
+        """``score_schedule(schedule, prefs)``, computed once per identity and prefs."""
+        key = (schedule.identity, prefs_key(prefs))
+        with self._lock:
+            cached = self._scores.get(key)
+            if cached is not None:
+                self.hits += 1
+                self._scores.move_to_end(key)
+                return cached
+        value = score_schedule(schedule, prefs)
+        with self._lock:
+            self.misses += 1
+            self._scores[key] = value
+            if len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scores.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by the schedulers, the evaluator, the comparison dialog and exports
+RESULT_CACHE = ResultCache()
+
+
+def cached_score(schedule: Schedule, prefs: SchedulerPrefs) -> float:
+    """Score ``schedule`` through the process-wide ``RESULT_CACHE``."""
+    return RESULT_CACHE.score(schedule, prefs)
+
+
+__all__ = [
+    "RESULT_CACHE",
+    "SCORE_CACHE_SIZE",
+    "ResultCache",
+    "cached_score",
+    "identity_owners",
+    "prefs_key",
+]